@@ -19,61 +19,89 @@
 # In[2]:
 
 
-import numpy as np
-import pandas as pd
+from fdi_analysis.instrument import Instrument
+
+# Per-cell wall/CPU time, peak RSS and (optionally) allocations and cProfile,
+# written as a Chrome trace when FDI_TRACE=trace.json is set
+instrument = Instrument.from_env()
+instrument.cell('In[2] Load data')
+
+import os
+
 import matplotlib.pyplot as plt
-import seaborn as sns
 
-# Read dataset in CSV format
-data = pd.read_csv("E:/Data Set/FDI data.csv")
+from fdi_analysis import (FDICube, GrowthMetrics, RankIndex, SectorHierarchy, backtest_cube, charts, compare_models,
+                          detect_outliers, forecast_cube, load_fdi_data, memory_report, panel_quantiles, profile_cube,
+                          refresh_aggregates, stream_summary, to_compact)
+
+# Set to True to keep the panel as float32 (checked against the data's 2-decimal precision)
+COMPACT = False
+
+# Read dataset in CSV format (parsed once, then served from the binary cache);
+# FDI_DATA overrides the default location next to the script
+file_path = os.environ.get("FDI_DATA", "FDI data.csv")
+data = load_fdi_data(file_path)
+
+# Dense sector x year matrix shared by the reshaping cells below
+cube = FDICube.from_frame(data)
+
+# Yearly/sector totals and sorted values, updated only for newly appended cells
+aggregates = refresh_aggregates(file_path, cube)
+
+if COMPACT:
+    cube = to_compact(cube, mode="float32").to_cube()
+
+
+# In[3]:
+
+
+instrument.cell('In[3] Memory report')
+# Memory held by each layout of the panel, compared with the old melted frame
+print(memory_report(cube, data))
 
 
 # In[6]:
 
 
+instrument.cell('In[6] Profile')
+# One pass over the values for counts, nulls, zeros, moments, quartiles and
+# histogram bins (saved next to the CSV and reused by the charts below)
+profile = profile_cube(cube, file_path)
 print(data.head())
-print(data.info())
-print(data.describe())
+print(profile.frame())
+print(profile.describe())
 
 
 # In[7]:
 
 
+instrument.cell('In[7] Missing values')
 # Checking for missing values
-print(data.isnull().sum())
+print(profile.null_counts())
 
 
-# ### Year-wise FDI analysis in India, with a focus on the years 2010 and 2011 
-
-# In[8]:
+# In[5]:
 
 
-# Calculate yearly investment
-yearly_investment = data.iloc[:, 1:].sum(axis=0)
+instrument.cell('In[5] Streaming summary')
+# The same totals, null counts and describe() statistics in one bounded-memory
+# pass over the CSV, for extracts too large to load with a single read_csv
+summary = stream_summary(file_path, chunksize=20)
+print(summary.top_sectors)
+print(summary.null_counts.sum(), 'missing values in', summary.rows, 'rows')
 
-# Plotting Year-wise Investment with emphasis on 2010 and 2011
-plt.figure(figsize=(12, 6))
 
-# Normal line plot for all years except 2010 and 2011
-sns.lineplot(x=yearly_investment.index, y=yearly_investment.values, marker='o', label='Yearly Investment')
+# ### Year-wise FDI analysis in India, with a focus on the years 2010 and 2011 
 
-# Highlight 2010 and 2011 with a dotted line
-highlight_years = ['2009-10', '2010-11','2012-13']
-highlight_values = yearly_investment.loc[highlight_years]
+# In[8]:
 
-sns.lineplot(x=highlight_years, y=highlight_values, marker='o', linestyle='--', color='red', label='Low FDI Years')
 
-# Add text annotation
-for year in highlight_years:
-    plt.text(year, yearly_investment[year], f'{year}: {yearly_investment[year]:.2f}', horizontalalignment='right')
+instrument.cell('In[8] Year-wise FDI analysis in India, with a focus on the years 2010 and 2011')
+# Calculate yearly investment
+yearly_investment = aggregates.yearly_totals()
 
-# General plot settings
-plt.title('Year-wise FDI in India with Highlights for 2010 and 2011')
-plt.xlabel('Year')
-plt.ylabel('Investment (in million USD)')
-plt.xticks(rotation=90)
-plt.legend()
-plt.grid(True)
+# Plotting Year-wise Investment with 2009-10, 2010-11 and 2012-13 highlighted
+fig = charts.yearly_investment_line(cube, highlight_years=['2009-10', '2010-11', '2012-13'])
 plt.show()
 
 
@@ -96,23 +124,26 @@ plt.show()
 # In[9]:
 
 
-# Extract FDI data for 2009-10 and 2010-11
-data_2009_10 = data[['Sector', '2009-10']].sort_values(by='2009-10')
-data_2010_11 = data[['Sector', '2010-11']].sort_values(by='2010-11')
+instrument.cell('In[9] Sectors with lowest and highest FDI')
+# Rank every year's sectors once, then read off the extremes
+ranks = RankIndex(cube)
 
 # Find sectors with lowest and highest FDI for 2009-10
-lowest_2009_10 = data_2009_10.iloc[0]
-highest_2009_10 = data_2009_10.iloc[-1]
+lowest_2009_10 = ranks.lowest('2009-10')
+highest_2009_10 = ranks.highest('2009-10')
 
 # Find sectors with lowest and highest FDI for 2010-11
-lowest_2010_11 = data_2010_11.iloc[0]
-highest_2010_11 = data_2010_11.iloc[-1]
+lowest_2010_11 = ranks.lowest('2010-11')
+highest_2010_11 = ranks.highest('2010-11')
 
 # Print out the sectors with their FDI values
-print("Sector with the lowest FDI in 2009-10:", lowest_2009_10['Sector'], "with FDI:", lowest_2009_10['2009-10'])
-print("Sector with the highest FDI in 2009-10:", highest_2009_10['Sector'], "with FDI:", highest_2009_10['2009-10'])
-print("Sector with the lowest FDI in 2010-11:", lowest_2010_11['Sector'], "with FDI:", lowest_2010_11['2010-11'])
-print("Sector with the highest FDI in 2010-11:", highest_2010_11['Sector'], "with FDI:", highest_2010_11['2010-11'])
+print("Sector with the lowest FDI in 2009-10:", lowest_2009_10[0], "with FDI:", lowest_2009_10[1])
+print("Sector with the highest FDI in 2009-10:", highest_2009_10[0], "with FDI:", highest_2009_10[1])
+print("Sector with the lowest FDI in 2010-11:", lowest_2010_11[0], "with FDI:", lowest_2010_11[1])
+print("Sector with the highest FDI in 2010-11:", highest_2010_11[0], "with FDI:", highest_2010_11[1])
+
+# Lowest and highest sectors for every year at once
+print(ranks.extremes(k=1))
 
 
 # Here are the key points for the sectors with the lowest and highest FDI in 2009-10 and 2010-11:
@@ -135,36 +166,10 @@ print("Sector with the highest FDI in 2010-11:", highest_2010_11['Sector'], "wit
 # In[10]:
 
 
-# Extract FDI data for the relevant years
+instrument.cell('In[10] Scatter plots for Lowest and Highest FDI Sectors for 2009-10 and 2010-11')
+# Scatter the lowest and highest FDI sector for each of the relevant years
 data_years = ['2009-10', '2010-11']  # Adjust as needed for other years
-sectors = data['Sector']
-fdi_years = data[['Sector'] + data_years]
-
-# Initialize a figure and axis for scatter plots
-plt.figure(figsize=(12, 8))
-
-# Iterate over each year to plot lowest and highest FDI sectors
-for i, year in enumerate(data_years, 1):
-    # Find sectors with lowest and highest FDI for the current year
-    lowest_sector = fdi_years.sort_values(by=year).iloc[0]['Sector']
-    highest_sector = fdi_years.sort_values(by=year).iloc[-1]['Sector']
-    
-    # Plot lowest FDI sector
-    plt.scatter(fdi_years.loc[fdi_years['Sector'] == lowest_sector, year], lowest_sector, 
-                color='red', label=f'Lowest FDI Sector {year}', marker='o', s=100)
-    
-    # Plot highest FDI sector
-    plt.scatter(fdi_years.loc[fdi_years['Sector'] == highest_sector, year], highest_sector, 
-                color='green', label=f'Highest FDI Sector {year}', marker='o', s=100)
-
-# Add labels and title
-plt.xlabel('FDI (in million USD)')
-plt.ylabel('Sector')
-plt.title('Lowest and Highest FDI Sectors for 2009-10 and 2010-11')
-plt.grid(True)
-plt.legend()
-
-plt.tight_layout()
+fig = charts.lowest_highest_scatter(cube, years=data_years, ranks=ranks)
 plt.show()
 
 
@@ -177,23 +182,14 @@ plt.show()
 # In[22]:
 
 
-# Calculate total investment for each sector
-sector_investment = fdi_data.set_index('Sector').sum(axis=1)
-
-# Sort sectors by investment value
-sector_investment_sorted = sector_investment.sort_values(ascending=False)
-
+instrument.cell('In[22] Sector-wise Investment for top N sectors')
 # Select top N sectors to display
 top_n = 10
+sector_investment_sorted = aggregates.sector_totals().sort_values(ascending=False)
 top_sector_investment = sector_investment_sorted.head(top_n)
 
 # Plotting Sector-wise Investment for top N sectors
-plt.figure(figsize=(12, 8))
-sns.barplot(x=top_sector_investment.values, y=top_sector_investment.index, orient='h', palette='viridis')
-plt.title(f'Top {top_n} Sector-wise FDI in India')
-plt.xlabel('Investment (in million USD)')
-plt.ylabel('Sector')
-plt.grid(True)
+fig = charts.top_sectors_bar(cube, top_n=top_n)
 plt.show()
 
 
@@ -217,20 +213,26 @@ plt.show()
 # In[24]:
 
 
-mean_investment = data.iloc[:, 1:].mean().mean()
-median_investment = data.iloc[:, 1:].median().median()
+instrument.cell('In[24] Mean and median')
+# Exact quantiles of the whole panel (not a median of the yearly medians)
+quantiles = panel_quantiles(cube)
+mean_investment = aggregates.mean()
+median_investment = quantiles.median()
 print(f'Mean Investment: {mean_investment}')
 print(f'Median Investment: {median_investment}')
+print(f'Interquartile Range: {quantiles.iqr()}')
+print(quantiles.by_year)
 
 
 # 
 # ***Comparison Between Mean and Median***
-# - **Discrepancy Between Mean and Median**: The substantial difference between the mean (309.98 million USD) and the median (58.82 million USD) suggests that the FDI data is skewed, with a few sectors receiving very high investments that raise the average significantly. Most sectors, however, receive much lower FDI, as reflected by the median.
+# - **Discrepancy Between Mean and Median**: The substantial difference between the mean (309.98 million USD) and the median (37.94 million USD across all sector-year values; the median of the yearly medians is 58.82 million USD) suggests that the FDI data is skewed, with a few sectors receiving very high investments that raise the average significantly. Most sectors, however, receive much lower FDI, as reflected by the median.
 # - **Implications for Policy and Investment**: Policymakers and investors might infer that while a few sectors are attracting significant foreign investments, many sectors still have relatively low FDI inflows. This could highlight opportunities for targeted policies to encourage more balanced FDI distribution across various sectors.
 
 # In[17]:
 
 
+instrument.cell('In[17] Column names')
 # Print the column names to verify
 print(data.columns)
 
@@ -240,29 +242,12 @@ print(data.columns)
 # In[23]:
 
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Load the dataset
-file_path = "E:/Data Set/FDI data.csv"
-fdi_data = pd.read_csv(file_path)
-
+instrument.cell('In[23] FDI Trends in Selected Sectors')
 # Plotting FDI trends for a few key sectors
-plt.figure(figsize=(14, 10))
-selected_sectors = ['SERVICES SECTOR (Fin.,Banking,Insurance,Non Fin/Business,Outsourcing,R&D,Courier,Tech. Testing and Analysis, Other)'
- ,'COMPUTER SOFTWARE & HARDWARE','TELECOMMUNICATIONS','CONSTRUCTION DEVELOPMENT: Townships, housing, built-up infrastructure and construction-development projects']
-for sector in selected_sectors:
-    sector_data = fdi_data[fdi_data['Sector'] == sector].iloc[:, 1:].T
-    sector_data.columns = [sector]
-    plt.plot(sector_data, marker='o', label=sector)
-
-plt.title('FDI Trends in Selected Sectors')
-plt.xlabel('Year')
-plt.ylabel('FDI (in million USD)')
-plt.xticks(rotation=90)
-plt.legend()
-plt.grid(True)
+# Sectors are looked up by short, unambiguous name prefixes; the cells below reuse this selection
+selected_sectors = cube.resolve(['services sector', 'computer software', 'telecommunications', 'construction development'])
+
+fig = charts.sector_trends(cube, sectors=selected_sectors)
 plt.show()
 
 
@@ -272,66 +257,39 @@ plt.show()
 # - **Sectoral Variability**: While all sectors have shown growth, the magnitude and rate of increase vary, with services and technology-related sectors often leading in terms of total investment.
 # - **Policy Influence**: Government policies and initiatives have played a crucial role in attracting FDI, particularly in sectors identified as critical for economic growth and modernization.
 
+# ### Growth Metrics for All Sectors
+
+# In[30]:
+
+
+instrument.cell('In[30] Growth Metrics for All Sectors')
+# Year-over-year growth, CAGR and rolling windows for every sector at once;
+# growth after a zero year (e.g. 'PHOTOGRAPHIC RAW FILM AND PAPER') is left undefined
+growth = GrowthMetrics(cube)
+growth_summary = growth.summary(window=3)
+print(growth_summary.sort_values('cagr', ascending=False).head(10))
+print(growth.cagr('2011-12', '2016-17').loc[selected_sectors])
+print(growth.rolling(3, 'mean').loc[selected_sectors].iloc[:, -5:])
+
+
 # ### FDI  Forecasts for Selected Sectors for next 7 years
 
 # In[28]:
 
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-file_path =  "E:/Data Set/FDI data.csv" 
-fdi_data = pd.read_csv(file_path)
-
-# selected sectors
-selected_sectors = [
-    'SERVICES SECTOR (Fin.,Banking,Insurance,Non Fin/Business,Outsourcing,R&D,Courier,Tech. Testing and Analysis, Other)',
-    'COMPUTER SOFTWARE & HARDWARE',
-    'TELECOMMUNICATIONS',
-    'CONSTRUCTION DEVELOPMENT: Townships, housing, built-up infrastructure and construction-development projects'
-]
-
-# Function to extend index for forecast
-def extend_index(df, new_index):
-    return df.reindex(new_index)
-
-# Prepare data for plotting
-plt.figure(figsize=(14, 10))
-for sector in selected_sectors:
-    # Extract sector data
-    sector_data = fdi_data[fdi_data['Sector'] == sector].iloc[:, 1:].T
-    sector_data.columns = ['FDI']
-    sector_data.index = pd.to_datetime(sector_data.index, format='%Y-%y')
-
-    # Forecast for the next 7 years (2017-18 to 2023-24)
-    forecast_years = ['2017-18', '2018-19', '2019-20', '2020-21', '2021-22', '2022-23', '2023-24']
-    new_index = sector_data.index.union(pd.to_datetime(forecast_years, format='%Y-%y'))
-    extended_sector_data = extend_index(sector_data, new_index)
-    
-    # Forecast using linear trend (simplified)
-    fit = np.polyfit(range(len(sector_data.index)), sector_data['FDI'], 1)
-    forecast_values = np.polyval(fit, range(len(new_index))[-7:])
-    extended_sector_data.loc[pd.to_datetime(forecast_years, format='%Y-%y'), 'FDI'] = forecast_values
-
-    # Plot historical data
-    sns.lineplot(data=sector_data, x=sector_data.index.strftime('%Y-%y'), y='FDI', marker='o', label=f'{sector} (Historical)')
-    
-    # Plot forecast data
-    sns.lineplot(data=extended_sector_data.loc[pd.to_datetime(forecast_years, format='%Y-%y')], 
-                 x=extended_sector_data.loc[pd.to_datetime(forecast_years, format='%Y-%y')].index.strftime('%Y-%y'), 
-                 y='FDI', marker='o', linestyle='--', label=f'{sector} (Forecast)')
-
-
-plt.title('FDI Trends and Forecasts for Selected Sectors for next 7 years')
-plt.xlabel('Year')
-plt.ylabel('FDI (in million USD)')
-plt.xticks(rotation=90)
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
+instrument.cell('In[28] FDI Forecasts for Selected Sectors for next 7 years')
+# Fit linear trends for every sector in one least-squares solve and
+# project the next 7 years (2017-18 to 2023-24), with 95% prediction
+# intervals from 1000 residual-bootstrap refits of all sectors at once
+trend = forecast_cube(cube, horizon=7, model='linear', level=0.95, n_boot=1000, seed=0)
+forecast_years = trend.forecast_years
+
+# Plot the historical data and the dashed forecasts with their bands
+fig = charts.sector_forecasts(cube, trend, sectors=selected_sectors)
 plt.show()
 
+print(trend.interval_frame().loc[selected_sectors].round(2).T)
+
 
 # 1. **FDI on the Rise:** Analysis suggests a surge in Foreign Direct Investment (FDI) across key sectors like services, software & hardware, telecom, and construction.
 # 
@@ -342,20 +300,37 @@ plt.show()
 # 4. **Growth with Caution:** Increased FDI can create jobs, transfer technology, and boost infrastructure, but potential downsides like dependence on foreign capital need to be managed.
 # 
 
+# ### Backtesting the Trend Forecasts
+
+# In[29]:
+
+
+instrument.cell('In[29] Backtesting the Trend Forecasts')
+# Refit each trend model at every historical cutoff year for all sectors and
+# compare the out-of-sample errors 1-3 years ahead
+model_errors = compare_models(cube, horizon=3, min_train=5)
+print(model_errors)
+
+# Sectors where the linear trend forecasts worst one year ahead
+linear_backtest = backtest_cube(cube, model='linear', horizon=3, min_train=5)
+print(linear_backtest.mae_frame().sort_values('h1', ascending=False).head(10))
+
+
 # ### Boxplot to Identify FDI Data
 
 # In[27]:
 
 
-plt.figure(figsize=(14, 10))
-sns.boxplot(data=fdi_data.iloc[:, 1:])
-plt.title('Outlier Detection in FDI Data')
-plt.xlabel('Year')
-plt.ylabel('FDI (in million USD)')
-plt.xticks(rotation=90)
-plt.grid(True)
+instrument.cell('In[27] Boxplot to Identify FDI Data')
+# IQR fences, robust z-scores and year-over-year jumps for every sector-year cell;
+# the boxplot reuses the profile's quartiles and the engine's IQR flags
+outliers = detect_outliers(cube, profile)
+fig = charts.year_boxplot(cube, profile, outliers)
 plt.show()
 
+print(outliers.counts().T)
+print(outliers.table()[['Sector', 'Year', 'FDI', 'robust_z', 'yoy_change', 'iqr', 'z', 'jump']].head(15))
+
 
 # #### What This Boxplot Identifies in the FDI Data
 # 1. **Median FDI:** The median FDI for each year is shown by the line inside each box.
@@ -380,35 +355,12 @@ plt.show()
 # In[38]:
 
 
-import pandas as pd
-import matplotlib.pyplot as plt
-
-file_path = "E:/Data Set/FDI data.csv" 
-fdi_data = pd.read_csv(file_path)
-
-selected_sectors = [
-    'SERVICES SECTOR (Fin.,Banking,Insurance,Non Fin/Business,Outsourcing,R&D,Courier,Tech. Testing and Analysis, Other)',
-    'COMPUTER SOFTWARE & HARDWARE',
-    'TELECOMMUNICATIONS',
-    'CONSTRUCTION DEVELOPMENT: Townships, housing, built-up infrastructure and construction-development projects'
-]
-
-# Transpose the data for year-wise analysis
-year_data = fdi_data.set_index('Sector').T.reset_index().melt(id_vars='index', var_name='Sector', value_name='FDI')
-year_data.columns = ['Year', 'Sector', 'FDI']
-
-# Filter the data for the selected sectors and the year 2010-11
-filtered_data = year_data[(year_data['Year'] == '2010-11') & (year_data['Sector'].isin(selected_sectors))]
+instrument.cell('In[38] Pie Chart of FDI in 2010-11 by Selected Sectors')
+# FDI of the selected sectors in 2010-11, read straight from the cube
+filtered_data = cube.select(selected_sectors).year_series('2010-11')
 
 # Plot the pie chart for the selected sectors in 2010-11
-plt.figure(figsize=(25, 15))
-plot = filtered_data.groupby('Sector')['FDI'].sum().plot(kind='pie', autopct='%1.1f%%', textprops={'fontsize': 18, 'fontweight': 'bold'})
-plt.title('Pie Chart of FDI in 2010-11 by Selected Sectors', fontsize=18, fontweight='bold')
-plt.ylabel('')
-
-# Customize bold font
-plt.legend(title='Sectors', title_fontsize='20', fontsize='20', loc='center left', bbox_to_anchor=(1, 0.5), frameon=False, prop={'weight': 'bold'})
-
+fig = charts.year_pie(cube, year='2010-11', sectors=selected_sectors)
 plt.show()
 
 
@@ -428,16 +380,12 @@ plt.show()
 # In[17]:
 
 
-# Transpose the data for year-wise analysis
-year_data = data.set_index('Sector').T.reset_index().melt(id_vars='index', var_name='Sector', value_name='FDI')
-year_data.columns = ['Year', 'Sector', 'FDI']
+instrument.cell('In[17] Analysis of FDI Data Based on Histogram')
+# Long (Year, Sector, FDI) view of the cube for year-wise analysis
+year_data = cube.long
 
 # 1. Histogram
-plt.figure(figsize=(12, 6))
-year_data['FDI'].plot(kind='hist', bins=20, alpha=0.5, color='purple')
-plt.title('Histogram of FDI Year-wise')
-plt.xlabel('FDI (in million USD)')
-plt.ylabel('Frequency')
+fig = charts.fdi_histogram(cube, bins=20, profile=profile)
 plt.show()
 
 
@@ -462,13 +410,9 @@ plt.show()
 # In[25]:
 
 
+instrument.cell('In[25] Analysis of FDI Data Based on Barplot')
 # Barplot
-plt.figure(figsize=(12, 6))
-year_data.groupby('Year')['FDI'].sum().plot(kind='bar',color='green')
-plt.title('Barplot of Total FDI Year-wise')
-plt.xlabel('Year')
-plt.ylabel('FDI (in million USD)')
-plt.xticks(rotation=90)
+fig = charts.yearly_total_bar(cube)
 plt.show()
 
 
@@ -486,29 +430,9 @@ plt.show()
 
 
 
-selected_sectors = [
-    'SERVICES SECTOR (Fin.,Banking,Insurance,Non Fin/Business,Outsourcing,R&D,Courier,Tech. Testing and Analysis, Other)',
-    'COMPUTER SOFTWARE & HARDWARE',
-    'TELECOMMUNICATIONS',
-    'CONSTRUCTION DEVELOPMENT: Townships, housing, built-up infrastructure and construction-development projects'
-]
-
-# Transpose the data for year-wise analysis
-year_data = data.set_index('Sector').T.reset_index().melt(id_vars='index', var_name='Sector', value_name='FDI')
-year_data.columns = ['Year', 'Sector', 'FDI']
-
-# Filter the data for the selected sectors
-filtered_data = year_data[year_data['Sector'].isin(selected_sectors)]
-
+instrument.cell('In[32] Scatter plot analysis of FDI year-wise for the selected sectors')
 # 3. Scatterplot
-plt.figure(figsize=(20,10))
-sns.scatterplot(data=filtered_data, x='Year', y='FDI', hue='Sector', palette='viridis', s=200)
-plt.title('Scatterplot of FDI Year-wise for Selected Sectors')
-plt.xlabel('Year')
-plt.ylabel('FDI (in million USD)')
-plt.xticks(rotation=90)
-plt.legend(title='Sector', bbox_to_anchor=(1.05, 1), loc='upper left')
-plt.grid(True)
+fig = charts.selected_scatter(cube, sectors=selected_sectors)
 plt.show()
 
 
@@ -527,32 +451,9 @@ plt.show()
 # In[35]:
 
 
-# Define the selected sectors
-selected_sectors = [
-    'SERVICES SECTOR (Fin.,Banking,Insurance,Non Fin/Business,Outsourcing,R&D,Courier,Tech. Testing and Analysis, Other)',
-    'COMPUTER SOFTWARE & HARDWARE',
-    'TELECOMMUNICATIONS',
-    'CONSTRUCTION DEVELOPMENT: Townships, housing, built-up infrastructure and construction-development projects'
-]
-
-# Transpose the data for year-wise analysis
-year_data = data.set_index('Sector').T.reset_index().melt(id_vars='index', var_name='Sector', value_name='FDI')
-year_data.columns = ['Year', 'Sector', 'FDI']
-
-# Filter the data for the selected sectors
-filtered_data = year_data[year_data['Sector'].isin(selected_sectors)]
-
-# Pivot data for heatmap
-heatmap_data = filtered_data.pivot('Year', 'Sector', 'FDI')
-
+instrument.cell('In[35] Heatmap of FDI Year-wise for Selected Sectors')
 # Plot Heatmap
-plt.figure(figsize=(12, 8))
-sns.heatmap(heatmap_data, annot=True, fmt=".1f", cmap='viridis', linewidths=.5)
-plt.title('Heatmap of FDI Year-wise for Selected Sectors')
-plt.xlabel('Sector')
-plt.ylabel('Year')
-plt.xticks(rotation=45, ha='right')
-plt.yticks(rotation=0)
+fig = charts.selected_heatmap(cube, sectors=selected_sectors)
 plt.show()
 
 
@@ -566,37 +467,27 @@ plt.show()
 #   - **Patterns**: Helps identify trends or seasonal effects in FDI distribution across sectors.
 #  
 
-# ### Stacked Area Chart of FDI Year-wise for Selected Sectors
+# ### Heatmap of FDI for All Sectors
+# 
+# The full 63-sector panel drawn as one rasterized image straight from the value matrix. Similar sectors are clustered together, and the colour scale is logarithmic so the smaller sectors remain visible. Cell labels are dropped automatically at this size.
 
-# In[36]:
+# In[39]:
 
 
+instrument.cell('In[39] Heatmap of FDI for All Sectors')
+fig = charts.panel_heatmap(cube, order='cluster', scale='log')
+plt.show()
 
-selected_sectors = [
-    'SERVICES SECTOR (Fin.,Banking,Insurance,Non Fin/Business,Outsourcing,R&D,Courier,Tech. Testing and Analysis, Other)',
-    'COMPUTER SOFTWARE & HARDWARE',
-    'TELECOMMUNICATIONS',
-    'CONSTRUCTION DEVELOPMENT: Townships, housing, built-up infrastructure and construction-development projects'
-]
 
-# Transpose the data for year-wise analysis
-year_data = data.set_index('Sector').T.reset_index().melt(id_vars='index', var_name='Sector', value_name='FDI')
-year_data.columns = ['Year', 'Sector', 'FDI']
+# ### Stacked Area Chart of FDI Year-wise for Selected Sectors
+
+# In[36]:
 
-# Filter the data for the selected sectors
-filtered_data = year_data[year_data['Sector'].isin(selected_sectors)]
 
-# Pivot data for stacked area chart
-pivot_data = filtered_data.pivot(index='Year', columns='Sector', values='FDI').fillna(0)
 
+instrument.cell('In[36] Stacked Area Chart of FDI Year-wise for Selected Sectors')
 # Plot Stacked Area Chart
-plt.figure(figsize=(14, 8))
-pivot_data.plot.area(figsize=(14, 8), cmap='viridis', alpha=0.7)
-plt.title('Stacked Area Chart of FDI Year-wise for Selected Sectors')
-plt.xlabel('Year')
-plt.ylabel('FDI (in million USD)')
-plt.legend(title='Sector')
-plt.grid(True)
+fig = charts.selected_stacked_area(cube, sectors=selected_sectors)
 plt.show()
 
 
@@ -608,6 +499,40 @@ plt.show()
 #   - **Comparison**: Facilitates comparison between sectors to see which has increased or decreased over time.
 #   - **Sector Dominance**: Highlights which sectors have been dominant or emerging in terms of investment over the years.
 
+# ### FDI by Sector Group
+# 
+# The groups discussed above ("Tech and Telecom", "Manufacturing", "Emerging Sectors", ...) rolled up in code: sectors into themes, and themes into the primary, secondary and tertiary economy. Each level's totals come from one sparse matrix product (sectors to themes, then themes to economy), and the group cube drops into the same charts as the sectors.
+
+# In[37]:
+
+
+instrument.cell('In[37] FDI by Sector Group')
+hierarchy = SectorHierarchy(cube, other='Other')
+themes = hierarchy.group_cube('theme')
+print(hierarchy.frame('theme').iloc[:, -5:])
+print(hierarchy.frame('economy').iloc[:, -5:])
+
+fig = charts.top_sectors_bar(themes, top_n=len(themes))
+plt.show()
+
+fig = charts.year_pie(themes, year='2010-11', sectors=hierarchy.groups('theme'),
+                      title='Pie Chart of FDI in 2010-11 by Sector Group')
+plt.show()
+
+fig = charts.selected_stacked_area(themes, sectors=hierarchy.groups('theme'),
+                                   title='Stacked Area Chart of FDI Year-wise by Sector Group')
+plt.show()
+
+
+# In[40]:
+
+
+# Close the last cell's stage and write the trace (no-op unless FDI_TRACE is set)
+stage_report = instrument.finish()
+if stage_report is not None:
+    print(stage_report[['name', 'wall_s', 'cpu_s', 'rss_growth', 'alloc_peak']].round(3).to_string())
+
+
 # <div style="text-align: center;">
 #     <h1>Thank You!</h1>
 # </div>
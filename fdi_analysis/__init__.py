@@ -0,0 +1,94 @@
+"""Helpers for the FDI analysis notebook.
+
+The public names are imported lazily, on first attribute access, so
+``import fdi_analysis`` (and the ``fdi-analysis`` command line) starts fast
+and only loads the modules a caller actually uses.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "AggregateStore": "aggregates",
+    "refresh_aggregates": "aggregates",
+    "BacktestResult": "backtest",
+    "backtest": "backtest",
+    "backtest_cube": "backtest",
+    "compare_models": "backtest",
+    "CompactPanel": "compact",
+    "memory_report": "compact",
+    "to_compact": "compact",
+    "FDICube": "cube",
+    "FiscalYearIndex": "fiscal",
+    "TrendForecast": "forecast",
+    "fit_trends": "forecast",
+    "forecast_cube": "forecast",
+    "SectorHierarchy": "groups",
+    "GrowthMetrics": "growth",
+    "Instrument": "instrument",
+    "load_fdi_data": "loader",
+    "OutlierReport": "outliers",
+    "PanelStore": "panels",
+    "detect_outliers": "outliers",
+    "DataProfile": "profile",
+    "profile_cube": "profile",
+    "KLLSketch": "quantiles",
+    "PanelQuantiles": "quantiles",
+    "panel_quantiles": "quantiles",
+    "stream_quantiles": "quantiles",
+    "RankIndex": "ranking",
+    "SectorIndex": "sectors",
+    "SectorLookupError": "sectors",
+    "StreamingStats": "streaming",
+    "StreamSummary": "streaming",
+    "stream_summary": "streaming",
+}
+
+__all__ = [
+    "AggregateStore",
+    "BacktestResult",
+    "CompactPanel",
+    "DataProfile",
+    "FDICube",
+    "FiscalYearIndex",
+    "GrowthMetrics",
+    "Instrument",
+    "KLLSketch",
+    "OutlierReport",
+    "PanelQuantiles",
+    "PanelStore",
+    "RankIndex",
+    "SectorHierarchy",
+    "SectorIndex",
+    "SectorLookupError",
+    "StreamSummary",
+    "StreamingStats",
+    "TrendForecast",
+    "backtest",
+    "backtest_cube",
+    "compare_models",
+    "detect_outliers",
+    "fit_trends",
+    "forecast_cube",
+    "load_fdi_data",
+    "memory_report",
+    "panel_quantiles",
+    "profile_cube",
+    "refresh_aggregates",
+    "stream_quantiles",
+    "stream_summary",
+    "to_compact",
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
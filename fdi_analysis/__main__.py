@@ -0,0 +1,5 @@
+"""``python -m fdi_analysis`` runs the command line (see ``fdi_analysis.cli``)."""
+
+from .cli import main
+
+main()
@@ -0,0 +1,279 @@
+"""Incrementally maintained aggregates of the FDI panel.
+
+``AggregateStore`` keeps per-year totals and counts, per-sector running sums
+and counts, and sorted copies of each year's values and of the whole panel.
+When a fiscal-year column or new sector rows are appended, only the new cells
+are summed and sorted; they are merged into the existing sorted arrays by
+binary search, which copies those arrays once but never re-sorts them. The
+store is saved as an ``.npz`` file next to the data (rewritten in full on
+each refresh).
+
+The store remembers the loader's content hash of the source file, a hash
+of every year column and one of every appended block of sector rows. An
+unchanged file is answered from the store as is. A changed file is folded
+in incrementally only if the stored panel is an unchanged prefix of the new
+one: the stored slices are re-hashed once (a single pass, far cheaper than
+the sort a rebuild needs) and only the new slices are hashed, summed and
+merged. Any edit to an existing cell, or a reordering, triggers a full
+rebuild.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def aggregates_path(data_path):
+    """Where the aggregate store for ``data_path`` is kept."""
+    return os.path.splitext(os.path.abspath(data_path))[0] + ".aggregates.npz"
+
+
+def _merge_sorted(sorted_values, new_values):
+    """Merge ``new_values`` into an already sorted array."""
+    new_values = np.sort(new_values[~np.isnan(new_values)])
+    if len(new_values) == 0:
+        return sorted_values
+    positions = np.searchsorted(sorted_values, new_values, side="right")
+    return np.insert(sorted_values, positions, new_values)
+
+
+def _median(sorted_values):
+    n = len(sorted_values)
+    if n == 0:
+        return np.nan
+    mid = n // 2
+    if n % 2:
+        return float(sorted_values[mid])
+    return float(sorted_values[mid - 1] + sorted_values[mid]) / 2.0
+
+
+def panel_digest(values):
+    """SHA-256 of a block of cells as float64 bytes (NaNs included)."""
+    block = np.ascontiguousarray(values, dtype=np.float64)
+    return hashlib.sha256(repr(block.shape).encode() + block.tobytes()).hexdigest()
+
+
+class AggregateStore:
+    """Totals, counts and sorted values of a sector x year panel.
+
+    Missing values are skipped everywhere, as in the pandas reductions the
+    notebook used.
+    """
+
+    def __init__(self, sectors=(), years=()):
+        self.sectors = list(sectors)
+        self.years = list(years)
+        self.year_totals = np.zeros(len(self.years))
+        self.year_counts = np.zeros(len(self.years), dtype=np.int64)
+        self.sector_sums = np.zeros(len(self.sectors))
+        self.sector_counts = np.zeros(len(self.sectors), dtype=np.int64)
+        self.year_sorted = [np.empty(0) for _ in self.years]
+        self.all_sorted = np.empty(0)
+        # Content hash of the source file, and hashes of the cells folded in:
+        # [n_sectors, digest] per year column (the sectors known when it was
+        # added) and [start, stop, n_years, digest] per appended block of rows
+        self.source = None
+        self.year_digests = [[len(self.sectors), None] for _ in self.years]
+        self.sector_digests = []
+
+    @classmethod
+    def from_cube(cls, cube):
+        """Build the store from scratch for an ``FDICube`` (one sort per axis, no merging)."""
+        values = np.asarray(cube.values, dtype=np.float64)
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        store = cls(sectors=cube.sectors)
+        store.years = list(cube.years)
+        store.year_totals = filled.sum(axis=0)
+        store.year_counts = present.sum(axis=0).astype(np.int64)
+        store.sector_sums = filled.sum(axis=1)
+        store.sector_counts = present.sum(axis=1).astype(np.int64)
+        # NaNs sort to the end of each column
+        by_year = np.sort(values, axis=0)
+        store.year_sorted = [by_year[:count, j] for j, count in enumerate(store.year_counts)]
+        store.all_sorted = np.sort(values[present])
+        store.year_digests = [[len(store.sectors), panel_digest(values[:, j])] for j in range(len(store.years))]
+        return store
+
+    def __repr__(self):
+        return f"AggregateStore({len(self.sectors)} sectors x {len(self.years)} years)"
+
+    # --- incremental updates --------------------------------------------------
+
+    def append_year(self, year, values):
+        """Add one fiscal-year column (one value per known sector, in store order)."""
+        if year in self.years:
+            raise ValueError(f"year {year!r} is already in the store")
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(self.sectors),):
+            raise ValueError(f"expected {len(self.sectors)} values for {year!r}, got {values.shape}")
+        present = ~np.isnan(values)
+
+        self.years.append(year)
+        self.year_totals = np.append(self.year_totals, values[present].sum())
+        self.year_counts = np.append(self.year_counts, present.sum())
+        self.sector_sums += np.where(present, values, 0.0)
+        self.sector_counts += present
+        self.year_sorted.append(np.sort(values[present]))
+        self.all_sorted = _merge_sorted(self.all_sorted, values)
+        self.year_digests.append([len(self.sectors), panel_digest(values)])
+
+    def append_sectors(self, sectors, rows):
+        """Add sector rows (shape (n_new, n_years), columns in store year order)."""
+        sectors = list(sectors)
+        rows = np.asarray(rows, dtype=np.float64).reshape(len(sectors), len(self.years))
+        duplicates = set(sectors) & set(self.sectors)
+        if duplicates:
+            raise ValueError(f"sectors already in the store: {sorted(duplicates)}")
+        present = ~np.isnan(rows)
+
+        self.sector_digests.append([len(self.sectors), len(self.sectors) + len(sectors), len(self.years),
+                                    panel_digest(rows)])
+        self.sectors.extend(sectors)
+        self.sector_sums = np.append(self.sector_sums, np.where(present, rows, 0.0).sum(axis=1))
+        self.sector_counts = np.append(self.sector_counts, present.sum(axis=1))
+        self.year_totals += np.where(present, rows, 0.0).sum(axis=0)
+        self.year_counts += present.sum(axis=0)
+        for j in range(len(self.years)):
+            self.year_sorted[j] = _merge_sorted(self.year_sorted[j], rows[:, j])
+        self.all_sorted = _merge_sorted(self.all_sorted, rows.ravel())
+
+    def update_from_cube(self, cube):
+        """Fold in the sectors and years of ``cube`` that the store has not seen.
+
+        Returns the number of new cells, or None (leaving the store
+        untouched) when ``cube`` is not an extension of the stored panel:
+        known sectors or years are missing or reordered, or a stored cell
+        was edited (checked against the per-slice hashes).
+        """
+        if cube.sectors[:len(self.sectors)] != self.sectors or cube.years[:len(self.years)] != self.years:
+            return None
+        if not self._unchanged(cube.values):
+            return None
+        n_sectors, n_years = len(self.sectors), len(self.years)
+        for year in cube.years[n_years:]:
+            self.append_year(year, cube.year(year)[:n_sectors])
+        if len(cube.sectors) > n_sectors:
+            self.append_sectors(cube.sectors[n_sectors:], cube.values[n_sectors:])
+        return len(self.sectors) * len(self.years) - n_sectors * n_years
+
+    def _unchanged(self, values):
+        """Whether the stored slices of ``values`` still hash to what was folded in."""
+        for j, (n_sectors, digest) in enumerate(self.year_digests):
+            if panel_digest(values[:n_sectors, j]) != digest:
+                return False
+        for start, stop, n_years, digest in self.sector_digests:
+            if panel_digest(values[start:stop, :n_years]) != digest:
+                return False
+        return True
+
+    # --- queries --------------------------------------------------------------
+
+    def total(self):
+        return float(self.year_totals.sum())
+
+    def count(self):
+        return int(self.year_counts.sum())
+
+    def mean(self):
+        """Mean over every sector-year cell."""
+        return self.total() / self.count() if self.count() else np.nan
+
+    def median(self):
+        """Median over every sector-year cell."""
+        return _median(self.all_sorted)
+
+    def yearly_totals(self):
+        return pd.Series(self.year_totals, index=self.years, name="FDI")
+
+    def sector_totals(self):
+        return pd.Series(self.sector_sums, index=self.sectors, name="FDI")
+
+    def year_means(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.Series(self.year_totals / self.year_counts, index=self.years)
+
+    def year_medians(self):
+        return pd.Series([_median(v) for v in self.year_sorted], index=self.years)
+
+    def sector_means(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.Series(self.sector_sums / self.sector_counts, index=self.sectors)
+
+    # --- persistence ----------------------------------------------------------
+
+    def save(self, path):
+        """Write the store to an ``.npz`` file."""
+        lengths = np.array([len(v) for v in self.year_sorted], dtype=np.int64)
+        labels = json.dumps({"sectors": self.sectors, "years": self.years, "source": self.source,
+                             "year_digests": self.year_digests, "sector_digests": self.sector_digests})
+        tmp = path + ".tmp.npz"
+        np.savez(
+            tmp,
+            labels=np.array(labels),
+            year_totals=self.year_totals,
+            year_counts=self.year_counts,
+            sector_sums=self.sector_sums,
+            sector_counts=self.sector_counts,
+            year_sorted=np.concatenate(self.year_sorted) if self.year_sorted else np.empty(0),
+            year_lengths=lengths,
+            all_sorted=self.all_sorted,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            labels = json.loads(str(f["labels"]))
+            store = cls()
+            store.sectors = labels["sectors"]
+            store.years = labels["years"]
+            store.source = labels.get("source")
+            store.year_digests = labels["year_digests"]
+            store.sector_digests = labels["sector_digests"]
+            store.year_totals = f["year_totals"]
+            store.year_counts = f["year_counts"]
+            store.sector_sums = f["sector_sums"]
+            store.sector_counts = f["sector_counts"]
+            store.year_sorted = np.split(f["year_sorted"], np.cumsum(f["year_lengths"])[:-1])
+            store.all_sorted = f["all_sorted"]
+        if not store.years:
+            store.year_sorted = []
+        return store
+
+
+def refresh_aggregates(data_path, cube):
+    """Load the saved store for ``data_path``, fold in what is new in ``cube`` and save it.
+
+    If the source file's content hash is the one the store was built from,
+    the store is returned as is. Otherwise new years and sectors are folded
+    in when the stored cells are unchanged, and the store is rebuilt from
+    scratch when there is no saved store or the old cells changed.
+    """
+    from .loader import source_digest
+
+    path = aggregates_path(data_path)
+    source = source_digest(data_path)
+    store = None
+    if os.path.exists(path):
+        try:
+            store = AggregateStore.load(path)
+        except (OSError, ValueError, KeyError):
+            store = None
+    if (store is not None and store.source == source
+            and store.sectors == list(cube.sectors) and store.years == list(cube.years)):
+        return store
+
+    new_cells = store.update_from_cube(cube) if store is not None else None
+    if new_cells is None:
+        store = AggregateStore.from_cube(cube)
+    store.source = source
+    try:
+        store.save(path)
+    except OSError:
+        # Read-only data directory: the in-memory store is still valid
+        pass
+    return store
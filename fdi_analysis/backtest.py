@@ -0,0 +1,136 @@
+"""Rolling-origin backtests for the trend forecasts.
+
+The trend model is refitted at every historical cutoff year for every sector
+in one batched pass. Each cutoff only changes which years are in the training
+window, so the normal equations for all cutoffs are built from one weighted
+product and solved together with a stacked ``np.linalg.solve``. There are no
+Python loops over sectors or cutoffs.
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .forecast import MODELS, _from_model_space, _to_model_space, design_matrix
+
+
+@dataclass
+class BacktestResult:
+    """Out-of-sample errors of one trend model over every cutoff.
+
+    ``predictions`` and ``actuals`` are (n_cutoffs, n_series, horizon); a
+    cutoff ``c`` means the model was trained on years before index ``c`` and
+    horizon ``h`` predicts year ``c + h - 1``. Targets past the end of the
+    data are NaN. ``mae`` and ``mape`` are (n_series, horizon) averages over
+    the cutoffs; MAPE skips zero actuals.
+    """
+
+    model: str
+    window: int
+    cutoffs: np.ndarray
+    predictions: np.ndarray
+    actuals: np.ndarray
+    mae: np.ndarray
+    mape: np.ndarray
+    sectors: list = None
+    years: list = None
+
+    def _frame(self, values):
+        columns = [f"h{h}" for h in range(1, values.shape[1] + 1)]
+        return pd.DataFrame(values, index=self.sectors, columns=columns)
+
+    def mae_frame(self):
+        """Sector x horizon mean absolute error."""
+        return self._frame(self.mae)
+
+    def mape_frame(self):
+        """Sector x horizon mean absolute percentage error (in %)."""
+        return self._frame(self.mape)
+
+    def horizon_summary(self):
+        """MAE and MAPE per horizon, averaged over sectors."""
+        return pd.DataFrame(
+            {"MAE": _nanmean(self.mae, axis=0), "MAPE": _nanmean(self.mape, axis=0)},
+            index=pd.RangeIndex(1, self.mae.shape[1] + 1, name="horizon"),
+        )
+
+
+def _nanmean(values, axis):
+    # All-NaN slices (e.g. zero-only actuals for MAPE) just stay NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmean(values, axis=axis)
+
+
+def training_weights(n_years, cutoffs, window=None):
+    """0/1 matrix (n_cutoffs, n_years) marking each cutoff's training years.
+
+    ``window=None`` gives expanding windows starting at the first year;
+    an integer gives sliding windows of that many years.
+    """
+    t = np.arange(n_years)
+    cutoffs = np.asarray(cutoffs)[:, None]
+    start = 0 if window is None else cutoffs - window
+    return ((t >= start) & (t < cutoffs)).astype(np.float64)
+
+
+def backtest(values, model="linear", horizon=3, min_train=5, window=None):
+    """Refit the trend at every cutoff for every series and score the forecasts."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2:
+        raise ValueError("values must be a 2-D (series, year) array")
+    if np.isnan(values).any():
+        raise ValueError("values contain NaN; fill or drop incomplete series first")
+    n_series, n_years = values.shape
+    if window is not None:
+        min_train = max(min_train, window)
+    X = design_matrix(np.arange(n_years + horizon), model)
+    n_params = X.shape[1]
+    if min_train < n_params:
+        raise ValueError(f"min_train must be at least {n_params} for a {model} trend")
+    cutoffs = np.arange(min_train, n_years)
+    if len(cutoffs) == 0:
+        raise ValueError(f"need more than {min_train} years to backtest")
+
+    # Normal equations for every cutoff at once:
+    #   XtX[c] = X' W_c X,  XtY[c] = X' W_c Y
+    W = training_weights(n_years, cutoffs, window)
+    Xh = X[:n_years]
+    WX = W[:, :, None] * Xh[None, :, :]
+    XtX = np.einsum("cyp,yq->cpq", WX, Xh)
+    XtY = np.matmul(WX.transpose(0, 2, 1), _to_model_space(values, model).T)
+    coef = np.linalg.solve(XtX, XtY)
+
+    # Predict year c + h - 1 from the fit at cutoff c
+    target = cutoffs[:, None] + np.arange(horizon)[None, :]
+    Xf = X[target]
+    predictions = _from_model_space(np.einsum("chp,cps->csh", Xf, coef), model)
+
+    padded = np.concatenate([values, np.full((n_series, horizon), np.nan)], axis=1)
+    actuals = padded[:, target].transpose(1, 0, 2)
+
+    errors = np.abs(predictions - actuals)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(actuals != 0, errors / np.abs(actuals) * 100.0, np.nan)
+    mae = _nanmean(errors, axis=0)
+    mape = _nanmean(pct, axis=0)
+    return BacktestResult(model, window, cutoffs, predictions, actuals, mae, mape)
+
+
+def backtest_cube(cube, model="linear", horizon=3, min_train=5, window=None):
+    """Run ``backtest`` over every sector of an ``FDICube``."""
+    result = backtest(cube.values, model=model, horizon=horizon, min_train=min_train, window=window)
+    result.sectors = cube.sectors
+    result.years = cube.years
+    return result
+
+
+def compare_models(cube, models=MODELS, horizon=3, min_train=5, window=None):
+    """MAE/MAPE per model and horizon, for choosing a trend model."""
+    frames = {}
+    for model in models:
+        result = backtest_cube(cube, model=model, horizon=horizon, min_train=min_train, window=window)
+        frames[model] = result.horizon_summary()
+    return pd.concat(frames, names=["model"])
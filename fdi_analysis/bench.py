@@ -0,0 +1,296 @@
+"""Benchmarks of every analysis stage on synthetic FDI-shaped panels.
+
+``synthetic_panel`` generates sector x fiscal-year panels that look like the
+real data: lognormal sector sizes, compounding yearly growth with noisy
+shocks, and runs of zero-investment years, most often at the start of a
+sector's history. ``run_benchmarks`` writes such a panel to CSV for each
+requested size. It then times the stages the notebook performs (CSV parse,
+cached load, reshape, aggregates, top-N, quantiles, profile, outliers,
+growth, forecasts, backtests, streaming and plotting). Each stage is timed
+over ``repeat`` runs; one extra run under ``tracemalloc`` gives its peak
+traced allocation. Results go to a JSON file that ``compare`` can diff
+against an earlier run.
+
+The default sizes run in about a minute. ``--large`` adds ``LARGE_SIZES``,
+panels of a million sectors and of 200 years, which need several GB of
+memory and a long run; any other size can be given with ``--sizes``.
+
+    python -m fdi_analysis.bench --sizes 63x17 10000x17 100000x50 --output bench.json
+    python -m fdi_analysis.bench --large --stage load_cached quantiles forecast
+    python -m fdi_analysis.bench --compare old.json bench.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .fiscal import FiscalYearIndex
+
+BENCH_VERSION = 1
+DEFAULT_SIZES = ("63x17", "1000x17", "10000x17", "10000x50")
+# Opt-in (--large): the scale of a full cross-country sector panel
+LARGE_SIZES = ("1000000x17", "100000x200")
+
+
+def synthetic_panel(n_sectors=63, n_years=17, seed=0, zero_run_rate=0.35, first_year=2000):
+    """A (values, sectors, years) panel with FDI-like skew and zero runs.
+
+    ``zero_run_rate`` is the share of sectors with a run of zero years. Half
+    of those runs start in the first year (sectors that open late); the rest
+    sit anywhere (sectors that pause).
+    """
+    rng = np.random.default_rng(seed)
+    size = rng.lognormal(mean=3.0, sigma=1.6, size=(n_sectors, 1))
+    growth = rng.normal(0.12, 0.10, size=(n_sectors, 1))
+    shocks = rng.normal(0.0, 0.6, size=(n_sectors, n_years))
+    steps = np.arange(n_years)
+    values = size * np.exp(growth * steps + shocks)
+
+    has_run = rng.random(n_sectors) < zero_run_rate
+    length = np.minimum(rng.geometric(0.25, n_sectors), n_years)
+    start = np.where(rng.random(n_sectors) < 0.5, 0, rng.integers(0, n_years, n_sectors))
+    in_run = has_run[:, None] & (steps >= start[:, None]) & (steps < (start + length)[:, None])
+    values[in_run] = 0.0
+
+    values = np.round(values, 2)
+    width = len(str(n_sectors - 1))
+    sectors = [f"SECTOR {i:0{width}d}" for i in range(n_sectors)]
+    years = FiscalYearIndex.range(first_year, n_years).labels()
+    return values, sectors, list(years)
+
+
+def write_panel_csv(path, n_sectors, n_years, seed=0, chunk_rows=100_000):
+    """Write a synthetic panel to ``path`` in the notebook's CSV layout, ``chunk_rows`` at a time."""
+    years = FiscalYearIndex.range(2000, n_years).labels()
+    width = len(str(n_sectors - 1))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(["Sector", *years]) + "\n")
+        for offset in range(0, n_sectors, chunk_rows):
+            rows = min(chunk_rows, n_sectors - offset)
+            values, _, _ = synthetic_panel(rows, n_years, seed=seed + offset)
+            frame = pd.DataFrame(values, columns=years)
+            frame.insert(0, "Sector", [f"SECTOR {offset + i:0{width}d}" for i in range(rows)])
+            frame.to_csv(f, header=False, index=False, float_format="%.2f")
+    return path
+
+
+# --- stages -------------------------------------------------------------------
+
+def _draw(function, *args, **kwargs):
+    import matplotlib.pyplot as plt
+
+    fig = function(*args, **kwargs)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def _stages():
+    """(name, function(ctx) -> value) in the order the notebook runs them.
+
+    A stage's return value is stored in ``ctx`` under its name for later stages.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from . import charts, loader
+    from .backtest import backtest_cube
+    from .cube import FDICube
+    from .forecast import forecast_cube
+    from .growth import GrowthMetrics
+    from .outliers import detect_outliers
+    from .profile import profile_values
+    from .quantiles import panel_quantiles
+    from .ranking import RankIndex
+    from .streaming import stream_summary
+
+    def parse_csv(ctx):
+        return pd.read_csv(ctx["path"])
+
+    def load_cached(ctx):
+        # Drop the in-process frame so each run re-opens the memory map
+        loader._frames.pop(os.path.abspath(ctx["path"]), None)
+        return loader.load_fdi_data(ctx["path"])
+
+    def top_n(ctx):
+        return ctx["cube"].sector_totals().sort_values(ascending=False).head(10)
+
+    return [
+        ("parse_csv", parse_csv),
+        ("load_cached", load_cached),
+        ("cube", lambda ctx: FDICube.from_frame(ctx["load_cached"])),
+        ("reshape_long", lambda ctx: FDICube.from_frame(ctx["load_cached"]).long),
+        ("reshape_wide", lambda ctx: FDICube.from_frame(ctx["load_cached"]).wide),
+        ("year_totals", lambda ctx: ctx["cube"].year_totals()),
+        ("top_n", top_n),
+        ("rank_extremes", lambda ctx: RankIndex(ctx["cube"]).extremes(k=3)),
+        ("quantiles", lambda ctx: panel_quantiles(ctx["cube"])),
+        ("profile", lambda ctx: profile_values(ctx["cube"].values, ctx["cube"].years)),
+        ("outliers", lambda ctx: detect_outliers(ctx["cube"], ctx["profile"])),
+        ("growth", lambda ctx: GrowthMetrics(ctx["cube"]).summary()),
+        ("forecast", lambda ctx: forecast_cube(ctx["cube"], horizon=7)),
+        ("forecast_intervals", lambda ctx: forecast_cube(ctx["cube"], horizon=7, level=0.95)),
+        ("backtest", lambda ctx: backtest_cube(ctx["cube"], horizon=3, min_train=5)),
+        ("stream_summary", lambda ctx: stream_summary(ctx["path"], chunksize=100_000)),
+        ("plot_top_sectors", lambda ctx: _draw(charts.top_sectors_bar, ctx["cube"])),
+        ("plot_histogram", lambda ctx: _draw(charts.fdi_histogram, ctx["cube"], profile=ctx["profile"])),
+        ("plot_boxplot", lambda ctx: _draw(charts.year_boxplot, ctx["cube"], ctx["profile"], ctx["outliers"])),
+        ("plot_heatmap", lambda ctx: _draw(charts.panel_heatmap, ctx["cube"], order="total")),
+    ]
+
+
+def stage_names():
+    """Names of every stage, in run order."""
+    return [name for name, _ in _stages()]
+
+
+def _measure(function, ctx, repeat, trace_memory):
+    times = []
+    value = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        value = function(ctx)
+        times.append(time.perf_counter() - start)
+    peak = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function(ctx)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return value, times, peak
+
+
+def parse_size(text):
+    """'10000x17' -> (10000, 17)."""
+    sectors, _, years = text.lower().partition("x")
+    return int(sectors), int(years or 17)
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, stages=None, repeat=3, trace_memory=True, seed=0, workdir=None, log=None):
+    """Time ``stages`` (default: all) on a synthetic panel of each size; returns the result dict."""
+    names = stage_names()
+    selected = set(names if stages is None else stages)
+    unknown = selected - set(names)
+    if unknown:
+        raise ValueError(f"unknown stage(s) {sorted(unknown)}; expected some of {names}")
+    # Later stages read earlier results, so those always run (but are only reported if asked for)
+    needed = {"load_cached", "cube", "profile", "outliers"}
+
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for size in sizes:
+            n_sectors, n_years = parse_size(size) if isinstance(size, str) else size
+            path = os.path.join(tmp, f"panel_{n_sectors}x{n_years}.csv")
+            start = time.perf_counter()
+            write_panel_csv(path, n_sectors, n_years, seed=seed)
+            if log:
+                log(f"{n_sectors}x{n_years}: generated {os.path.getsize(path) / 2 ** 20:.1f} MB "
+                    f"in {time.perf_counter() - start:.2f}s")
+
+            ctx = {"path": path}
+            for name, function in _stages():
+                if name not in selected and name not in needed:
+                    continue
+                reported = name in selected
+                value, times, peak = _measure(function, ctx, repeat if reported else 1, trace_memory and reported)
+                ctx[name] = value
+                if not reported:
+                    continue
+                row = {
+                    "sectors": n_sectors,
+                    "years": n_years,
+                    "stage": name,
+                    "repeat": len(times),
+                    "min_s": min(times),
+                    "median_s": statistics.median(times),
+                    "peak_bytes": peak,
+                }
+                results.append(row)
+                if log:
+                    memory = f"{peak / 2 ** 20:8.1f} MB" if peak is not None else ""
+                    log(f"  {name:<18} {row['min_s']:9.4f}s {memory}")
+            del ctx
+    return {"meta": _environment(repeat, seed), "results": results}
+
+
+def _environment(repeat, seed):
+    import matplotlib
+
+    return {
+        "bench_version": BENCH_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "repeat": repeat,
+        "seed": seed,
+    }
+
+
+def results_frame(results):
+    """The ``results`` list of a benchmark run as a DataFrame indexed by (sectors, years, stage)."""
+    return pd.DataFrame(results["results"]).set_index(["sectors", "years", "stage"])
+
+
+def compare(old, new):
+    """Per-stage time and memory ratios (new / old) of two benchmark runs (dicts or JSON paths)."""
+    old, new = (_read(run) for run in (old, new))
+    joined = results_frame(old).join(results_frame(new), lsuffix="_old", rsuffix="_new", how="inner")
+    table = pd.DataFrame({
+        "old_s": joined["min_s_old"],
+        "new_s": joined["min_s_new"],
+        "time_ratio": joined["min_s_new"] / joined["min_s_old"],
+        "memory_ratio": joined["peak_bytes_new"] / joined["peak_bytes_old"],
+    })
+    return table
+
+
+def _read(run):
+    if isinstance(run, dict):
+        return run
+    with open(run, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every FDI analysis stage on synthetic panels.")
+    parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES),
+                        help="panel sizes as SECTORSxYEARS (default: %(default)s)")
+    parser.add_argument("--large", action="store_true", help=f"also run {', '.join(LARGE_SIZES)} (several GB)")
+    parser.add_argument("--stage", nargs="+", choices=stage_names(), help="run only these stages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench.json", help="JSON results file (default: bench.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(compare(*args.compare).round(3).to_string())
+        return
+
+    sizes = list(args.sizes) + (list(LARGE_SIZES) if args.large else [])
+    results = run_benchmarks(sizes, stages=args.stage, repeat=args.repeat, trace_memory=not args.no_memory,
+                             seed=args.seed, log=lambda line: print(line, flush=True))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {len(results['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
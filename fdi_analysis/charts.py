@@ -0,0 +1,324 @@
+"""Figure builders for every chart in the FDI notebook.
+
+Each function takes an ``FDICube`` (plus optional settings), draws onto a new
+figure and returns it without calling ``plt.show()``. The notebook cells show
+the figure interactively, and ``fdi_analysis.render`` saves the same figures
+to files on a headless backend.
+"""
+
+import matplotlib.colors as mcolors
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from .outliers import detect_outliers
+from .profile import profile_values
+from .ranking import RankIndex
+
+SELECTED_SECTORS = [
+    "SERVICES SECTOR (Fin.,Banking,Insurance,Non Fin/Business,Outsourcing,R&D,Courier,Tech. Testing and Analysis, Other)",
+    "COMPUTER SOFTWARE & HARDWARE",
+    "TELECOMMUNICATIONS",
+    "CONSTRUCTION DEVELOPMENT: Townships, housing, built-up infrastructure and construction-development projects",
+]
+
+# Hierarchical clustering needs O(rows^2) memory; larger panels are ordered by total instead
+CLUSTER_MAX_ROWS = 2000
+
+
+def yearly_investment_line(cube, highlight_years=("2009-10", "2010-11", "2012-13")):
+    """Year-wise FDI with the low years highlighted."""
+    yearly_investment = cube.year_totals()
+    highlight_years = list(highlight_years)
+    highlight_values = yearly_investment.loc[highlight_years]
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.lineplot(x=yearly_investment.index, y=yearly_investment.values, marker="o", label="Yearly Investment", ax=ax)
+    sns.lineplot(x=highlight_years, y=highlight_values.values, marker="o", linestyle="--", color="red",
+                 label="Low FDI Years", ax=ax)
+    for year in highlight_years:
+        ax.text(year, yearly_investment[year], f"{year}: {yearly_investment[year]:.2f}", horizontalalignment="right")
+
+    ax.set_title("Year-wise FDI in India with Highlights for 2010 and 2011")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Investment (in million USD)")
+    ax.tick_params(axis="x", labelrotation=90)
+    ax.legend()
+    ax.grid(True)
+    return fig
+
+
+def lowest_highest_scatter(cube, years=("2009-10", "2010-11"), ranks=None):
+    """Lowest and highest FDI sector for each of ``years`` (from a ``RankIndex``)."""
+    if ranks is None:
+        ranks = RankIndex(cube)
+    fig, ax = plt.subplots(figsize=(12, 8))
+    for year in years:
+        lowest_sector, lowest_fdi = ranks.lowest(year)
+        highest_sector, highest_fdi = ranks.highest(year)
+        ax.scatter(lowest_fdi, lowest_sector, color="red", label=f"Lowest FDI Sector {year}", marker="o", s=100)
+        ax.scatter(highest_fdi, highest_sector, color="green", label=f"Highest FDI Sector {year}", marker="o", s=100)
+
+    ax.set_xlabel("FDI (in million USD)")
+    ax.set_ylabel("Sector")
+    ax.set_title(f"Lowest and Highest FDI Sectors for {' and '.join(years)}")
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def top_sectors_bar(cube, top_n=10):
+    """Horizontal bar chart of the ``top_n`` sectors by total FDI."""
+    top_sector_investment = cube.sector_totals().sort_values(ascending=False).head(top_n)
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    sns.barplot(x=top_sector_investment.values, y=top_sector_investment.index, hue=top_sector_investment.index,
+                orient="h", palette="viridis", legend=False, ax=ax)
+    ax.set_title(f"Top {top_n} Sector-wise FDI in India")
+    ax.set_xlabel("Investment (in million USD)")
+    ax.set_ylabel("Sector")
+    ax.grid(True)
+    return fig
+
+
+def sector_trends(cube, sectors=SELECTED_SECTORS):
+    """FDI over time for a few sectors."""
+    fig, ax = plt.subplots(figsize=(14, 10))
+    for sector in sectors:
+        ax.plot(cube.years, cube.sector(sector), marker="o", label=cube.sectors[cube.row(sector)])
+
+    ax.set_title("FDI Trends in Selected Sectors")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("FDI (in million USD)")
+    ax.tick_params(axis="x", labelrotation=90)
+    ax.legend()
+    ax.grid(True)
+    return fig
+
+
+def sector_forecasts(cube, trend, sectors=SELECTED_SECTORS):
+    """Historical values and trend projections (a ``TrendForecast``) for a few sectors.
+
+    When the trend carries prediction intervals, each forecast is drawn with
+    its band shaded in the line's colour.
+    """
+    fig, ax = plt.subplots(figsize=(14, 10))
+    for sector in sectors:
+        row = cube.row(sector)
+        sector = cube.sectors[row]
+        sns.lineplot(x=cube.years, y=cube.values[row], marker="o", label=f"{sector} (Historical)", ax=ax)
+        sns.lineplot(x=trend.forecast_years, y=trend.forecast[row], marker="o", linestyle="--",
+                     label=f"{sector} (Forecast)", ax=ax)
+        if trend.lower is not None:
+            ax.fill_between(trend.forecast_years, trend.lower[row], trend.upper[row],
+                            color=ax.lines[-1].get_color(), alpha=0.15, linewidth=0)
+
+    title = f"FDI Trends and Forecasts for Selected Sectors for next {len(trend.forecast_years)} years"
+    if trend.lower is not None:
+        title += f" (shaded: {trend.level:.0%} prediction intervals)"
+    ax.set_title(title)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("FDI (in million USD)")
+    ax.tick_params(axis="x", labelrotation=90)
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+def year_boxplot(cube, profile=None, outliers=None):
+    """Boxplot of each year's sector values.
+
+    The boxes come from the cube's ``DataProfile`` and the fliers from the
+    outlier engine's IQR flags, so no statistic is computed twice.
+    """
+    if profile is None:
+        profile = profile_values(cube.values, cube.years)
+    if outliers is None:
+        outliers = detect_outliers(cube, profile)
+
+    fig, ax = plt.subplots(figsize=(14, 10))
+    ax.bxp(profile.box_stats(outliers.fliers()), patch_artist=True, boxprops={"facecolor": "C0", "alpha": 0.8},
+           medianprops={"color": "black"}, flierprops={"marker": "d", "markerfacecolor": "0.3"})
+    ax.set_title("Outlier Detection in FDI Data")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("FDI (in million USD)")
+    ax.tick_params(axis="x", labelrotation=90)
+    ax.grid(True)
+    return fig
+
+
+def year_pie(cube, year="2010-11", sectors=SELECTED_SECTORS, title=None):
+    """Share of the selected sectors (or groups) in one year's FDI."""
+    shares = cube.select(sectors).year_series(year)
+
+    fig, ax = plt.subplots(figsize=(25, 15))
+    shares.plot(kind="pie", autopct="%1.1f%%", textprops={"fontsize": 18, "fontweight": "bold"}, ax=ax)
+    ax.set_title(title or f"Pie Chart of FDI in {year} by Selected Sectors", fontsize=18, fontweight="bold")
+    ax.set_ylabel("")
+    ax.legend(title="Sectors", title_fontsize="20", fontsize="20", loc="center left", bbox_to_anchor=(1, 0.5),
+              frameon=False, prop={"weight": "bold"})
+    return fig
+
+
+def fdi_histogram(cube, bins=20, profile=None):
+    """Distribution of every sector-year FDI value, from the profile's bin counts."""
+    if profile is None or profile.bins != bins:
+        profile = profile_values(cube.values, cube.years, bins=bins)
+    edges = profile.bin_edges
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.hist(edges[:-1], bins=edges, weights=profile.panel_histogram(), alpha=0.5, color="purple")
+    ax.set_title("Histogram of FDI Year-wise")
+    ax.set_xlabel("FDI (in million USD)")
+    ax.set_ylabel("Frequency")
+    return fig
+
+
+def yearly_total_bar(cube):
+    """Bar chart of total FDI per year."""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    cube.year_totals().plot(kind="bar", color="green", ax=ax)
+    ax.set_title("Barplot of Total FDI Year-wise")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("FDI (in million USD)")
+    ax.tick_params(axis="x", labelrotation=90)
+    return fig
+
+
+def selected_scatter(cube, sectors=SELECTED_SECTORS):
+    """Year-wise FDI of the selected sectors as a scatter plot."""
+    filtered_data = cube.select(sectors).long
+
+    fig, ax = plt.subplots(figsize=(20, 10))
+    sns.scatterplot(data=filtered_data, x="Year", y="FDI", hue="Sector", palette="viridis", s=200, ax=ax)
+    ax.set_title("Scatterplot of FDI Year-wise for Selected Sectors")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("FDI (in million USD)")
+    ax.tick_params(axis="x", labelrotation=90)
+    ax.legend(title="Sector", bbox_to_anchor=(1.05, 1), loc="upper left")
+    ax.grid(True)
+    return fig
+
+
+def selected_heatmap(cube, sectors=SELECTED_SECTORS):
+    """Annotated year x sector heatmap of the selected sectors."""
+    heatmap_data = cube.select(sectors).wide
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    sns.heatmap(heatmap_data, annot=True, fmt=".1f", cmap="viridis", linewidths=.5, ax=ax)
+    ax.set_title("Heatmap of FDI Year-wise for Selected Sectors")
+    ax.set_xlabel("Sector")
+    ax.set_ylabel("Year")
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+    plt.setp(ax.get_yticklabels(), rotation=0)
+    return fig
+
+
+def _cluster_order(values):
+    """Row order that places sectors with similar year profiles next to each other.
+
+    Uses average-linkage clustering (scipy) on the log-scaled rows; without
+    scipy, falls back to ordering by the leading principal component. Past
+    ``CLUSTER_MAX_ROWS`` rows the pairwise distances would not fit in
+    memory, so the rows are ordered by total FDI instead.
+    """
+    if len(values) > CLUSTER_MAX_ROWS:
+        return _total_order(values)
+    rows = np.log1p(np.clip(np.nan_to_num(values), 0, None))
+    if len(rows) < 3:
+        return np.arange(len(rows))
+    try:
+        from scipy.cluster.hierarchy import leaves_list, linkage
+        from scipy.spatial.distance import pdist
+    except ImportError:
+        centred = rows - rows.mean(axis=0)
+        _, _, vt = np.linalg.svd(centred, full_matrices=False)
+        return np.argsort(centred @ vt[0], kind="stable")
+    # Condensed distances: a square panel would otherwise be taken for a distance matrix
+    return leaves_list(linkage(pdist(rows, metric="euclidean"), method="average"))
+
+
+def _total_order(values):
+    """Row order by total FDI, largest first."""
+    return np.argsort(-np.nan_to_num(values).sum(axis=1), kind="stable")
+
+
+def _heatmap_norm(values, scale, levels=10):
+    finite = values[np.isfinite(values)]
+    if len(finite) == 0:
+        # Nothing to scale (empty or all-missing panel)
+        return mcolors.Normalize(vmin=0.0, vmax=1.0)
+    if scale == "log":
+        # Symmetric log keeps the zero-FDI cells instead of masking them
+        return mcolors.SymLogNorm(linthresh=1.0, vmin=finite.min(), vmax=finite.max())
+    if scale == "quantile":
+        edges = np.unique(np.quantile(finite, np.linspace(0, 1, levels + 1)))
+        if len(edges) < 2:
+            edges = np.array([finite.min(), finite.min() + 1.0])
+        return mcolors.BoundaryNorm(edges, ncolors=256)
+    return mcolors.Normalize(vmin=finite.min(), vmax=finite.max())
+
+
+def panel_heatmap(cube, sectors=None, order=None, scale="log", annotate="auto", max_annotations=400):
+    """Sector x year heatmap of the whole panel drawn as one rasterized image.
+
+    ``order="cluster"`` groups sectors with similar histories and
+    ``order="total"`` sorts them by total FDI. ``scale`` is "linear", "log"
+    or "quantile" (deciles). With ``annotate="auto"``, cell values are
+    written only when there are at most ``max_annotations`` cells.
+    """
+    panel = cube if sectors is None else cube.select(sectors)
+    values = panel.values
+    if order == "cluster":
+        rows = _cluster_order(values)
+    elif order == "total":
+        rows = _total_order(values)
+    elif order is None:
+        rows = np.arange(len(panel.sectors))
+    else:
+        raise ValueError("order must be None, 'cluster' or 'total'")
+    values = values[rows]
+    labels = [panel.sectors[i] for i in rows]
+    n_rows, n_cols = values.shape
+
+    # Past ~90 rows the image is resampled to the figure anyway; a bigger canvas only costs memory
+    height = min(max(4.0, 0.22 * n_rows), 20.0)
+    fig, ax = plt.subplots(figsize=(14, height))
+    image = ax.imshow(values, aspect="auto", interpolation="nearest", cmap="viridis",
+                      norm=_heatmap_norm(values, scale))
+    image.set_rasterized(True)
+    fig.colorbar(image, ax=ax, label="FDI (in million USD)")
+
+    has_values = np.isfinite(values).any()
+    if has_values and (annotate is True or (annotate == "auto" and values.size <= max_annotations)):
+        threshold = image.norm(np.nanmax(values)) / 2
+        for (i, j), value in np.ndenumerate(values):
+            if np.isfinite(value):
+                ax.text(j, i, f"{value:.1f}", ha="center", va="center", fontsize=7,
+                        color="black" if image.norm(value) > threshold else "white")
+
+    ax.set_xticks(np.arange(n_cols), labels=panel.years, rotation=90)
+    # Label every row while they stay legible, otherwise roughly 60 of them
+    step = max(1, n_rows // 60)
+    ax.set_yticks(np.arange(0, n_rows, step), labels=[name[:50] for name in labels[::step]], fontsize=7)
+    ax.set_title(f"Heatmap of FDI Year-wise for {'All' if sectors is None else 'Selected'} Sectors")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Sector")
+    fig.tight_layout()
+    return fig
+
+
+def selected_stacked_area(cube, sectors=SELECTED_SECTORS, title=None):
+    """Stacked area chart of the selected sectors (or groups) over time."""
+    pivot_data = cube.select(sectors).wide.fillna(0)
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    pivot_data.plot.area(cmap="viridis", alpha=0.7, ax=ax)
+    ax.set_title(title or "Stacked Area Chart of FDI Year-wise for Selected Sectors")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("FDI (in million USD)")
+    ax.legend(title="Sector")
+    ax.grid(True)
+    return fig
@@ -0,0 +1,235 @@
+"""Command-line entry point: ``fdi-analysis stats|forecast|render|serve --input PATH``.
+
+Only the ``render`` subcommand draws, so only it imports matplotlib and
+seaborn; ``stats`` and ``forecast`` import numpy and pandas and nothing from
+the plotting stack. ``--timing`` prints three phases to stderr: startup
+(from importing this module to parsed arguments), imports (numpy, pandas
+and the package modules the command needs, loaded before it runs) and the
+command itself, plus whether a plotting library was loaded. This keeps
+startup cost visible for scheduled jobs.
+
+    fdi-analysis stats --input "FDI data.csv" --top 10
+    fdi-analysis forecast --input "FDI data.csv" --horizon 7 --sectors "services sector" telecommunications
+    fdi-analysis render --input "FDI data.csv" --output charts --format png svg
+    fdi-analysis serve --input "FDI data.csv" --port 8050
+    python -m fdi_analysis stats --input "FDI data.csv" --timing
+"""
+
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import importlib
+import os
+import sys
+
+PLOTTING_MODULES = ("matplotlib", "seaborn")
+
+# Heavy modules each command needs, imported (and timed) before it runs
+COMMAND_IMPORTS = {
+    "stats": ("numpy", "pandas", ".cube", ".loader", ".profile", ".streaming"),
+    "forecast": ("numpy", "pandas", ".cube", ".forecast", ".loader"),
+    "render": ("numpy", "pandas", ".render"),
+    "serve": ("numpy", "pandas", ".cube", ".loader", ".server"),
+}
+
+
+def _bounded_int(low, high=None):
+    """argparse type: an integer in [low, high] (no upper bound when ``high`` is None)."""
+
+    def parse(text):
+        try:
+            value = int(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid integer: {text!r}") from None
+        if value < low or (high is not None and value > high):
+            bounds = f"at least {low}" if high is None else f"between {low} and {high}"
+            raise argparse.ArgumentTypeError(f"must be {bounds}, got {value}")
+        return value
+
+    return parse
+
+
+def _write(frame, output, fmt, title=None):
+    """Print ``frame`` as a table, or write it as CSV/JSON to ``output`` (``-`` for stdout)."""
+    if fmt == "table":
+        if title:
+            print(title)
+        print(frame.to_string())
+        print()
+        return
+    text = frame.to_csv(float_format="%.10g") if fmt == "csv" else frame.to_json(orient="split", indent=2)
+    if output in (None, "-"):
+        sys.stdout.write(text if text.endswith("\n") else text + "\n")
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def _stats(args):
+    import pandas as pd
+
+    from .cube import FDICube
+    from .loader import load_fdi_data
+    from .profile import profile_values
+    from .streaming import stream_summary
+
+    if args.stream:
+        summary = stream_summary(args.input, chunksize=args.chunksize, top_n=args.top)
+        year_totals, top, describe = summary.year_totals, summary.top_sectors, summary.describe
+        nulls = summary.null_counts
+    else:
+        cube = FDICube.from_frame(load_fdi_data(args.input))
+        profile = profile_values(cube.values, cube.years)
+        year_totals = cube.year_totals()
+        top = cube.sector_totals().sort_values(ascending=False, kind="stable").head(args.top)
+        describe = profile.describe()
+        nulls = profile.null_counts()
+
+    sections = {
+        "yearly_totals": year_totals.to_frame("FDI"),
+        "top_sectors": top.to_frame("FDI"),
+        "describe": describe.T,
+        "null_counts": nulls.to_frame("nulls"),
+    }
+    wanted = args.section or list(sections)
+    if args.format == "table":
+        for name in wanted:
+            _write(sections[name], None, "table", title=f"== {name} ==")
+    else:
+        combined = pd.concat({name: sections[name].stack() for name in wanted}, names=["section", "row", "column"])
+        _write(combined.to_frame("value"), args.output, args.format)
+
+
+def _forecast(args):
+    from .cube import FDICube
+    from .forecast import forecast_cube
+    from .loader import load_fdi_data
+
+    cube = FDICube.from_frame(load_fdi_data(args.input))
+    if args.sectors:
+        cube = cube.select(args.sectors)
+    trend = forecast_cube(cube, horizon=args.horizon, model=args.model, level=args.level, n_boot=args.n_boot,
+                          seed=args.seed)
+    if args.level is not None:
+        frame = trend.interval_frame(stats=args.stats)
+    else:
+        frame = trend.forecast_frame()
+        if args.stats:
+            frame = frame.join(trend.stats_frame())
+    frame.index.name = "Sector"
+    _write(frame, args.output, args.format, title=f"== {args.model} forecast, {args.horizon} years ==")
+
+
+def _render(args):
+    from .render import render_charts
+
+    start = time.perf_counter()
+    report = render_charts(args.input, args.output, names=args.chart, formats=tuple(args.format),
+                           workers=args.workers, dpi=args.dpi)
+    print(report[["load_s", "draw_s", "save_s", "total_s"]].round(3).to_string())
+    print(f"Rendered {len(report)} charts to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+def _serve(args):
+    from .server import serve
+
+    serve(args.input, host=args.host, port=args.port, max_entries=args.cache_entries,
+          max_bytes=int(args.cache_mb * 2 ** 20), workers=args.workers)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="fdi-analysis", description="FDI panel statistics, forecasts and charts.")
+    parser.add_argument("--timing", action="store_true", help="report startup and command time on stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def command(name, help_text):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("--input", "-i", required=True, help="path to the FDI CSV file")
+        sub.add_argument("--timing", action="store_true", default=argparse.SUPPRESS,
+                         help="report startup and command time on stderr")
+        return sub
+
+    stats = command("stats", "yearly totals, top-N sectors, describe() and null counts")
+    stats.add_argument("--top", type=_bounded_int(1), default=10, help="number of top sectors (default: 10)")
+    stats.add_argument("--section", nargs="+", choices=["yearly_totals", "top_sectors", "describe", "null_counts"])
+    stats.add_argument("--stream", action="store_true", help="one bounded-memory pass over the CSV in chunks")
+    stats.add_argument("--chunksize", type=_bounded_int(1), default=100_000)
+    stats.add_argument("--format", choices=["table", "csv", "json"], default="table")
+    stats.add_argument("--output", "-o", help="file for csv/json output (default: stdout)")
+    stats.set_defaults(handler=_stats)
+
+    forecast = command("forecast", "trend forecasts for every (or the chosen) sector")
+    # Upper limits come from forecast.MAX_HORIZON / MAX_N_BOOT, checked in main() once it is imported
+    forecast.add_argument("--horizon", type=_bounded_int(1), default=7, help="years to project (default: 7)")
+    forecast.add_argument("--model", choices=["linear", "quadratic", "loglinear"], default="linear")
+    forecast.add_argument("--sectors", nargs="+", help="sector names or unambiguous short forms")
+    forecast.add_argument("--level", type=float, help="add bootstrap prediction intervals at this level (e.g. 0.95)")
+    forecast.add_argument("--n-boot", type=_bounded_int(1), default=1000,
+                          help="bootstrap resamples (default: 1000)")
+    forecast.add_argument("--seed", type=int, default=0)
+    forecast.add_argument("--stats", action="store_true", help="add fit statistics (slope, r2, rmse)")
+    forecast.add_argument("--format", choices=["table", "csv", "json"], default="table")
+    forecast.add_argument("--output", "-o", help="file for csv/json output (default: stdout)")
+    forecast.set_defaults(handler=_forecast)
+
+    render = command("render", "draw every chart to image files")
+    render.add_argument("--output", "-o", default="charts", help="output directory (default: charts)")
+    render.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg", "pdf"])
+    render.add_argument("--chart", nargs="+", help="render only these charts (names as in fdi_analysis.render)")
+    render.add_argument("--workers", type=int, help="number of processes (default: one per CPU)")
+    render.add_argument("--dpi", type=int, default=100)
+    render.set_defaults(handler=_render)
+
+    serve = command("serve", "answer dashboard queries over HTTP from one loaded panel")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8050)
+    serve.add_argument("--cache-entries", type=int, default=256, help="result cache size in entries (default: 256)")
+    serve.add_argument("--cache-mb", type=float, default=64, help="result cache size in MB (default: 64)")
+    serve.add_argument("--workers", type=int, help="computation threads (default: Python's thread-pool default)")
+    serve.set_defaults(handler=_serve)
+    return parser
+
+
+def _check_limits(parser, args):
+    """Enforce the forecast module's limits as argparse errors (forecast is imported by now)."""
+    if args.command != "forecast":
+        return
+    from .forecast import check_horizon, check_n_boot
+
+    try:
+        check_horizon(args.horizon)
+        check_n_boot(args.n_boot)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.input):
+        sys.exit(f"fdi-analysis: no such file: {args.input}")
+    parsed = time.perf_counter()
+    for name in COMMAND_IMPORTS[args.command]:
+        importlib.import_module(name, __package__)
+    ready = time.perf_counter()
+    _check_limits(parser, args)
+    try:
+        args.handler(args)
+    except (KeyError, ValueError) as exc:
+        # Unknown sectors/charts and malformed input files
+        sys.exit(f"fdi-analysis {args.command}: {exc}")
+    done = time.perf_counter()
+    if args.timing:
+        loaded = [name for name in PLOTTING_MODULES if name in sys.modules]
+        print(
+            f"startup {1000 * (parsed - _STARTED):.0f} ms, imports {1000 * (ready - parsed):.0f} ms, "
+            f"{args.command} {1000 * (done - ready):.0f} ms, "
+            f"plotting modules loaded: {', '.join(loaded) or 'none'}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Memory-compact representation of the FDI panel.
+
+The old long frames (``year_data``, ``filtered_data``) repeated the full
+sector string in every row next to a float64 value. In compact mode, sectors
+and years are integer codes into shared dictionaries. Values are stored as
+float32, or as integers scaled by 10**decimals (the CSV has two decimal
+places). Before anything is accepted, the round-trip error is checked
+against an explicit tolerance. ``memory_report`` compares this layout with
+the frames the notebook used to build.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .cube import FDICube
+
+MODES = ("float32", "scaled")
+
+
+@dataclass
+class CompactPanel:
+    """Sector x year values in a compact dtype plus the label dictionaries.
+
+    ``store`` holds the encoded values; in "scaled" mode the real value is
+    ``store / scale``. ``max_error`` is the largest absolute round-trip error
+    measured when the panel was encoded.
+    """
+
+    sectors: list
+    years: list
+    store: np.ndarray
+    mode: str
+    scale: float
+    max_error: float
+
+    @property
+    def values(self):
+        """Decoded values (float32 stays float32; scaled ints become float64)."""
+        if self.mode == "scaled":
+            return self.store / self.scale
+        return self.store
+
+    @property
+    def nbytes(self):
+        return self.store.nbytes
+
+    def to_cube(self):
+        """An ``FDICube`` over the compact values (float32 mode keeps float32)."""
+        values = self.store if self.mode == "float32" else self.values
+        return FDICube(values, self.sectors, self.years, dtype=values.dtype)
+
+    def long_frame(self):
+        """Long (Year, Sector, FDI) frame with categorical codes and compact values."""
+        n_sectors, n_years = self.store.shape
+        sector_codes = np.repeat(np.arange(n_sectors, dtype=_code_dtype(n_sectors)), n_years)
+        year_codes = np.tile(np.arange(n_years, dtype=_code_dtype(n_years)), n_sectors)
+        return pd.DataFrame(
+            {
+                "Year": pd.Categorical.from_codes(year_codes, categories=self.years),
+                "Sector": pd.Categorical.from_codes(sector_codes, categories=self.sectors),
+                "FDI": self.store.reshape(-1),
+            },
+            copy=False,
+        )
+
+
+def _code_dtype(n):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def to_compact(cube, mode="float32", decimals=2, tolerance=None):
+    """Encode ``cube`` compactly, refusing if precision would be lost.
+
+    ``tolerance`` is the largest acceptable absolute error per value; it
+    defaults to half a unit in the last of ``decimals`` places (0.005 for the
+    FDI data). Scaled mode picks the smallest integer type that fits.
+    Missing values are only supported in float32 mode.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+    if tolerance is None:
+        tolerance = 0.5 * 10.0 ** -decimals
+    values = np.asarray(cube.values, dtype=np.float64)
+
+    if mode == "float32":
+        scale = 1.0
+        store = values.astype(np.float32)
+        decoded = store.astype(np.float64)
+    else:
+        if np.isnan(values).any():
+            raise ValueError("scaled mode cannot store missing values; use float32 mode")
+        scale = 10.0 ** decimals
+        scaled = np.rint(values * scale)
+        store = None
+        for dtype in (np.int16, np.int32, np.int64):
+            info = np.iinfo(dtype)
+            if scaled.size == 0 or (scaled.min() >= info.min and scaled.max() <= info.max):
+                store = scaled.astype(dtype)
+                break
+        decoded = store / scale
+
+    with np.errstate(invalid="ignore"):
+        errors = np.abs(decoded - values)
+    max_error = float(np.nanmax(errors)) if errors.size else 0.0
+    if max_error > tolerance:
+        raise ValueError(
+            f"{mode} encoding loses precision: max error {max_error:.3g} exceeds tolerance {tolerance:.3g}"
+        )
+    return CompactPanel(list(cube.sectors), list(cube.years), store, mode, scale, max_error)
+
+
+def _frame_bytes(frame):
+    return int(frame.memory_usage(deep=True, index=True).sum())
+
+
+def memory_report(cube, frame=None, modes=MODES):
+    """Bytes held by each layout of the panel, largest first.
+
+    Compares the CSV-shaped frame (``frame`` if given), the old melted long
+    frame with repeated sector strings, the float64 cube and its lazy
+    categorical long view, and the compact encodings.
+    """
+    sectors = pd.Series(cube.sectors, dtype=object)
+    if frame is None:
+        frame = pd.DataFrame(np.asarray(cube.values), columns=cube.years)
+        frame.insert(0, "Sector", sectors)
+
+    # What `data.set_index('Sector').T.reset_index().melt(...)` used to build
+    melted = pd.DataFrame({
+        "Year": np.tile(np.array(cube.years, dtype=object), len(cube.sectors)),
+        "Sector": np.repeat(sectors.to_numpy(), len(cube.years)),
+        "FDI": np.asarray(cube.values, dtype=np.float64).reshape(-1),
+    })
+
+    rows = {
+        "csv frame": _frame_bytes(frame),
+        "melted long frame (old)": _frame_bytes(melted),
+        "cube values (float64)": np.asarray(cube.values, dtype=np.float64).nbytes,
+        "cube long view (categorical)": _frame_bytes(cube.long),
+    }
+    for mode in modes:
+        try:
+            compact = to_compact(cube, mode=mode)
+        except ValueError:
+            continue
+        rows[f"compact values ({mode}, {compact.store.dtype})"] = compact.nbytes
+        rows[f"compact long frame ({mode})"] = _frame_bytes(compact.long_frame())
+
+    report = pd.DataFrame({"bytes": pd.Series(rows)})
+    report["MB"] = report["bytes"] / 2 ** 20
+    report["vs melted"] = report["bytes"] / rows["melted long frame (old)"]
+    return report.sort_values("bytes", ascending=False)
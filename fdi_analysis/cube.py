@@ -0,0 +1,151 @@
+"""Dense sector x year view of the FDI table.
+
+``FDICube`` keeps the values as one float array of shape (n_sectors, n_years)
+together with name -> position maps for both axes, so the notebook cells can
+slice it directly instead of transposing and melting the DataFrame each time.
+The wide (year x sector) and long (Year, Sector, FDI) frames are built lazily
+on top of the same buffer.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .fiscal import FiscalYearIndex
+from .sectors import SectorIndex
+
+
+class FDICube:
+    """Sector x fiscal-year value matrix with label lookups.
+
+    Values are float64 unless another ``dtype`` is asked for (the compact
+    mode in ``compact.py`` builds float32 cubes).
+    """
+
+    def __init__(self, values, sectors, years, dtype=np.float64):
+        values = np.asarray(values, dtype=dtype)
+        if values.ndim != 2:
+            raise ValueError("values must be a 2-D (sector, year) array")
+        if values.shape != (len(sectors), len(years)):
+            raise ValueError(
+                f"values shape {values.shape} does not match "
+                f"{len(sectors)} sectors x {len(years)} years"
+            )
+        self.values = values
+        self.sectors = list(sectors)
+        self.years = list(years)
+        self.sector_index = {name: i for i, name in enumerate(self.sectors)}
+        self.year_index = {year: j for j, year in enumerate(self.years)}
+        if len(self.sector_index) != len(self.sectors):
+            raise ValueError("sector names must be unique")
+        self._wide = None
+        self._long = None
+        self._lookup = None
+        self._fiscal_years = None
+
+    @classmethod
+    def from_frame(cls, frame, sector_column="Sector"):
+        """Build a cube from the notebook layout (Sector + one column per year)."""
+        years = [c for c in frame.columns if c != sector_column]
+        values = frame[years].to_numpy(dtype=np.float64, copy=False)
+        return cls(values, frame[sector_column].tolist(), years)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __len__(self):
+        return len(self.sectors)
+
+    def __repr__(self):
+        return f"FDICube({len(self.sectors)} sectors x {len(self.years)} years)"
+
+    @property
+    def fiscal_years(self):
+        """The year labels as a ``FiscalYearIndex`` (parsed on first use)."""
+        if self._fiscal_years is None:
+            self._fiscal_years = FiscalYearIndex.parse(self.years)
+        return self._fiscal_years
+
+    # --- sector lookup --------------------------------------------------------
+
+    @property
+    def lookup(self):
+        """``SectorIndex`` for prefix/fuzzy sector queries (built on first use)."""
+        if self._lookup is None:
+            self._lookup = SectorIndex(self.sectors)
+        return self._lookup
+
+    def row(self, name):
+        """Row position of a sector given by full name or unambiguous short form."""
+        row = self.sector_index.get(name)
+        return row if row is not None else self.lookup.position(name)
+
+    def resolve(self, names):
+        """Full sector names for a list of names or short forms."""
+        return [self.sectors[self.row(name)] for name in names]
+
+    # --- O(1) slices ----------------------------------------------------------
+
+    def sector(self, name):
+        """FDI series for one sector (a view into the cube)."""
+        return self.values[self.row(name)]
+
+    def year(self, year):
+        """FDI values of every sector for one year (a view into the cube)."""
+        return self.values[:, self.year_index[year]]
+
+    def cell(self, name, year):
+        return self.values[self.row(name), self.year_index[year]]
+
+    def select(self, sectors):
+        """Sub-cube holding only ``sectors`` (names or short forms), in the given order."""
+        rows = [self.row(name) for name in sectors]
+        return FDICube(self.values[rows], [self.sectors[i] for i in rows], self.years, dtype=self.values.dtype)
+
+    # --- aggregates -----------------------------------------------------------
+
+    def year_totals(self):
+        """Total FDI per year as a Series indexed by year label."""
+        return pd.Series(self.values.sum(axis=0), index=self.years, name="FDI")
+
+    def sector_totals(self):
+        """Total FDI per sector as a Series indexed by sector name."""
+        return pd.Series(self.values.sum(axis=1), index=self.sectors, name="FDI")
+
+    def year_series(self, year):
+        """One year's values as a Series indexed by sector name."""
+        return pd.Series(self.year(year), index=self.sectors, name=year)
+
+    # --- lazy frame views -----------------------------------------------------
+
+    @property
+    def wide(self):
+        """Year x sector DataFrame (what ``pivot('Year', 'Sector', 'FDI')`` gave)."""
+        if self._wide is None:
+            wide = pd.DataFrame(self.values.T, index=self.years, columns=self.sectors, copy=False)
+            wide.index.name = "Year"
+            wide.columns.name = "Sector"
+            self._wide = wide
+        return self._wide
+
+    @property
+    def long(self):
+        """Long (Year, Sector, FDI) frame, as produced by the old melt chain.
+
+        Rows run sector by sector, so the FDI column is a flat view of the
+        value buffer and Year/Sector are categorical codes into the cube's
+        label lists rather than repeated strings.
+        """
+        if self._long is None:
+            n_sectors, n_years = self.values.shape
+            year_codes = np.tile(np.arange(n_years), n_sectors)
+            sector_codes = np.repeat(np.arange(n_sectors), n_years)
+            self._long = pd.DataFrame(
+                {
+                    "Year": pd.Categorical.from_codes(year_codes, categories=self.years),
+                    "Sector": pd.Categorical.from_codes(sector_codes, categories=self.sectors),
+                    "FDI": self.values.reshape(-1),
+                },
+                copy=False,
+            )
+        return self._long
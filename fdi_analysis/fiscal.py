@@ -0,0 +1,115 @@
+"""Indian fiscal-year labels ('2000-01', ...) as an integer index.
+
+A fiscal year runs from 1 April to 31 March and is labelled by its start year
+plus the last two digits of its end year. ``FiscalYearIndex`` parses the
+labels once into an int array of start years. Extending the horizon, offsets
+for regressions and conversion back to plot labels or timestamps are then
+plain integer arithmetic, with no per-call string parsing. It also avoids
+the ``'%Y-%y'`` trick, which read '2000-01' as January 2000.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+FISCAL_YEAR_START_MONTH = 4
+
+_LABEL = re.compile(r"^\s*(\d{4})\s*[-/]\s*(\d{2}|\d{4})\s*$")
+
+
+def parse_fiscal_year(label):
+    """Start year of a fiscal-year label such as '2009-10' (or '2009-2010')."""
+    match = _LABEL.match(str(label))
+    if match is None:
+        raise ValueError(f"not a fiscal-year label: {label!r}")
+    start, end = int(match.group(1)), int(match.group(2))
+    expected = start + 1 if len(match.group(2)) == 4 else (start + 1) % 100
+    if end != expected:
+        raise ValueError(f"fiscal year {label!r} does not span consecutive years")
+    return start
+
+
+def fiscal_year_label(start):
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+class FiscalYearIndex:
+    """Ordered fiscal years stored as their integer start years."""
+
+    def __init__(self, start_years):
+        self.start_years = np.asarray(start_years, dtype=np.int64)
+        if self.start_years.ndim != 1:
+            raise ValueError("start_years must be one-dimensional")
+        self._labels = None
+
+    @classmethod
+    def parse(cls, labels):
+        """Parse labels such as ['2000-01', '2001-02', ...] once."""
+        return cls([parse_fiscal_year(label) for label in labels])
+
+    @classmethod
+    def range(cls, first, count):
+        """``count`` consecutive fiscal years starting at start year ``first``."""
+        return cls(np.arange(first, first + count))
+
+    def __len__(self):
+        return len(self.start_years)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return fiscal_year_label(int(self.start_years[item]))
+        return FiscalYearIndex(self.start_years[item])
+
+    def __iter__(self):
+        return iter(self.labels())
+
+    def __eq__(self, other):
+        return isinstance(other, FiscalYearIndex) and np.array_equal(self.start_years, other.start_years)
+
+    def __repr__(self):
+        if len(self) == 0:
+            return "FiscalYearIndex([])"
+        return f"FiscalYearIndex({self[0]} .. {self[-1]}, n={len(self)})"
+
+    def labels(self):
+        """Plot/column labels ('2000-01', ...), built once and cached."""
+        if self._labels is None:
+            self._labels = [fiscal_year_label(int(y)) for y in self.start_years]
+        return self._labels
+
+    def is_contiguous(self):
+        return bool(np.all(np.diff(self.start_years) == 1))
+
+    def steps(self, origin=None):
+        """Years since ``origin`` (default: the first year) as floats, for trend fitting."""
+        origin = self.start_years[0] if origin is None else origin
+        return (self.start_years - origin).astype(np.float64)
+
+    def shift(self, n):
+        return FiscalYearIndex(self.start_years + n)
+
+    def extend(self, horizon):
+        """The ``horizon`` fiscal years following the last one."""
+        last = int(self.start_years[-1])
+        return FiscalYearIndex(np.arange(last + 1, last + 1 + horizon))
+
+    def append(self, other):
+        return FiscalYearIndex(np.concatenate([self.start_years, other.start_years]))
+
+    def position(self, label):
+        """Position of a fiscal-year label (or start year) in the index."""
+        start = label if isinstance(label, (int, np.integer)) else parse_fiscal_year(label)
+        hits = np.flatnonzero(self.start_years == start)
+        if len(hits) == 0:
+            raise KeyError(label)
+        return int(hits[0])
+
+    def to_timestamps(self):
+        """First day (1 April) of each fiscal year."""
+        frame = pd.DataFrame({"year": self.start_years, "month": FISCAL_YEAR_START_MONTH, "day": 1})
+        return pd.DatetimeIndex(pd.to_datetime(frame))
+
+    def to_period_index(self):
+        """Annual periods ending in March (pandas' 'Y-MAR'), labelled by end year."""
+        return self.to_timestamps().to_period("Y-MAR")
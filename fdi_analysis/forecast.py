@@ -0,0 +1,241 @@
+"""Batch trend forecasts for every sector at once.
+
+Instead of calling ``np.polyfit`` sector by sector, the trend for every row of
+the sector x year matrix is fitted with a single least-squares solve against a
+shared design matrix (the time axis is the same for every sector).
+
+Prediction intervals come from a residual bootstrap that is vectorized the
+same way. Each resample adds resampled residuals to the fitted values and
+refits the trend; because the least-squares fit is linear, all resamples
+of all series are refitted with one matrix product against the design
+matrix's pseudo-inverse. The spread of the projected paths (plus resampled
+noise for the future years) gives the bands. Series are processed
+in chunks so memory stays bounded however many resamples are drawn.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .quantiles import exact_quantiles
+
+MODELS = ("linear", "quadratic", "loglinear")
+
+# Working memory per chunk of series/resamples in the bootstrap
+BOOTSTRAP_CHUNK_BYTES = 64 * 2 ** 20
+
+# Upper bounds for user-supplied settings (the CLI and server enforce them too)
+MAX_HORIZON = 50
+MAX_N_BOOT = 100_000
+
+
+def check_horizon(horizon):
+    """Validate a forecast horizon: a whole number of years in [1, MAX_HORIZON]."""
+    if not isinstance(horizon, (int, np.integer)) or not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"horizon must be an integer between 1 and {MAX_HORIZON}, got {horizon!r}")
+    return int(horizon)
+
+
+def check_n_boot(n_boot):
+    """Validate a bootstrap resample count in [1, MAX_N_BOOT]."""
+    if not isinstance(n_boot, (int, np.integer)) or not 1 <= n_boot <= MAX_N_BOOT:
+        raise ValueError(f"n_boot must be an integer between 1 and {MAX_N_BOOT}, got {n_boot!r}")
+    return int(n_boot)
+
+
+def design_matrix(steps, model="linear"):
+    """Columns [1, t] (or [1, t, t^2] for the quadratic model) for time steps ``t``."""
+    if model not in MODELS:
+        raise ValueError(f"unknown trend model {model!r}; expected one of {MODELS}")
+    t = np.asarray(steps, dtype=np.float64)
+    columns = [np.ones_like(t), t]
+    if model == "quadratic":
+        columns.append(t * t)
+    return np.column_stack(columns)
+
+
+def _to_model_space(values, model):
+    if model != "loglinear":
+        return values
+    if np.any(values < 0):
+        raise ValueError("the loglinear model needs non-negative values")
+    return np.log1p(values)
+
+
+def _from_model_space(values, model):
+    return np.expm1(values) if model == "loglinear" else values
+
+
+@dataclass
+class TrendForecast:
+    """Fitted trends, projections and fit statistics for a batch of series.
+
+    All arrays have one row per series: ``coef`` is (n_series, n_params),
+    ``fitted`` is (n_series, n_years) and ``forecast`` is (n_series, horizon).
+    ``r2`` and ``rmse`` are measured on the original (not log) scale.
+    When fitted with a ``level``, ``lower`` and ``upper`` are the bootstrap
+    prediction bands, shaped like ``forecast``.
+    """
+
+    model: str
+    coef: np.ndarray
+    fitted: np.ndarray
+    forecast: np.ndarray
+    r2: np.ndarray
+    rmse: np.ndarray
+    sectors: list = None
+    years: list = None
+    forecast_years: list = None
+    level: float = None
+    lower: np.ndarray = None
+    upper: np.ndarray = None
+
+    @property
+    def slope(self):
+        """Per-series trend slope (per year, in model space)."""
+        return self.coef[:, 1]
+
+    def forecast_frame(self):
+        """Sector x forecast-year DataFrame of projected values."""
+        return pd.DataFrame(self.forecast, index=self.sectors, columns=self.forecast_years)
+
+    def interval_frame(self, stats=False):
+        """Sector x (forecast year, forecast/lower/upper) DataFrame of projections and bands.
+
+        ``stats`` appends the fit statistics under a "fit" column group.
+        """
+        if self.lower is None:
+            raise ValueError("no prediction intervals; fit with level=...")
+        stacked = np.stack([self.forecast, self.lower, self.upper], axis=2).reshape(len(self.forecast), -1)
+        columns = pd.MultiIndex.from_product([self.forecast_years, ["forecast", "lower", "upper"]],
+                                             names=["Year", None])
+        frame = pd.DataFrame(stacked, index=self.sectors, columns=columns)
+        if stats:
+            fit = self.stats_frame()
+            fit.columns = pd.MultiIndex.from_product([["fit"], fit.columns], names=["Year", None])
+            frame = frame.join(fit)
+        return frame
+
+    def stats_frame(self):
+        """Per-series fit statistics as a DataFrame."""
+        stats = pd.DataFrame(
+            {"intercept": self.coef[:, 0], "slope": self.coef[:, 1], "r2": self.r2, "rmse": self.rmse},
+            index=self.sectors,
+        )
+        if self.model == "quadratic":
+            stats.insert(2, "curvature", self.coef[:, 2])
+        return stats
+
+
+def bootstrap_bands(y, X, future, coef, model, level=0.95, n_boot=1000, seed=0,
+                    chunk_bytes=BOOTSTRAP_CHUNK_BYTES):
+    """Residual-bootstrap prediction bands for trends already fitted in model space.
+
+    ``y`` is (n_series, n_years) in model space, ``X`` and ``future`` the
+    design matrices of the fitted and projected years, and ``coef`` the
+    fitted coefficients. Returns (lower, upper), each (n_series, horizon), on
+    the original scale. The same ``seed`` and ``chunk_bytes`` always give
+    the same bands.
+
+    Both the series and the resample axis are chunked: the projected paths
+    of one block of series (n_boot x horizon each) are filled a block of
+    resamples at a time, so the residual draws never exceed ``chunk_bytes``.
+    """
+    if not 0.0 < level < 1.0:
+        raise ValueError("level must lie strictly between 0 and 1")
+    n_boot = check_n_boot(n_boot)
+    n_series, n_years = y.shape
+    n_params = X.shape[1]
+    horizon = len(future)
+    residuals = y - coef @ X.T
+    if n_years > n_params:
+        # Fitted residuals understate the noise; inflate for the parameters used
+        residuals = residuals * np.sqrt(n_years / (n_years - n_params))
+    # Refitting is linear in y, so a resample's projection is the point
+    # forecast plus its resampled residuals mapped through one (years x horizon) matrix
+    to_future = np.linalg.pinv(X).T @ future.T
+    point = coef @ future.T
+    q = [(1.0 - level) / 2.0, (1.0 + level) / 2.0]
+
+    rng = np.random.default_rng(seed)
+    # Paths kept for the quantiles: n_boot x horizon per series
+    block = max(1, chunk_bytes // (8 * n_boot * horizon))
+    index_dtype = np.int16 if n_years < 2 ** 15 else np.int64
+    lower = np.empty((n_series, horizon))
+    upper = np.empty((n_series, horizon))
+    for start in range(0, n_series, block):
+        stop = min(start + block, n_series)
+        m = stop - start
+        rows = np.arange(m)[None, :, None]
+        paths = np.empty((n_boot, m, horizon))
+        # Draw indices and noise: about 2 arrays of (n_years + horizon) per resample and series
+        resamples = max(1, chunk_bytes // (2 * 8 * m * (n_years + horizon)))
+        for b in range(0, n_boot, resamples):
+            e = min(b + resamples, n_boot)
+            draw = rng.integers(0, n_years, size=(e - b, m, n_years + horizon), dtype=index_dtype)
+            noise = residuals[start:stop][rows, draw]
+            paths[b:e] = point[start:stop] + noise[:, :, :n_years] @ to_future + noise[:, :, n_years:]
+        lower[start:stop], upper[start:stop] = exact_quantiles(_from_model_space(paths, model), q, axis=0)
+    return lower, upper
+
+
+def fit_trends(values, horizon=7, model="linear", steps=None, level=None, n_boot=1000, seed=0):
+    """Fit one trend per row of ``values`` and project ``horizon`` steps ahead.
+
+    ``values`` is an (n_series, n_years) array without missing values. The
+    fit is a single ``lstsq`` call with every series as a right-hand side.
+    ``steps`` gives the time of each column (default 0, 1, 2, ...), so gaps
+    between years are respected; forecasts are for the ``horizon`` whole
+    steps after the last one. With ``level`` (e.g. 0.95), ``n_boot``
+    seeded bootstrap resamples also give prediction intervals (see
+    ``bootstrap_bands``).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2:
+        raise ValueError("values must be a 2-D (series, year) array")
+    horizon = check_horizon(horizon)
+    if np.isnan(values).any():
+        raise ValueError("values contain NaN; fill or drop incomplete series first")
+    n_years = values.shape[1]
+    steps = np.arange(n_years, dtype=np.float64) if steps is None else np.asarray(steps, dtype=np.float64)
+    if steps.shape != (n_years,):
+        raise ValueError("steps must give one time value per year column")
+    X = design_matrix(steps, model)
+    if n_years < X.shape[1]:
+        raise ValueError(f"need at least {X.shape[1]} years to fit a {model} trend")
+
+    # One solve for all series: (n_years, p) \ (n_years, n_series)
+    y = _to_model_space(values, model)
+    coef, *_ = np.linalg.lstsq(X, y.T, rcond=None)
+    coef = coef.T
+
+    fitted = _from_model_space(coef @ X.T, model)
+    future = design_matrix(steps[-1] + np.arange(1, horizon + 1), model)
+    forecast = _from_model_space(coef @ future.T, model)
+
+    residuals = values - fitted
+    sse = np.einsum("ij,ij->i", residuals, residuals)
+    centred = values - values.mean(axis=1, keepdims=True)
+    sst = np.einsum("ij,ij->i", centred, centred)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Constant series (e.g. all zeros) have no variance to explain
+        r2 = np.where(sst > 0, 1.0 - sse / sst, np.nan)
+    rmse = np.sqrt(sse / n_years)
+    result = TrendForecast(model, coef, fitted, forecast, r2, rmse)
+    if level is not None:
+        result.level = level
+        result.lower, result.upper = bootstrap_bands(y, X, future, coef, model, level=level, n_boot=n_boot,
+                                                     seed=seed)
+    return result
+
+
+def forecast_cube(cube, horizon=7, model="linear", level=None, n_boot=1000, seed=0):
+    """Run ``fit_trends`` over every sector of an ``FDICube``."""
+    fiscal_years = cube.fiscal_years
+    result = fit_trends(cube.values, horizon=horizon, model=model, steps=fiscal_years.steps(), level=level,
+                        n_boot=n_boot, seed=seed)
+    result.sectors = cube.sectors
+    result.years = cube.years
+    result.forecast_years = fiscal_years.extend(horizon).labels()
+    return result
@@ -0,0 +1,194 @@
+"""Sector groups (e.g. "Tech and Telecom") rolled up by sparse aggregation.
+
+A hierarchy is an ordered mapping of level names, finest first. The first
+level maps each group to sector queries: full names or unambiguous short
+forms, resolved through the cube's ``SectorIndex``; a trailing ``*`` takes
+every sector with that prefix. Every later level maps each of its groups to
+groups of the level below, so the default hierarchy rolls sectors up into
+themes and themes up into the three parts of the economy. Each child group
+has exactly one parent.
+
+For the first level, the membership is a sparse (groups x sectors) 0/1
+matrix, and one product with the (sectors x years) value matrix gives every
+group's total for every year. Each later level is another sparse (parents x
+children) 0/1 matrix applied to the totals of the level below, so rolling up
+never goes back to the sectors. Totals are cached per level.
+``group_cube(level)`` wraps them in an ``FDICube``, so the bar, pie and
+stacked-area charts take groups exactly as they take sectors. scipy is used
+for the sparse matrices when it is installed; otherwise dense 0/1 matrices
+give the same totals.
+
+First-level groups may overlap. An overlapping sector counts once in each
+of its groups, so stacking them, or rolling them up into one parent,
+counts it more than once.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .cube import FDICube
+
+
+def _sparse():
+    # Imported on first use: scipy is optional and slow to import
+    try:
+        from scipy import sparse
+    except ImportError:  # pragma: no cover - scipy is optional
+        return None
+    return sparse
+
+
+def _indicator(members, n_columns):
+    """(len(members) x n_columns) 0/1 matrix from {row name: [column positions]}; sparse when possible."""
+    rows = np.concatenate([np.full(len(cols), g) for g, cols in enumerate(members.values())] or [[]])
+    cols = np.concatenate([cols for cols in members.values()] or [[]])
+    rows, cols = rows.astype(np.intp), cols.astype(np.intp)
+    shape = (len(members), n_columns)
+    data = np.ones(len(rows))
+    sparse = _sparse()
+    if sparse is not None:
+        return sparse.csr_matrix((data, (rows, cols)), shape=shape)
+    matrix = np.zeros(shape)
+    matrix[rows, cols] = data
+    return matrix
+
+
+# The groupings used in the notebook's narrative: sectors -> themes -> economy
+DEFAULT_GROUPS = {
+    "theme": {
+        "Services": ["services sector", "consultancy services", "trading", "retail trading", "hotel & tourism",
+                     "hospital & diagnostic centres", "education"],
+        "Tech and Telecom": ["computer software", "telecommunications", "electronics", "information & broadcasting"],
+        "Construction and Infrastructure": ["construction development", "construction (infrastructure)", "power",
+                                            "ports", "sea transport", "air transport", "railway related components"],
+        "Manufacturing": ["automobile industry", "metallurgical industries", "industrial machinery",
+                          "electrical equipments", "chemicals (other than fertilizers)", "cement and gypsum products"],
+        "Emerging Sectors": ["drugs & pharmaceuticals", "non-conventional energy"],
+        "Resources and Agriculture": ["mining", "coal production", "petroleum & natural gas", "agriculture services",
+                                      "tea and coffee", "agricultural machinery"],
+    },
+    "economy": {
+        "Primary": ["Resources and Agriculture"],
+        "Secondary": ["Manufacturing", "Construction and Infrastructure", "Emerging Sectors"],
+        "Tertiary": ["Services", "Tech and Telecom"],
+    },
+}
+
+
+class SectorHierarchy:
+    """Sector -> group -> parent group roll-ups over an ``FDICube``."""
+
+    def __init__(self, cube, levels=None, other=None):
+        """``other`` names a catch-all group, on every level, for what no group of that level covers."""
+        self.cube = cube
+        self.levels = {}
+        self.parents = {}
+        self._members = {}
+        self._children = {}
+        self._totals = {}
+        below = None
+        for level, groups in (DEFAULT_GROUPS if levels is None else levels).items():
+            if below is None:
+                members = {group: self._rows(queries) for group, queries in groups.items()}
+                universe = range(len(cube.sectors))
+            else:
+                members = self._child_rows(below, level, groups)
+                universe = range(len(self.levels[below]))
+            if other is not None:
+                covered = set().union(*members.values()) if members else set()
+                rest = [i for i in universe if i not in covered]
+                if rest:
+                    members[other] = rest
+            self.levels[level] = list(members)
+            if below is None:
+                self._members[level] = members
+            else:
+                self._children[level] = members
+                self.parents[below] = level
+                child_rows = list(self._members[below].values())
+                self._members[level] = {group: list(dict.fromkeys(i for c in children for i in child_rows[c]))
+                                        for group, children in members.items()}
+            below = level
+
+    def _rows(self, queries):
+        rows = {}
+        for query in queries:
+            if query.endswith("*"):
+                found = self.cube.lookup.prefix_rows(query[:-1])
+            else:
+                found = [self.cube.row(query)]
+            rows.update(dict.fromkeys(found))
+        return list(rows)
+
+    def _child_rows(self, below, level, groups):
+        """{group: positions of its children in level ``below``}, each child under one parent."""
+        positions = {group: i for i, group in enumerate(self.levels[below])}
+        parent_of = {}
+        members = {}
+        for group, children in groups.items():
+            for child in children:
+                if child not in positions:
+                    raise KeyError(f"{level!r} group {group!r} refers to unknown {below!r} group {child!r}")
+                if parent_of.setdefault(child, group) != group:
+                    raise ValueError(f"{below!r} group {child!r} rolls up into both {parent_of[child]!r} "
+                                     f"and {group!r}")
+            members[group] = list(dict.fromkeys(positions[child] for child in children))
+        return members
+
+    def groups(self, level):
+        """Group names of ``level`` in definition order."""
+        return list(self.levels[level])
+
+    def members(self, level, group):
+        """Full sector names in one group (through its children on the higher levels)."""
+        return [self.cube.sectors[i] for i in self._members[level][group]]
+
+    def children(self, level, group):
+        """Groups of the level below that roll up into ``group``."""
+        below = self._below(level)
+        return [self.levels[below][i] for i in self._children[level][group]]
+
+    def _below(self, level):
+        for child, parent in self.parents.items():
+            if parent == level:
+                return child
+        raise ValueError(f"{level!r} is the first level; its groups hold sectors")
+
+    def membership(self, level):
+        """(groups x sectors) 0/1 matrix for ``level``; sparse when scipy is available."""
+        return _indicator(self._members[level], len(self.cube.sectors))
+
+    def rollup(self, level):
+        """(groups x groups of the level below) 0/1 matrix for a higher level."""
+        return _indicator(self._children[level], len(self.levels[self._below(level)]))
+
+    def totals(self, level):
+        """(groups x years) totals for ``level``: one matrix product per level (cached)."""
+        if level not in self._totals:
+            if level in self._children:
+                totals = self.rollup(level) @ self.totals(self._below(level))
+            else:
+                values = np.nan_to_num(np.asarray(self.cube.values, dtype=np.float64))
+                totals = self.membership(level) @ values
+            self._totals[level] = np.asarray(totals)
+        return self._totals[level]
+
+    def frame(self, level):
+        """Group totals as a group x year DataFrame."""
+        return pd.DataFrame(self.totals(level), index=pd.Index(self.groups(level), name="Group"),
+                            columns=self.cube.years)
+
+    def group_cube(self, level):
+        """An ``FDICube`` whose rows are the groups of ``level``."""
+        return FDICube(self.totals(level), self.groups(level), self.cube.years)
+
+    def assignments(self):
+        """Sector x level table listing each sector's groups ('' when ungrouped)."""
+        table = {}
+        for level, members in self._members.items():
+            labels = [[] for _ in self.cube.sectors]
+            for group, rows in members.items():
+                for i in rows:
+                    labels[i].append(group)
+            table[level] = [", ".join(names) for names in labels]
+        return pd.DataFrame(table, index=pd.Index(self.cube.sectors, name="Sector"))
@@ -0,0 +1,145 @@
+"""Growth metrics over the whole sector x year matrix.
+
+Year-over-year change, CAGR between any two years, and rolling sums, means
+and volatility are computed for every sector at once. Rolling sums and means
+use a cumulative sum along the year axis. Rolling standard deviations use a
+strided window view. Neither loops over sectors.
+
+Growth rates are only defined against a positive baseline. A year that
+follows a zero (as 'PHOTOGRAPHIC RAW FILM AND PAPER' often does) gets NaN
+growth, not inf. A CAGR starting from zero is NaN as well, and one falling
+to zero from a positive start is -100%. Rolling windows need every value in
+the window, as pandas' ``rolling(window)`` does, so a NaN only blanks the
+windows that contain it.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def yoy_change(values):
+    """Absolute change from the previous year (first year NaN)."""
+    values = np.asarray(values, dtype=np.float64)
+    change = np.full_like(values, np.nan)
+    change[:, 1:] = np.diff(values, axis=1)
+    return change
+
+
+def yoy_growth(values):
+    """Fractional change from the previous year; NaN where the previous year is not positive."""
+    values = np.asarray(values, dtype=np.float64)
+    growth = np.full_like(values, np.nan)
+    previous = values[:, :-1]
+    with np.errstate(invalid="ignore"):
+        np.divide(values[:, 1:] - previous, previous, out=growth[:, 1:], where=previous > 0)
+    return growth
+
+
+def cagr(start_values, end_values, periods):
+    """Compound annual growth from ``start_values`` to ``end_values`` over ``periods`` years."""
+    start = np.asarray(start_values, dtype=np.float64)
+    end = np.asarray(end_values, dtype=np.float64)
+    if periods <= 0:
+        raise ValueError("periods must be positive")
+    ratio = np.full(np.broadcast(start, end).shape, np.nan)
+    with np.errstate(invalid="ignore"):
+        np.divide(end, start, out=ratio, where=(start > 0) & (end >= 0))
+    return ratio ** (1.0 / periods) - 1.0
+
+
+def rolling_sum(values, window):
+    """Sum over the trailing ``window`` years; NaN until a full, NaN-free window exists."""
+    values = np.asarray(values, dtype=np.float64)
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    n_rows, n_years = values.shape
+    out = np.full_like(values, np.nan)
+    if window > n_years:
+        return out
+    missing = np.isnan(values)
+    zero = np.zeros((n_rows, 1))
+    sums = np.concatenate([zero, np.cumsum(np.where(missing, 0.0, values), axis=1)], axis=1)
+    gaps = np.concatenate([zero, np.cumsum(missing, axis=1)], axis=1)
+    total = sums[:, window:] - sums[:, :-window]
+    complete = (gaps[:, window:] - gaps[:, :-window]) == 0
+    out[:, window - 1:] = np.where(complete, total, np.nan)
+    return out
+
+
+def rolling_mean(values, window):
+    return rolling_sum(values, window) / window
+
+
+def rolling_std(values, window, ddof=1):
+    """Standard deviation over the trailing ``window`` years (NaN for incomplete windows)."""
+    values = np.asarray(values, dtype=np.float64)
+    if window <= ddof:
+        raise ValueError("window must be larger than ddof")
+    out = np.full_like(values, np.nan)
+    if window > values.shape[1]:
+        return out
+    out[:, window - 1:] = sliding_window_view(values, window, axis=1).std(axis=-1, ddof=ddof)
+    return out
+
+
+def _nanmedian(values, axis):
+    # Sectors with no positive baseline at all have no growth rates: NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmedian(values, axis=axis)
+
+
+class GrowthMetrics:
+    """Growth frames (sector x year) for an ``FDICube``."""
+
+    def __init__(self, cube):
+        self.cube = cube
+
+    def _frame(self, values, years=None):
+        return pd.DataFrame(values, index=pd.Index(self.cube.sectors, name="Sector"),
+                            columns=self.cube.years if years is None else years)
+
+    def yoy(self, pct=True):
+        """Year-over-year growth (``pct``) or absolute change for every sector."""
+        values = yoy_growth(self.cube.values) if pct else yoy_change(self.cube.values)
+        return self._frame(values)
+
+    def cagr(self, start=None, end=None):
+        """CAGR of every sector between fiscal years ``start`` and ``end`` (default: first and last)."""
+        years = self.cube.fiscal_years
+        i = 0 if start is None else years.position(start)
+        j = len(years) - 1 if end is None else years.position(end)
+        periods = int(years.start_years[j] - years.start_years[i])
+        rate = cagr(self.cube.values[:, i], self.cube.values[:, j], periods)
+        return pd.Series(rate, index=pd.Index(self.cube.sectors, name="Sector"), name=f"CAGR {years[i]} to {years[j]}")
+
+    def rolling(self, window=3, stat="mean", of="values"):
+        """Rolling ``stat`` ("sum", "mean" or "std") of the values or of YoY growth."""
+        functions = {"sum": rolling_sum, "mean": rolling_mean, "std": rolling_std}
+        if stat not in functions:
+            raise ValueError(f"stat must be one of {sorted(functions)}")
+        if of not in ("values", "growth"):
+            raise ValueError("of must be 'values' or 'growth'")
+        base = self.cube.values if of == "values" else yoy_growth(self.cube.values)
+        return self._frame(functions[stat](base, window))
+
+    def volatility(self, window=3):
+        """Rolling standard deviation of YoY growth."""
+        return self.rolling(window, stat="std", of="growth")
+
+    def summary(self, start=None, end=None, window=3):
+        """Per-sector CAGR, median and latest YoY growth, and latest rolling mean and volatility."""
+        growth = yoy_growth(self.cube.values)
+        return pd.DataFrame(
+            {
+                "cagr": self.cagr(start, end).to_numpy(),
+                "median_yoy": _nanmedian(growth, axis=1),
+                "latest_yoy": growth[:, -1],
+                f"rolling_mean_{window}": rolling_mean(self.cube.values, window)[:, -1],
+                f"volatility_{window}": rolling_std(growth, window)[:, -1],
+            },
+            index=pd.Index(self.cube.sectors, name="Sector"),
+        )
@@ -0,0 +1,248 @@
+"""Per-stage timing, memory and profiling hooks with a Chrome trace output.
+
+``Instrument`` records, for every stage, wall time, CPU time, the process's
+peak RSS and (optionally) the peak traced allocation from ``tracemalloc``.
+Tracing runs only while a selected stage is open, so it does not slow the
+stages around it.
+The stdlib profiler (``cProfile``) can be switched on for chosen stages.
+Stages nest; the notebook script marks each ``# In[n]`` cell with
+``instrument.cell(...)``, which closes the previous cell's stage, so no cell
+body has to be re-indented.
+
+``finish()`` writes the stages in the Chrome trace-event format. The file
+opens as a flame chart in chrome://tracing, https://ui.perfetto.dev or
+speedscope. Profiled stages also get a ``.prof`` file next to the trace,
+for snakeviz or ``pstats``.
+
+A disabled instrument (the default from ``from_env`` when ``FDI_TRACE`` is
+unset) does nothing, so the hooks can stay in the script.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _selected(option, name):
+    if option is True or option == "all":
+        return True
+    if not option:
+        return False
+    return name in option or any(name.startswith(prefix) for prefix in option)
+
+
+class Instrument:
+    """Collects per-stage counters and writes them as a trace.
+
+    ``profile`` and ``trace_memory`` are either booleans or collections of
+    stage names (or name prefixes) for which they are switched on.
+    """
+
+    def __init__(self, enabled=True, profile=False, trace_memory=False, output=None, profile_top=15):
+        self.enabled = enabled
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.output = output
+        self.profile_top = profile_top
+        self.records = []
+        self._stack = []
+        self._cell = None
+        self._profiler = None
+        self._started_tracemalloc = False
+        self._origin = time.perf_counter()
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Configure from ``FDI_TRACE`` (trace path), ``FDI_TRACE_PROFILE`` and ``FDI_TRACE_MEMORY``.
+
+        ``FDI_TRACE_PROFILE`` and ``FDI_TRACE_MEMORY`` take "all" or a
+        comma-separated list of stage names/prefixes. Without ``FDI_TRACE``
+        the instrument is disabled.
+        """
+        environ = os.environ if environ is None else environ
+        output = environ.get("FDI_TRACE")
+
+        def option(key):
+            value = environ.get(key, "").strip()
+            if value.lower() in ("", "0", "false", "no"):
+                return False
+            if value.lower() in ("1", "true", "yes", "all"):
+                return True
+            return [item.strip() for item in value.split(",") if item.strip()]
+
+        return cls(enabled=bool(output), profile=option("FDI_TRACE_PROFILE"),
+                   trace_memory=option("FDI_TRACE_MEMORY"), output=output)
+
+    # --- recording ------------------------------------------------------------
+
+    def _begin(self, name, args):
+        record = {"name": name, "depth": len(self._stack), "args": dict(args), "tid": threading.get_ident()}
+        if _selected(self.trace_memory, name):
+            if not tracemalloc.is_tracing():
+                # Tracing slows everything down; it runs only while a selected stage is open
+                tracemalloc.start()
+                self._started_tracemalloc = record["owns_tracemalloc"] = True
+            record["alloc_start"] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        # Only one profiler can run at a time; nested stages share the outer one
+        if self._profiler is None and _selected(self.profile, name):
+            self._profiler = record["profiler"] = cProfile.Profile()
+            self._profiler.enable()
+        record["rss_start"] = peak_rss()
+        record["cpu_start"] = time.process_time()
+        record["start"] = time.perf_counter()
+        self._stack.append(record)
+        return record
+
+    def _end(self, record):
+        end = time.perf_counter()
+        cpu = time.process_time() - record.pop("cpu_start")
+        if self._stack and self._stack[-1] is record:
+            self._stack.pop()
+        profiler = record.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            self._profiler = None
+            record["profile"] = profiler
+        result = {
+            "name": record["name"],
+            "depth": record["depth"],
+            "tid": record["tid"],
+            "start_s": record["start"] - self._origin,
+            "wall_s": end - record["start"],
+            "cpu_s": cpu,
+            "peak_rss": peak_rss(),
+            "rss_growth": None,
+            "alloc_peak": None,
+            "alloc_net": None,
+            "args": record["args"],
+        }
+        if record["rss_start"] is not None:
+            result["rss_growth"] = result["peak_rss"] - record["rss_start"]
+        if "alloc_start" in record and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # A nested stage resets the peak, so carry its peak up to the parent
+            peak = max(peak, record.get("child_peak", 0))
+            result["alloc_peak"] = peak - record["alloc_start"]
+            result["alloc_net"] = current - record["alloc_start"]
+            if self._stack and "alloc_start" in self._stack[-1]:
+                parent = self._stack[-1]
+                parent["child_peak"] = max(parent.get("child_peak", 0), peak)
+        if record.get("owns_tracemalloc") and not any("alloc_start" in other for other in self._stack):
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if "profile" in record:
+            result["profile"] = record["profile"]
+        self.records.append(result)
+        return result
+
+    @contextmanager
+    def stage(self, name, **args):
+        """Measure the enclosed block as one stage."""
+        if not self.enabled:
+            yield None
+            return
+        record = self._begin(name, args)
+        try:
+            yield record
+        finally:
+            self._end(record)
+
+    def cell(self, name, **args):
+        """Start a notebook-cell stage, ending the previous one."""
+        if not self.enabled:
+            return
+        self.end_cell()
+        self._cell = self._begin(name, args)
+
+    def end_cell(self):
+        if self._cell is not None:
+            # Close any stage left open inside the cell first
+            while self._stack and self._stack[-1] is not self._cell:
+                self._end(self._stack[-1])
+            self._end(self._cell)
+            self._cell = None
+
+    # --- output ---------------------------------------------------------------
+
+    def report(self):
+        """One row per finished stage, in start order."""
+        import pandas as pd
+
+        columns = ["name", "depth", "start_s", "wall_s", "cpu_s", "peak_rss", "rss_growth", "alloc_peak", "alloc_net"]
+        rows = sorted(self.records, key=lambda r: r["start_s"])
+        return pd.DataFrame([{key: r[key] for key in columns} for r in rows], columns=columns)
+
+    def _profile_summary(self, profiler):
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(self.profile_top)
+        return stream.getvalue()
+
+    def trace_events(self):
+        """The stages as Chrome trace events (complete events plus an RSS counter track)."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "fdi_analysis"}}]
+        for r in sorted(self.records, key=lambda r: (r["start_s"], r["depth"])):
+            args = {key: r[key] for key in ("cpu_s", "peak_rss", "rss_growth", "alloc_peak", "alloc_net")
+                    if r[key] is not None}
+            args.update(r["args"])
+            if "profile" in r:
+                args["profile"] = self._profile_summary(r["profile"])
+            events.append({
+                "name": r["name"], "cat": "stage", "ph": "X", "pid": pid, "tid": r["tid"],
+                "ts": r["start_s"] * 1e6, "dur": r["wall_s"] * 1e6, "args": args,
+            })
+            if r["peak_rss"] is not None:
+                events.append({"name": "peak RSS (MB)", "ph": "C", "pid": pid,
+                               "ts": (r["start_s"] + r["wall_s"]) * 1e6,
+                               "args": {"rss": r["peak_rss"] / 2 ** 20}})
+        return events
+
+    def write_trace(self, path):
+        """Write the Chrome trace JSON and one ``.prof`` file per profiled stage."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+        stem = os.path.splitext(path)[0]
+        files = [path]
+        for r in self.records:
+            if "profile" in r:
+                slug = re.sub(r"[^0-9A-Za-z]+", "_", r["name"]).strip("_")
+                prof_path = f"{stem}.{slug}.prof"
+                r["profile"].dump_stats(prof_path)
+                files.append(prof_path)
+        return files
+
+    def finish(self):
+        """End open stages, write the trace if an output path was given and return the report."""
+        if not self.enabled:
+            return None
+        self.end_cell()
+        while self._stack:
+            self._end(self._stack[-1])
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self.output:
+            self.write_trace(self.output)
+        return self.report()
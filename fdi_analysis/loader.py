@@ -0,0 +1,156 @@
+"""Cached loading of the sector x year FDI table.
+
+The CSV is parsed once and written to a binary sidecar cache next to it:
+a ``.npy`` value matrix plus a small JSON file holding the sector names, the
+year labels and the key of the source file (size, mtime and content hash).
+Later runs memory-map the ``.npy`` file instead of re-parsing the text, and
+every caller in the same process gets the same DataFrame back.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+
+# One shared frame per source file for the lifetime of the process
+_frames = {}
+
+
+def cache_paths(path):
+    """Return the (values, metadata) sidecar paths for a CSV file."""
+    stem = os.path.splitext(path)[0]
+    return stem + ".values.npy", stem + ".meta.json"
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 of the file contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(path, digest=None):
+    """Size, mtime and content hash identifying one version of a file."""
+    st = os.stat(path)
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest if digest is not None else file_digest(path),
+    }
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path, frame, key):
+    values_path, meta_path = cache_paths(path)
+    values = np.ascontiguousarray(frame.iloc[:, 1:].to_numpy(dtype=np.float64))
+    meta = {
+        "version": CACHE_VERSION,
+        "source": key,
+        "index_column": frame.columns[0],
+        "sectors": frame.iloc[:, 0].astype(str).tolist(),
+        "years": [str(c) for c in frame.columns[1:]],
+        "shape": list(values.shape),
+    }
+    # Write to temporary names first so a crash never leaves a half cache
+    np.save(values_path + ".tmp.npy", values)
+    os.replace(values_path + ".tmp.npy", values_path)
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(meta_path + ".tmp", meta_path)
+
+
+def _cached_meta(path):
+    """Return the cache metadata if it still matches the source file."""
+    values_path, meta_path = cache_paths(path)
+    meta = _read_meta(meta_path)
+    if meta is None or meta.get("version") != CACHE_VERSION:
+        return None
+    if not os.path.exists(values_path):
+        return None
+
+    cached = meta["source"]
+    st = os.stat(path)
+    if cached["size"] != st.st_size:
+        return None
+    if cached["mtime_ns"] == st.st_mtime_ns:
+        return meta
+
+    # Same size but touched: only the content hash can tell if it changed
+    digest = file_digest(path)
+    if digest != cached["sha256"]:
+        return None
+    meta["source"] = source_key(path, digest)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return meta
+
+
+def source_digest(path):
+    """Content hash of ``path``, taken from a still-valid sidecar cache when there is one."""
+    meta = _cached_meta(os.path.abspath(path))
+    return meta["source"]["sha256"] if meta is not None else file_digest(path)
+
+
+def _frame_from_cache(path, meta):
+    values_path, _ = cache_paths(path)
+    values = np.load(values_path, mmap_mode="r")
+    # Build the numeric block on top of the memory map, then add the labels
+    frame = pd.DataFrame(values, columns=meta["years"], copy=False)
+    frame.insert(0, meta["index_column"], meta["sectors"])
+    return frame
+
+
+def load_fdi_data(path, use_cache=True):
+    """Load the FDI table, parsing the CSV only when the cache is stale.
+
+    The returned DataFrame has the same layout as ``pd.read_csv(path)`` (a
+    ``Sector`` column followed by one float column per fiscal year), but its
+    values are backed by a read-only memory map of the sidecar cache.
+    Repeated calls in one process return the same object.
+    """
+    path = os.path.abspath(path)
+    if not use_cache:
+        return pd.read_csv(path)
+
+    meta = _cached_meta(path)
+    key = meta["source"]["sha256"] if meta is not None else None
+    shared = _frames.get(path)
+    if shared is not None and key is not None and shared[0] == key:
+        return shared[1]
+
+    if meta is None:
+        frame = pd.read_csv(path)
+        source = source_key(path)
+        try:
+            _write_cache(path, frame, source)
+        except OSError:
+            # Read-only data directory: keep the parsed frame for this run
+            _frames[path] = (source["sha256"], frame)
+            return frame
+        meta = _cached_meta(path)
+
+    frame = _frame_from_cache(path, meta)
+    _frames[path] = (meta["source"]["sha256"], frame)
+    return frame
+
+
+def clear_cache(path):
+    """Remove the sidecar cache files and the in-process frame for a CSV."""
+    path = os.path.abspath(path)
+    _frames.pop(path, None)
+    for cache_file in cache_paths(path):
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
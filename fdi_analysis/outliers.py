@@ -0,0 +1,152 @@
+"""Outlier detection over every sector-year cell.
+
+``detect_outliers`` flags cells by three array-wide rules:
+
+* IQR fences: below Q1 - 1.5 IQR or above Q3 + 1.5 IQR of the cell's year
+  (exactly the points a boxplot draws past its whiskers);
+* robust z-score: 0.6745 (x - median) / MAD within the year, flagged past
+  ``z_threshold`` (3.5 by default, after Iglewicz and Hoaglin);
+* year-over-year jumps: the change from the previous year, scaled by the
+  MAD of that sector's own changes (never less than the panel-wide MAD of
+  changes) and flagged past ``jump_threshold``.
+
+The yearly quartiles are taken from a ``DataProfile`` when one is passed, so
+the outlier table and the boxplot share one set of statistics. A year (or
+sector) whose MAD is zero falls back to the mean absolute deviation; if
+that is zero too, every cell sits on the median and none are flagged.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .quantiles import exact_quantiles
+
+MAD_SCALE = 0.6745
+MEAN_AD_SCALE = 0.7979
+
+
+@dataclass
+class OutlierReport:
+    """Per-cell scores and flags (sector x year arrays) plus the yearly fences."""
+
+    sectors: list
+    years: list
+    values: np.ndarray
+    q1: np.ndarray
+    median: np.ndarray
+    q3: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    robust_z: np.ndarray
+    jump: np.ndarray
+    jump_z: np.ndarray
+    iqr_flag: np.ndarray
+    z_flag: np.ndarray
+    jump_flag: np.ndarray
+
+    @property
+    def any_flag(self):
+        return self.iqr_flag | self.z_flag | self.jump_flag
+
+    def fences(self):
+        """Quartiles and IQR fences per year."""
+        return pd.DataFrame(
+            {"q1": self.q1, "median": self.median, "q3": self.q3, "lower": self.lower, "upper": self.upper},
+            index=pd.Index(self.years, name="Year"),
+        )
+
+    def fliers(self):
+        """Year -> values outside the IQR fences (the boxplot's fliers)."""
+        return {year: self.values[self.iqr_flag[:, j], j] for j, year in enumerate(self.years)}
+
+    def table(self, rule=None):
+        """Flagged cells ranked by severity, most extreme first.
+
+        ``rule`` restricts the table to one of "iqr", "z" or "jump". Severity
+        is the larger of |robust z| and |jump z|.
+        """
+        flags = {"iqr": self.iqr_flag, "z": self.z_flag, "jump": self.jump_flag}
+        mask = self.any_flag if rule is None else flags[rule]
+        rows, cols = np.nonzero(mask)
+        severity = np.fmax(np.abs(self.robust_z[rows, cols]), np.abs(self.jump_z[rows, cols]))
+        order = np.lexsort((cols, rows, -np.nan_to_num(severity, nan=-np.inf)))
+        rows, cols = rows[order], cols[order]
+        sectors = np.array(self.sectors, dtype=object)
+        years = np.array(self.years, dtype=object)
+        table = pd.DataFrame({
+            "Sector": sectors[rows],
+            "Year": years[cols],
+            "FDI": self.values[rows, cols],
+            "robust_z": self.robust_z[rows, cols],
+            "yoy_change": self.jump[rows, cols],
+            "jump_z": self.jump_z[rows, cols],
+            "iqr": self.iqr_flag[rows, cols],
+            "z": self.z_flag[rows, cols],
+            "jump": self.jump_flag[rows, cols],
+            "severity": severity[order],
+        })
+        table.index = pd.RangeIndex(1, len(table) + 1, name="rank")
+        return table
+
+    def counts(self):
+        """Number of flagged cells per year for each rule."""
+        return pd.DataFrame(
+            {"iqr": self.iqr_flag.sum(axis=0), "z": self.z_flag.sum(axis=0), "jump": self.jump_flag.sum(axis=0)},
+            index=pd.Index(self.years, name="Year"),
+        )
+
+
+def _robust_scale(deviation, axis):
+    """MAD / 0.6745 along ``axis``, falling back to the mean absolute deviation."""
+    mad = exact_quantiles(deviation, 0.5, axis=axis)[0]
+    with np.errstate(invalid="ignore"):
+        mean_ad = np.nanmean(deviation, axis=axis)
+    return np.where(mad > 0, mad / MAD_SCALE, mean_ad / MEAN_AD_SCALE)
+
+
+def _scaled(deviation, scale):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(scale > 0, deviation / scale, 0.0)
+
+
+def detect_outliers(cube, profile=None, whisker=1.5, z_threshold=3.5, jump_threshold=3.5):
+    """Score and flag every sector-year cell of ``cube``.
+
+    Pass the notebook's ``DataProfile`` as ``profile`` to reuse its yearly
+    quartiles; otherwise they are computed here.
+    """
+    values = np.asarray(cube.values, dtype=np.float64)
+    if profile is not None and profile.years == list(cube.years):
+        q1, median, q3 = (profile.stats[name] for name in ("q1", "median", "q3"))
+    else:
+        q1, median, q3 = exact_quantiles(values, (0.25, 0.5, 0.75), axis=0)
+    reach = whisker * (q3 - q1)
+    lower, upper = q1 - reach, q3 + reach
+
+    deviation = values - median
+    robust_z = _scaled(deviation, _robust_scale(np.abs(deviation), axis=0))
+
+    # Change from the previous year, judged against the sector's own typical change
+    jump = np.full_like(values, np.nan)
+    jump[:, 1:] = np.diff(values, axis=1)
+    jump_z = np.full_like(values, np.nan)
+    if values.shape[1] > 2:
+        diffs = jump[:, 1:]
+        centre = exact_quantiles(diffs, 0.5, axis=1)[0][:, None]
+        scale = _robust_scale(np.abs(diffs - centre), axis=1)[:, None]
+        # Floor at the panel's typical change so near-empty sectors moving by
+        # a few million do not outrank real breaks
+        floor = _robust_scale(np.abs(diffs - np.nanmedian(diffs)).ravel(), axis=0)
+        scale = np.fmax(scale, floor)
+        jump_z[:, 1:] = _scaled(diffs - centre, scale)
+
+    with np.errstate(invalid="ignore"):
+        iqr_flag = (values < lower) | (values > upper)
+        z_flag = np.abs(robust_z) > z_threshold
+        jump_flag = np.abs(jump_z) > jump_threshold
+    return OutlierReport(
+        list(cube.sectors), list(cube.years), values, q1, median, q3, lower, upper,
+        robust_z, jump, jump_z, iqr_flag, z_flag, jump_flag,
+    )
@@ -0,0 +1,335 @@
+"""Many countries' sector x year panels in one memory-mapped array.
+
+``PanelStore.build`` packs one FDI table per country into a single
+(country x sector x year) ``.npy`` file inside a store directory. The sector
+axis is a shared dictionary, the union of every country's sector names, and
+the year axis is the union of their fiscal years in calendar order. Cells a
+country does not report are NaN. ``meta.json`` next to the array holds the
+country, sector and year labels. The tables are read one at a time and
+written straight into the memory map, so building never holds more than
+one country's table in memory.
+
+``PanelStore.open`` memory-maps the array read-only. The aggregates (yearly
+and sector totals, shares, top-N, trend forecasts) are then computed for
+every country at once, as numpy reductions over blocks of countries, with
+no loop over countries or sectors. ``cube(country)`` returns an ``FDICube``
+view of one country for everything else in the package.
+
+    store = PanelStore.build("fdi.panels", {"India": "FDI data.csv", "Brazil": "brazil.csv"})
+    PanelStore.open("fdi.panels").top_n(5, year="2016-17")
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .cube import FDICube
+from .fiscal import FiscalYearIndex
+from .forecast import TrendForecast, _from_model_space, _to_model_space, check_horizon, design_matrix
+
+STORE_VERSION = 1
+
+# Reductions read the memory map this many bytes of countries at a time
+BLOCK_BYTES = 64 * 2 ** 20
+
+
+def store_paths(path):
+    """The (values, metadata) files of a store directory."""
+    return os.path.join(path, "values.npy"), os.path.join(path, "meta.json")
+
+
+def _read_labels(source, sector_column):
+    """(sectors, years) of one source without reading its values."""
+    if isinstance(source, pd.DataFrame):
+        return source[sector_column].astype(str).tolist(), [str(c) for c in source.columns if c != sector_column]
+    header = pd.read_csv(source, nrows=0).columns
+    sectors = pd.read_csv(source, usecols=[sector_column], dtype=str)[sector_column].tolist()
+    return sectors, [str(c) for c in header if c != sector_column]
+
+
+def _read_values(source, sector_column):
+    frame = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+    years = [c for c in frame.columns if c != sector_column]
+    return frame[sector_column].astype(str).tolist(), [str(c) for c in years], frame[years].to_numpy(np.float64)
+
+
+def _masked_trends(values, steps, horizon, model):
+    """``fit_trends`` for series with missing years.
+
+    Each series is fitted on its observed years only, via per-series normal
+    equations solved as one batched ``np.linalg.solve``. Series with fewer
+    observed years than parameters get NaN coefficients and forecasts.
+    """
+    horizon = check_horizon(horizon)
+    observed = ~np.isnan(values)
+    X = design_matrix(steps, model)
+    p = X.shape[1]
+    y = np.where(observed, _to_model_space(np.where(observed, values, 0.0), model), 0.0)
+    weights = observed.astype(np.float64)
+
+    gram = np.einsum("nt,tp,tq->npq", weights, X, X)
+    rhs = np.einsum("nt,tp->np", y, X)
+    n_observed = observed.sum(axis=1)
+    # Fewer than p distinct years leaves the normal equations singular
+    fit = n_observed >= p
+    coef = np.full((len(values), p), np.nan)
+    if fit.any():
+        coef[fit] = np.linalg.solve(gram[fit], rhs[fit][:, :, None])[:, :, 0]
+
+    fitted = _from_model_space(coef @ X.T, model)
+    future = design_matrix(steps[-1] + np.arange(1, horizon + 1), model)
+    forecast = _from_model_space(coef @ future.T, model)
+
+    residuals = np.where(observed, values - fitted, 0.0)
+    sse = np.einsum("ij,ij->i", residuals, residuals)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(observed, values, 0.0).sum(axis=1) / n_observed
+        centred = np.where(observed, values - mean[:, None], 0.0)
+        sst = np.einsum("ij,ij->i", centred, centred)
+        r2 = np.where(fit & (sst > 0), 1.0 - sse / sst, np.nan)
+        rmse = np.where(fit, np.sqrt(sse / n_observed), np.nan)
+    return TrendForecast(model, coef, fitted, forecast, r2, rmse)
+
+
+class PanelStore:
+    """Country x sector x fiscal-year values with shared label dictionaries."""
+
+    def __init__(self, values, countries, sectors, years, path=None):
+        if values.shape != (len(countries), len(sectors), len(years)):
+            raise ValueError(
+                f"values shape {values.shape} does not match "
+                f"{len(countries)} countries x {len(sectors)} sectors x {len(years)} years"
+            )
+        self.values = values
+        self.countries = list(countries)
+        self.sectors = list(sectors)
+        self.years = list(years)
+        self.path = path
+        self.country_index = {name: i for i, name in enumerate(self.countries)}
+        self.sector_index = {name: i for i, name in enumerate(self.sectors)}
+        self.year_index = {year: j for j, year in enumerate(self.years)}
+        self._present = None
+
+    # --- building and opening -------------------------------------------------
+
+    @classmethod
+    def build(cls, path, sources, dtype=np.float64, sector_column="Sector"):
+        """Pack ``sources`` ({country: CSV path or DataFrame}) into a store at ``path``.
+
+        Every source has the notebook layout (a sector column followed by
+        one column per fiscal year). Returns the opened store.
+        """
+        if not sources:
+            raise ValueError("need at least one country")
+        countries = [str(country) for country in sources]
+        if len(set(countries)) != len(countries):
+            raise ValueError("country names must be unique")
+
+        # First pass: labels only, to size the array
+        sectors, start_years = {}, set()
+        for country, source in sources.items():
+            names, years = _read_labels(source, sector_column)
+            if len(set(names)) != len(names):
+                raise ValueError(f"{country}: sector names must be unique")
+            sectors.update(dict.fromkeys(names))
+            start_years.update(FiscalYearIndex.parse(years).start_years.tolist())
+        sectors = list(sectors)
+        fiscal_years = FiscalYearIndex(sorted(start_years))
+        sector_index = {name: i for i, name in enumerate(sectors)}
+
+        os.makedirs(path, exist_ok=True)
+        values_path, meta_path = store_paths(path)
+        # Write under temporary names first so a crash never leaves a half store
+        values = np.lib.format.open_memmap(values_path + ".tmp.npy", mode="w+", dtype=dtype,
+                                           shape=(len(countries), len(sectors), len(fiscal_years)))
+        values[:] = np.nan
+        for c, source in enumerate(sources.values()):
+            names, years, block = _read_values(source, sector_column)
+            rows = np.array([sector_index[name] for name in names], dtype=np.intp)
+            columns = np.searchsorted(fiscal_years.start_years, FiscalYearIndex.parse(years).start_years)
+            values[c, rows[:, None], columns[None, :]] = block
+        values.flush()
+        del values
+        os.replace(values_path + ".tmp.npy", values_path)
+
+        meta = {
+            "version": STORE_VERSION,
+            "countries": countries,
+            "sectors": sectors,
+            "years": fiscal_years.labels(),
+            "dtype": np.dtype(dtype).name,
+        }
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        """Memory-map an existing store (read-only unless ``mode="r+"``)."""
+        values_path, meta_path = store_paths(path)
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != STORE_VERSION:
+            raise ValueError(f"{path}: unsupported store version {meta.get('version')!r}")
+        values = np.load(values_path, mmap_mode=mode)
+        return cls(values, meta["countries"], meta["sectors"], meta["years"], path=path)
+
+    @classmethod
+    def from_cubes(cls, cubes):
+        """An in-memory store from {country: FDICube} (same packing as ``build``)."""
+        sectors = list(dict.fromkeys(name for cube in cubes.values() for name in cube.sectors))
+        fiscal_years = FiscalYearIndex(sorted({int(y) for cube in cubes.values()
+                                               for y in cube.fiscal_years.start_years}))
+        values = np.full((len(cubes), len(sectors), len(fiscal_years)), np.nan)
+        sector_index = {name: i for i, name in enumerate(sectors)}
+        for c, cube in enumerate(cubes.values()):
+            rows = np.array([sector_index[name] for name in cube.sectors], dtype=np.intp)
+            columns = np.searchsorted(fiscal_years.start_years, cube.fiscal_years.start_years)
+            values[c, rows[:, None], columns[None, :]] = cube.values
+        return cls(values, list(cubes), sectors, fiscal_years.labels())
+
+    # --- labels and views -----------------------------------------------------
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __len__(self):
+        return len(self.countries)
+
+    def __repr__(self):
+        return f"PanelStore({len(self.countries)} countries x {len(self.sectors)} sectors x {len(self.years)} years)"
+
+    def _country(self, country):
+        try:
+            return self.country_index[country]
+        except KeyError:
+            raise KeyError(f"unknown country {country!r}") from None
+
+    def _year(self, year):
+        try:
+            return self.year_index[year]
+        except KeyError:
+            raise KeyError(f"unknown year {year!r}") from None
+
+    @property
+    def present(self):
+        """(country x sector) mask of sectors a country reports in any year."""
+        if self._present is None:
+            self._present = self._reduce(lambda block: ~np.isnan(block).all(axis=2))
+        return self._present
+
+    def cube(self, country, reported_only=True):
+        """One country as an ``FDICube``.
+
+        With ``reported_only`` the cube keeps only the sectors and years the
+        country reports. Otherwise it keeps the full shared axes, NaN-filled,
+        as a view into the store.
+        """
+        block = self.values[self._country(country)]
+        if not reported_only:
+            return FDICube(block, self.sectors, self.years, dtype=block.dtype)
+        rows = np.flatnonzero(self.present[self._country(country)])
+        columns = np.flatnonzero(~np.isnan(block[rows]).all(axis=0))
+        return FDICube(block[np.ix_(rows, columns)], [self.sectors[i] for i in rows],
+                       [self.years[j] for j in columns], dtype=block.dtype)
+
+    # --- vectorized aggregates ------------------------------------------------
+
+    def _blocks(self):
+        """Blocks of whole countries, about ``BLOCK_BYTES`` each, read from the memory map."""
+        n = len(self.countries)
+        per_country = max(1, self.values[0].nbytes if n else 1)
+        step = max(1, BLOCK_BYTES // per_country)
+        for i in range(0, n, step):
+            yield np.asarray(self.values[i:i + step])
+
+    def _reduce(self, function):
+        """``function`` applied to blocks of whole countries and concatenated on the country axis."""
+        return np.concatenate([function(block) for block in self._blocks()])
+
+    @staticmethod
+    def _nansum(block, axis):
+        # Like pandas' sum(min_count=1): all-missing stays NaN instead of 0
+        total = np.nansum(block, axis=axis, dtype=np.float64)
+        return np.where(np.isnan(block).all(axis=axis), np.nan, total)
+
+    def _frame(self, values, columns, name=None):
+        frame = pd.DataFrame(values, index=pd.Index(self.countries, name="Country"), columns=columns)
+        frame.columns.name = name
+        return frame
+
+    def year_totals(self):
+        """Country x year frame of total FDI."""
+        return self._frame(self._reduce(lambda block: self._nansum(block, axis=1)), self.years, "Year")
+
+    def sector_totals(self):
+        """Country x sector frame of total FDI over all years (NaN for unreported sectors)."""
+        return self._frame(self._reduce(lambda block: self._nansum(block, axis=2)), self.sectors, "Sector")
+
+    def country_totals(self):
+        """Total FDI per country as a Series."""
+        totals = self._reduce(lambda block: self._nansum(block.reshape(len(block), -1), axis=1))
+        return pd.Series(totals, index=pd.Index(self.countries, name="Country"), name="FDI")
+
+    def year_values(self, year):
+        """Country x sector frame of one fiscal year's values."""
+        j = self._year(year)
+        return self._frame(np.asarray(self.values[:, :, j], dtype=np.float64), self.sectors, "Sector")
+
+    def shares(self, year=None):
+        """Each sector's share of its country's total, in ``year`` or over all years."""
+        values = (self.sector_totals() if year is None else self.year_values(year)).to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = values / np.nansum(values, axis=1, keepdims=True)
+        return self._frame(shares, self.sectors, "Sector")
+
+    def top_n(self, n=10, year=None):
+        """The ``n`` largest sectors of every country, in ``year`` or over all years.
+
+        One stable sort of the country x sector matrix; ties keep sector
+        order and unreported sectors are never ranked. Returns a long frame
+        (Country, rank, Sector, FDI).
+        """
+        values = (self.sector_totals() if year is None else self.year_values(year)).to_numpy()
+        ranked = np.where(np.isnan(values), -np.inf, values)
+        order = np.argsort(-ranked, axis=1, kind="stable")[:, :n]
+        top = np.take_along_axis(values, order, axis=1)
+        keep = ~np.isnan(top)
+        country, rank = np.nonzero(keep)
+        return pd.DataFrame({
+            "Country": np.asarray(self.countries, dtype=object)[country],
+            "rank": rank + 1,
+            "Sector": np.asarray(self.sectors, dtype=object)[order[keep]],
+            "FDI": top[keep],
+        })
+
+    def forecast(self, horizon=7, model="linear"):
+        """Trend forecasts for every (country, sector) series, one batched fit per block of countries.
+
+        Series are fitted on the years they report (see ``_masked_trends``).
+        The store is read a block of countries at a time, as for the other
+        aggregates, so only the result (which holds the fitted values of
+        every reported series) grows with the store. ``sectors`` of the
+        result is a (Country, Sector) ``MultiIndex``, so ``forecast_frame()``
+        and ``stats_frame()`` work as for one cube. Unreported series are
+        dropped.
+        """
+        fiscal_years = FiscalYearIndex.parse(self.years)
+        steps = fiscal_years.steps()
+        parts = []
+        for block in self._blocks():
+            series = block.reshape(-1, len(self.years))
+            parts.append(_masked_trends(series[~np.isnan(series).all(axis=1)].astype(np.float64), steps,
+                                        horizon, model))
+        result = TrendForecast(model, *(np.concatenate([getattr(part, name) for part in parts])
+                                        for name in ("coef", "fitted", "forecast", "r2", "rmse")))
+        present = self.present.ravel()
+        index = pd.MultiIndex.from_product([self.countries, self.sectors], names=["Country", "Sector"])
+        result.sectors = index[present]
+        result.years = self.years
+        result.forecast_years = fiscal_years.extend(horizon).labels()
+        return result
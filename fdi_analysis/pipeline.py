@@ -0,0 +1,411 @@
+"""Incremental rebuild of the FDI report.
+
+The analysis cells are modelled as a dependency graph. Every node (yearly
+totals, sector totals, top-N, forecasts, the selected-sector slice and each
+chart) is keyed on a hash of the exact slice of the sector x year matrix it
+reads, plus the hashes of its dependencies' outputs and of the source code
+it runs (the package modules it names, every package module they import,
+and the text of this module, where the node functions are defined). Keys
+and output hashes are kept in a manifest next to the cached results. A
+rebuild only recomputes nodes whose key changed. If a recomputed node
+produces the same output as before, for example the same top-10 list after
+a small correction, nodes further down are not touched.
+
+Results are cached as ``.npz`` files: arrays are stored as arrays and the
+surrounding structure (labels, field names) as JSON, and they are loaded
+with ``allow_pickle=False``, so a cache directory never executes code.
+
+    python -m fdi_analysis.pipeline "FDI data.csv" --output report
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .cube import FDICube
+
+# Bump when the key or cache format changes; code changes are picked up by code_digest
+GRAPH_VERSION = 2
+
+MANIFEST = "manifest.json"
+
+# Chart nodes draw with charts.py and save with render.save_figure
+CHART_MODULES = ("charts", "render")
+
+
+def digest(obj):
+    """Stable content hash of a node input or output."""
+    h = hashlib.sha1()
+    _update(h, obj)
+    return h.hexdigest()
+
+
+def _update(h, obj):
+    if isinstance(obj, FDICube):
+        _update(h, obj.values)
+        _update(h, obj.sectors)
+        _update(h, obj.years)
+    elif isinstance(obj, np.ndarray):
+        h.update(str((obj.dtype, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (pd.Series, pd.DataFrame)):
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        if isinstance(obj, pd.DataFrame):
+            _update(h, [str(c) for c in obj.columns])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _update(h, item)
+    elif isinstance(obj, dict):
+        _update(h, sorted(obj.items()))
+    elif hasattr(obj, "__dataclass_fields__"):
+        _update(h, [getattr(obj, name) for name in obj.__dataclass_fields__])
+    else:
+        h.update(repr(obj).encode())
+
+
+_PACKAGE_IMPORT = re.compile(r"^\s*from \.(\w*) import ([\w, ]+)", re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def code_digest(modules):
+    """Hash of the source of package ``modules`` and of every package module they import."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    sources, pending = {}, list(modules)
+    while pending:
+        name = pending.pop()
+        path = os.path.join(package_dir, f"{name}.py")
+        if name in sources or not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            sources[name] = f.read()
+        for module, names in _PACKAGE_IMPORT.findall(sources[name]):
+            pending.extend([module] if module else [n.strip() for n in names.split(",")])
+    return digest(sorted(sources.items()))
+
+
+@lru_cache(maxsize=None)
+def _graph_source_digest():
+    # The node lambdas live here; their imports are covered by each node's ``code``
+    with open(os.path.abspath(__file__), encoding="utf-8") as f:
+        return digest(f.read())
+
+
+# --- result cache -------------------------------------------------------------
+# Node outputs are encoded as a JSON tree whose arrays live next to it in the
+# same .npz file; only the types the report produces are supported.
+
+def _dataclass_types():
+    from .forecast import TrendForecast
+
+    return {"TrendForecast": TrendForecast}
+
+
+def _labels(index):
+    if isinstance(index, pd.MultiIndex):
+        return {"levels": [list(level) for level in zip(*index)], "names": list(index.names)}
+    return {"values": index.tolist(), "name": index.name}
+
+
+def _index(labels):
+    if "levels" in labels:
+        return pd.MultiIndex.from_arrays(labels["levels"], names=labels["names"])
+    return pd.Index(labels["values"], name=labels["name"])
+
+
+def _encode(obj, arrays):
+    def array(values):
+        arrays.append(np.asarray(values))
+        return len(arrays) - 1
+
+    if isinstance(obj, FDICube):
+        return {"cube": array(obj.values), "sectors": obj.sectors, "years": obj.years}
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            raise TypeError("object arrays cannot be cached")
+        return {"array": array(obj)}
+    if isinstance(obj, pd.Series):
+        return {"series": array(obj.to_numpy()), "index": _labels(obj.index), "name": obj.name}
+    if isinstance(obj, pd.DataFrame):
+        return {"frame": array(obj.to_numpy()), "index": _labels(obj.index), "columns": _labels(obj.columns)}
+    if hasattr(obj, "__dataclass_fields__") and type(obj).__name__ in _dataclass_types():
+        return {"dataclass": type(obj).__name__,
+                "fields": {f.name: _encode(getattr(obj, f.name), arrays) for f in fields(obj)}}
+    if isinstance(obj, (list, tuple)):
+        return {"list": [_encode(item, arrays) for item in obj]}
+    if isinstance(obj, np.generic):
+        return {"value": obj.item()}
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return {"value": obj}
+    raise TypeError(f"cannot cache a {type(obj).__name__}")
+
+
+def _decode(tree, arrays):
+    if "cube" in tree:
+        return FDICube(arrays[tree["cube"]], tree["sectors"], tree["years"], dtype=arrays[tree["cube"]].dtype)
+    if "array" in tree:
+        return arrays[tree["array"]]
+    if "series" in tree:
+        return pd.Series(arrays[tree["series"]], index=_index(tree["index"]), name=tree["name"])
+    if "frame" in tree:
+        return pd.DataFrame(arrays[tree["frame"]], index=_index(tree["index"]), columns=_index(tree["columns"]))
+    if "dataclass" in tree:
+        cls = _dataclass_types()[tree["dataclass"]]
+        return cls(**{name: _decode(value, arrays) for name, value in tree["fields"].items()})
+    if "list" in tree:
+        return [_decode(item, arrays) for item in tree["list"]]
+    return tree["value"]
+
+
+@dataclass
+class Node:
+    """One step of the report.
+
+    ``reads(cube)`` returns the slice of the data the node looks at (or None
+    if it only uses its dependencies). ``compute(cube, *dep_results)`` builds
+    the node's output. ``code`` names the package modules whose source
+    the output depends on.
+    """
+
+    name: str
+    compute: object
+    deps: tuple = ()
+    reads: object = None
+    code: tuple = ()
+
+
+class ReportGraph:
+    """Dependency graph of report nodes with an on-disk result cache."""
+
+    def __init__(self, cache_dir, config=None):
+        self.cache_dir = cache_dir
+        # Settings that change node outputs (top-N size, formats, ...) are part of every key
+        self.config = config or {}
+        self.nodes = {}
+
+    def add(self, name, compute, deps=(), reads=None, code=()):
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"node {name!r} depends on unknown node(s) {missing}")
+        self.nodes[name] = Node(name, compute, tuple(deps), reads, tuple(code))
+        return self.nodes[name]
+
+    def _result_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.npz")
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.cache_dir, MANIFEST), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest.get("nodes", {}) if manifest.get("version") == GRAPH_VERSION else {}
+
+    def _save_manifest(self, entries):
+        path = os.path.join(self.cache_dir, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"version": GRAPH_VERSION, "nodes": entries}, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def _load_result(self, name):
+        with np.load(self._result_path(name), allow_pickle=False) as f:
+            tree = json.loads(str(f["tree"]))
+            arrays = [f[f"a{i}"] for i in range(len(f.files) - 1)]
+        return _decode(tree, arrays)
+
+    def _store_result(self, name, result):
+        arrays = []
+        tree = _encode(result, arrays)
+        path = self._result_path(name)
+        np.savez(path + ".tmp.npz", tree=np.array(json.dumps(tree)), **{f"a{i}": a for i, a in enumerate(arrays)})
+        os.replace(path + ".tmp.npz", path)
+
+    def build(self, cube, targets=None):
+        """Bring ``targets`` (default: every node) up to date for ``cube``.
+
+        Returns a DataFrame with one row per visited node saying whether it
+        was reused from the cache or recomputed, whether its output differs
+        from the previous build, and how long it took.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        order = self._order(targets)
+
+        results = {}
+        rows = []
+        for name in order:
+            node = self.nodes[name]
+            start = time.perf_counter()
+            key_parts = [GRAPH_VERSION, name, self.config, [manifest[dep]["digest"] for dep in node.deps],
+                         _graph_source_digest(), code_digest(node.code)]
+            if node.reads is not None:
+                key_parts.append(digest(node.reads(cube)))
+            key = digest(key_parts)
+
+            entry = manifest.get(name)
+            if entry is not None and entry["key"] == key and _outputs_exist(entry):
+                status, changed = "cached", False
+            else:
+                inputs = [results[dep] if dep in results else self._load_result(dep) for dep in node.deps]
+                result = node.compute(cube, *inputs)
+                self._store_result(name, result)
+                results[name] = result
+                output_digest = digest(result)
+                changed = entry is None or entry["digest"] != output_digest
+                manifest[name] = {"key": key, "digest": output_digest, "files": _files(result)}
+                status = "rebuilt"
+            rows.append({"node": name, "status": status, "output_changed": changed,
+                         "seconds": time.perf_counter() - start})
+
+        self._save_manifest(manifest)
+        return pd.DataFrame(rows).set_index("node")
+
+    def _order(self, targets):
+        """Topological order of ``targets`` and everything they depend on."""
+        targets = list(self.nodes) if targets is None else list(targets)
+        order, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            if name not in self.nodes:
+                raise ValueError(f"unknown node {name!r}")
+            seen.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            order.append(name)
+
+        for name in targets:
+            visit(name)
+        return order
+
+
+def _files(result):
+    if isinstance(result, list) and all(isinstance(item, str) for item in result):
+        return result
+    return []
+
+
+def _outputs_exist(entry):
+    return all(os.path.exists(path) for path in entry.get("files", []))
+
+
+def report_graph(output_dir, selected_sectors=None, top_n=10, horizon=7, pie_year="2010-11",
+                 low_high_years=("2009-10", "2010-11"), formats=("png",), dpi=100):
+    """The notebook's analysis and charts as a ``ReportGraph``.
+
+    Charts are written to ``output_dir``; cached results and the manifest
+    live in ``output_dir/.cache``.
+    """
+    from . import charts
+    from .forecast import forecast_cube
+    from .render import save_figure
+
+    if selected_sectors is None:
+        selected_sectors = charts.SELECTED_SECTORS
+    selected_sectors = list(selected_sectors)
+    low_high_years = list(low_high_years)
+    config = {
+        "selected_sectors": selected_sectors,
+        "top_n": top_n,
+        "horizon": horizon,
+        "pie_year": pie_year,
+        "low_high_years": low_high_years,
+        "formats": list(formats),
+        "dpi": dpi,
+    }
+    graph = ReportGraph(os.path.join(output_dir, ".cache"), config)
+
+    def chart(name, draw):
+        def compute(cube, *inputs):
+            import matplotlib
+            matplotlib.use("Agg")
+            os.makedirs(output_dir, exist_ok=True)
+            return save_figure(draw(cube, *inputs), output_dir, name, formats, dpi)
+        return compute
+
+    def selected_rows(cube):
+        return cube.select(selected_sectors)
+
+    # Analysis nodes
+    graph.add("yearly_totals", lambda cube: cube.year_totals(), reads=lambda cube: cube, code=("cube",))
+    graph.add("sector_totals", lambda cube: cube.sector_totals(), reads=lambda cube: cube, code=("cube",))
+    graph.add("top_n", lambda cube, totals: totals.sort_values(ascending=False).head(top_n),
+              deps=["sector_totals"])
+    graph.add("forecasts", lambda cube: forecast_cube(cube, horizon=horizon).forecast_frame(),
+              reads=lambda cube: cube, code=("forecast",))
+    graph.add("selected", lambda cube: selected_rows(cube), reads=selected_rows, code=("cube",))
+    graph.add("selected_forecasts", lambda cube, selected: forecast_cube(selected, horizon=horizon),
+              deps=["selected"], code=("forecast",))
+    graph.add("low_high_years", lambda cube: cube.wide.loc[low_high_years].T,
+              reads=lambda cube: [cube.sectors, [cube.year(y) for y in low_high_years]], code=("cube",))
+
+    # Chart nodes
+    graph.add("chart_yearly_investment", chart("yearly_investment", lambda cube, totals: charts.yearly_investment_line(cube)),
+              deps=["yearly_totals"], code=CHART_MODULES)
+    graph.add("chart_yearly_total", chart("yearly_total", lambda cube, totals: charts.yearly_total_bar(cube)),
+              deps=["yearly_totals"], code=CHART_MODULES)
+    graph.add("chart_lowest_highest",
+              chart("lowest_highest", lambda cube, frame: charts.lowest_highest_scatter(cube, years=low_high_years)),
+              deps=["low_high_years"], code=CHART_MODULES)
+    graph.add("chart_top_sectors",
+              chart("top_sectors", lambda cube, top: charts.top_sectors_bar(cube.select(top.index), top_n=top_n)),
+              deps=["top_n"], code=CHART_MODULES)
+    graph.add("chart_sector_trends",
+              chart("sector_trends", lambda cube, selected: charts.sector_trends(selected, selected.sectors)),
+              deps=["selected"], code=CHART_MODULES)
+    graph.add("chart_sector_forecasts",
+              chart("sector_forecasts",
+                    lambda cube, selected, trend: charts.sector_forecasts(selected, trend, selected.sectors)),
+              deps=["selected", "selected_forecasts"], code=CHART_MODULES)
+    graph.add("chart_pie",
+              chart("pie_" + pie_year.replace("-", "_"),
+                    lambda cube, selected: charts.year_pie(selected, pie_year, selected.sectors)),
+              deps=["selected"], code=CHART_MODULES)
+    graph.add("chart_selected_scatter",
+              chart("selected_scatter", lambda cube, selected: charts.selected_scatter(selected, selected.sectors)),
+              deps=["selected"], code=CHART_MODULES)
+    graph.add("chart_selected_heatmap",
+              chart("selected_heatmap", lambda cube, selected: charts.selected_heatmap(selected, selected.sectors)),
+              deps=["selected"], code=CHART_MODULES)
+    graph.add("chart_stacked_area",
+              chart("stacked_area", lambda cube, selected: charts.selected_stacked_area(selected, selected.sectors)),
+              deps=["selected"], code=CHART_MODULES)
+    graph.add("chart_boxplot", chart("boxplot", lambda cube: charts.year_boxplot(cube)), reads=lambda cube: cube,
+              code=CHART_MODULES)
+    graph.add("chart_histogram", chart("histogram", lambda cube: charts.fdi_histogram(cube)),
+              reads=lambda cube: cube.values, code=CHART_MODULES)
+    return graph
+
+
+def rebuild_report(data_path, output_dir, **options):
+    """Load ``data_path`` and bring the report in ``output_dir`` up to date."""
+    from .loader import load_fdi_data
+
+    cube = FDICube.from_frame(load_fdi_data(data_path))
+    return report_graph(output_dir, **options).build(cube)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild only the parts of the FDI report whose inputs changed.")
+    parser.add_argument("input", help="path to the FDI CSV file")
+    parser.add_argument("--output", default="report", help="output directory (default: report)")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg", "pdf"])
+    args = parser.parse_args(argv)
+
+    report = rebuild_report(args.input, args.output, formats=tuple(args.format))
+    print(report.round(3).to_string())
+    rebuilt = (report["status"] == "rebuilt").sum()
+    print(f"{rebuilt} of {len(report)} nodes rebuilt")
+
+
+if __name__ == "__main__":
+    main()
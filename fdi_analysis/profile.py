@@ -0,0 +1,211 @@
+"""Single-pass profile of the sector x year value matrix.
+
+The opening cells used to call ``info()``, ``describe()`` and
+``isnull().sum()`` one after another, and each walked the whole frame.
+``profile_cube`` computes everything they report in one vectorized pass:
+per-year count, nulls, zeros, sum, mean, variance, min/max and quartiles,
+plus histogram counts on bin edges shared by the whole panel. Blocks of
+columns can be spread over a thread pool; numpy releases the GIL for these
+reductions. The resulting ``DataProfile`` is saved next to the data and,
+like the loader's cache, is reused while the file's size and mtime are
+unchanged. The histogram and boxplot charts draw straight from it
+instead of rescanning the values.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .quantiles import exact_quantiles
+
+PROFILE_VERSION = 1
+QUARTILES = (0.25, 0.5, 0.75)
+WHISKER = 1.5
+
+_STATS = ("count", "nulls", "zeros", "sum", "mean", "var", "min", "max", "q1", "median", "q3", "whislo", "whishi")
+
+
+@dataclass
+class DataProfile:
+    """Per-year statistics of a sector x year panel.
+
+    Every array in ``stats`` has one entry per year. ``histogram`` has shape
+    (n_years, bins) with counts over ``bin_edges``, which span the whole panel.
+    ``whislo``/``whishi`` are the boxplot whisker ends: the most extreme values
+    within 1.5 IQR of the quartiles.
+    """
+
+    years: list
+    stats: dict
+    bin_edges: np.ndarray
+    histogram: np.ndarray
+    key: str = ""
+
+    @property
+    def bins(self):
+        return len(self.bin_edges) - 1
+
+    def frame(self):
+        """The statistics as a year x statistic DataFrame (with ``std``)."""
+        frame = pd.DataFrame({name: self.stats[name] for name in _STATS}, index=pd.Index(self.years, name="Year"))
+        frame.insert(frame.columns.get_loc("var") + 1, "std", np.sqrt(frame["var"]))
+        return frame
+
+    def describe(self):
+        """The ``DataFrame.describe()`` table, from the profile."""
+        frame = self.frame()
+        table = frame[["count", "mean", "std", "min", "q1", "median", "q3", "max"]].T
+        table.index = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+        table.columns = list(self.years)
+        return table.astype(np.float64)
+
+    def null_counts(self):
+        return pd.Series(self.stats["nulls"], index=self.years)
+
+    def panel_histogram(self):
+        """Counts over ``bin_edges`` for every sector-year value."""
+        return self.histogram.sum(axis=0)
+
+    def box_stats(self, fliers=None):
+        """Per-year stat dicts for ``Axes.bxp``; ``fliers`` maps year -> outlying values."""
+        frame = self.frame()
+        return [
+            {
+                "label": year,
+                "med": row.median,
+                "q1": row.q1,
+                "q3": row.q3,
+                "whislo": row.whislo,
+                "whishi": row.whishi,
+                "fliers": np.asarray((fliers or {}).get(year, [])),
+            }
+            for year, row in zip(self.years, frame.itertuples(index=False))
+        ]
+
+    # --- persistence ----------------------------------------------------------
+
+    def save(self, path):
+        """Write the profile to an ``.npz`` file."""
+        tmp = path + ".tmp.npz"
+        meta = json.dumps({"version": PROFILE_VERSION, "years": self.years, "key": self.key})
+        np.savez(tmp, meta=np.array(meta), bin_edges=self.bin_edges, histogram=self.histogram,
+                 **{f"stat_{name}": values for name, values in self.stats.items()})
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            meta = json.loads(str(f["meta"]))
+            if meta.get("version") != PROFILE_VERSION:
+                raise ValueError(f"{path} has an old profile version")
+            stats = {name: f[f"stat_{name}"] for name in _STATS}
+            return cls(meta["years"], stats, f["bin_edges"], f["histogram"], meta["key"])
+
+
+def _bin_edges(values, bins):
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return np.linspace(0.0, 1.0, bins + 1)
+    lo, hi = float(finite.min()), float(finite.max())
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
+def _profile_block(block, edges):
+    """Statistics and histogram counts for a block of year columns."""
+    valid = ~np.isnan(block)
+    count = valid.sum(axis=0)
+    filled = np.where(valid, block, 0.0)
+    total = filled.sum(axis=0)
+    has = count > 0
+    mean = np.divide(total, count, out=np.full(total.shape, np.nan), where=has)
+    sq = np.where(valid, (block - mean) ** 2, 0.0).sum(axis=0)
+    var = np.divide(sq, count - 1, out=np.full(total.shape, np.nan), where=count > 1)
+    lo = np.where(has, np.where(valid, block, np.inf).min(axis=0), np.nan)
+    hi = np.where(has, np.where(valid, block, -np.inf).max(axis=0), np.nan)
+
+    if block.shape[0]:
+        q1, median, q3 = exact_quantiles(block, QUARTILES, axis=0)
+    else:
+        q1 = median = q3 = np.full(block.shape[1], np.nan)
+    reach = WHISKER * (q3 - q1)
+    with np.errstate(invalid="ignore"):
+        inside_lo = valid & (block >= q1 - reach)
+        inside_hi = valid & (block <= q3 + reach)
+    whislo = np.where(has, np.where(inside_lo, block, np.inf).min(axis=0), np.nan)
+    whishi = np.where(has, np.where(inside_hi, block, -np.inf).max(axis=0), np.nan)
+
+    # One bincount over (column, bin) pairs fills every column's histogram
+    bins = len(edges) - 1
+    n_cols = block.shape[1]
+    which = np.clip(np.searchsorted(edges, block, side="right") - 1, 0, bins - 1)
+    flat = (np.arange(n_cols) * bins + which)[valid]
+    histogram = np.bincount(flat, minlength=n_cols * bins).reshape(n_cols, bins)
+
+    stats = {
+        "count": count, "nulls": block.shape[0] - count, "zeros": (block == 0).sum(axis=0),
+        "sum": total, "mean": mean, "var": var, "min": lo, "max": hi,
+        "q1": q1, "median": median, "q3": q3, "whislo": whislo, "whishi": whishi,
+    }
+    return stats, histogram
+
+
+def profile_values(values, years, bins=20, workers=None, key=""):
+    """Profile a (sector, year) array; ``workers`` > 1 splits the columns over threads."""
+    values = np.asarray(values, dtype=np.float64)
+    years = list(years)
+    edges = _bin_edges(values, bins)
+    n_blocks = max(1, min(workers or 1, values.shape[1]))
+    blocks = np.array_split(np.arange(values.shape[1]), n_blocks)
+    if n_blocks == 1:
+        parts = [_profile_block(values, edges)]
+    else:
+        with ThreadPoolExecutor(max_workers=n_blocks) as pool:
+            parts = list(pool.map(lambda cols: _profile_block(values[:, cols], edges), blocks))
+    stats = {name: np.concatenate([part[0][name] for part in parts]) for name in _STATS}
+    histogram = np.vstack([part[1] for part in parts])
+    return DataProfile(years, stats, edges, histogram, key)
+
+
+def profile_key(data_path, bins):
+    """Size and mtime of the source file plus the bin count, like the loader's cache stamp."""
+    st = os.stat(data_path)
+    return json.dumps([st.st_size, st.st_mtime_ns, bins])
+
+
+def profile_path(data_path):
+    """Where the profile for ``data_path`` is kept."""
+    return os.path.splitext(os.path.abspath(data_path))[0] + ".profile.npz"
+
+
+def profile_cube(cube, data_path=None, bins=20, workers=None):
+    """Profile of ``cube``, reused from the file next to ``data_path`` when still current.
+
+    ``cube`` must hold the contents of ``data_path``: the saved profile is
+    matched on the file's size and mtime, never on the values themselves.
+    Without ``data_path`` nothing is cached.
+    """
+    if data_path is None:
+        return profile_values(cube.values, cube.years, bins=bins, workers=workers)
+
+    key = profile_key(data_path, bins)
+    path = profile_path(data_path)
+    if os.path.exists(path):
+        try:
+            profile = DataProfile.load(path)
+        except (OSError, ValueError, KeyError):
+            profile = None
+        if profile is not None and profile.key == key:
+            return profile
+
+    profile = profile_values(cube.values, cube.years, bins=bins, workers=workers, key=key)
+    try:
+        profile.save(path)
+    except OSError:
+        pass
+    return profile
@@ -0,0 +1,226 @@
+"""Quantiles of the FDI panel: exact selection and a streaming sketch.
+
+``panel_quantiles`` gives exact medians, IQRs and arbitrary percentiles per
+year, per sector and for the whole panel. It uses ``np.partition`` on the
+value buffer, which selects the needed order statistics without a full sort
+or a melted frame.
+
+For panels too large for memory, ``KLLSketch`` is a mergeable quantile
+sketch with bounded size. ``StreamingQuantiles`` feeds chunks of sector rows
+into one sketch per year plus one global sketch. Per-sector quantiles stay
+exact, because every chunk holds whole rows.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_Q = (0.25, 0.5, 0.75)
+
+
+def exact_quantiles(values, q, axis=None):
+    """Linear-interpolated quantiles (as ``np.quantile``) via partial selection.
+
+    Returns an array with the quantiles on the first axis. NaNs are ignored.
+    """
+    a = np.asarray(values, dtype=np.float64)
+    q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+    if axis is None:
+        a = a.ravel()
+        axis = 0
+    if np.isnan(a).any():
+        return np.nanquantile(a, q, axis=axis)
+    n = a.shape[axis]
+    if n == 0:
+        raise ValueError("cannot take quantiles of an empty axis")
+
+    position = q * (n - 1)
+    lo = np.floor(position).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    part = np.partition(a, np.unique(np.concatenate([lo, hi])), axis=axis)
+    lo_values = np.moveaxis(np.take(part, lo, axis=axis), axis, 0)
+    hi_values = np.moveaxis(np.take(part, hi, axis=axis), axis, 0)
+    frac = (position - lo).reshape((-1,) + (1,) * (lo_values.ndim - 1))
+    return lo_values + (hi_values - lo_values) * frac
+
+
+@dataclass
+class PanelQuantiles:
+    """Quantiles of a sector x year panel at three levels.
+
+    ``overall`` is a Series indexed by q, ``by_year`` is a years x q frame
+    and ``by_sector`` a sectors x q frame.
+    """
+
+    q: tuple
+    overall: pd.Series
+    by_year: pd.DataFrame
+    by_sector: pd.DataFrame
+
+    def _level(self, level):
+        frames = {"overall": self.overall, "year": self.by_year, "sector": self.by_sector}
+        if level not in frames:
+            raise ValueError(f"level must be one of {list(frames)}")
+        return frames[level]
+
+    def median(self, level="overall"):
+        return self._pick(self._level(level), 0.5)
+
+    def iqr(self, level="overall"):
+        frame = self._level(level)
+        return self._pick(frame, 0.75) - self._pick(frame, 0.25)
+
+    @staticmethod
+    def _pick(frame, q):
+        if isinstance(frame, pd.Series):
+            return frame.loc[q]
+        return frame[q]
+
+
+def panel_quantiles(cube, q=DEFAULT_Q):
+    """Exact quantiles per year, per sector and over the whole panel of an ``FDICube``."""
+    q = tuple(sorted(set(q) | {0.25, 0.5, 0.75}))
+    overall = pd.Series(exact_quantiles(cube.values, q), index=q, name="FDI")
+    by_year = pd.DataFrame(exact_quantiles(cube.values, q, axis=0).T, index=cube.years, columns=q)
+    by_sector = pd.DataFrame(exact_quantiles(cube.values, q, axis=1).T, index=cube.sectors, columns=q)
+    return PanelQuantiles(q, overall, by_year, by_sector)
+
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch.
+
+    Values are kept in levels of "compactors"; an item on level ``h`` stands
+    for ``2**h`` inputs. When a level exceeds its capacity it is sorted and
+    every other item (random offset) is promoted to the next level. The rank
+    error is roughly ``1.7 / k`` of the stream length.
+    """
+
+    def __init__(self, k=200, seed=None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.n
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        """Add a batch of values (NaNs are skipped)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so the promoted weight is exact
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                promoted = pairs[int(self._rng.integers(2))::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = keep
+                # Adding a level shrinks the lower capacities; re-check from the bottom
+                level = 0
+                continue
+            level += 1
+
+    def quantile(self, q):
+        """Approximate quantile(s) ``q`` of everything seen so far."""
+        if self.n == 0:
+            raise ValueError("empty sketch")
+        if len(self.levels) == 1:
+            # Nothing compacted yet, so answer exactly (linear, like np.quantile)
+            result = np.quantile(self.levels[0], q)
+            return float(result) if np.ndim(result) == 0 else result
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(v), 2.0 ** h) for h, v in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        q = np.asarray(q, dtype=np.float64)
+        idx = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        result = items[np.minimum(idx, len(items) - 1)]
+        # The extremes are tracked exactly
+        result = np.where(q <= 0, self.min, np.where(q >= 1, self.max, result))
+        return float(result) if result.ndim == 0 else result
+
+
+class StreamingQuantiles:
+    """One-pass quantiles over chunks of whole sector rows.
+
+    Per-year and whole-panel quantiles come from KLL sketches; per-sector
+    quantiles are exact because each chunk holds complete rows.
+    """
+
+    def __init__(self, years, q=DEFAULT_Q, k=200, seed=0):
+        self.years = list(years)
+        self.q = tuple(sorted(set(q) | {0.25, 0.5, 0.75}))
+        self.overall = KLLSketch(k, seed)
+        self.by_year = [KLLSketch(k, seed + 1 + j) for j in range(len(self.years))]
+        self._sectors = []
+        self._sector_rows = []
+
+    def update(self, sectors, rows):
+        rows = np.asarray(rows, dtype=np.float64)
+        self.overall.update(rows)
+        for j, sketch in enumerate(self.by_year):
+            sketch.update(rows[:, j])
+        self._sectors.extend(sectors)
+        self._sector_rows.append(exact_quantiles(rows, self.q, axis=1).T)
+        return self
+
+    def result(self):
+        q = list(self.q)
+        overall = pd.Series(self.overall.quantile(q), index=self.q, name="FDI")
+        by_year = pd.DataFrame([s.quantile(q) for s in self.by_year], index=self.years, columns=self.q)
+        rows = np.vstack(self._sector_rows) if self._sector_rows else np.empty((0, len(q)))
+        by_sector = pd.DataFrame(rows, index=self._sectors, columns=self.q)
+        return PanelQuantiles(self.q, overall, by_year, by_sector)
+
+
+def stream_quantiles(path, q=DEFAULT_Q, chunksize=100_000, k=200, sector_column="Sector"):
+    """Quantiles of a sector x year CSV read in chunks of ``chunksize`` rows."""
+    stream = None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        years = [c for c in chunk.columns if c != sector_column]
+        if stream is None:
+            stream = StreamingQuantiles(years, q=q, k=k)
+        stream.update(chunk[sector_column].tolist(), chunk[years].to_numpy(dtype=np.float64))
+    if stream is None:
+        raise ValueError(f"{path} has no rows")
+    return stream.result()
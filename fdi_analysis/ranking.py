@@ -0,0 +1,86 @@
+"""Per-year rank index for lowest/highest-sector queries.
+
+One stable ``argsort`` down the year columns of the sector x year matrix
+gives, for every year, the sector rows in ascending order of FDI. Bottom-k
+and top-k lookups for any year, or for every year at once, then read k
+entries of that order instead of re-sorting the frame per year.
+
+Ties are broken by sector position: among equal values the sector listed
+first in the data ranks lower, so ``bottom`` returns it first and ``top``
+returns it last. Missing values are never ranked.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class RankIndex:
+    """Ascending sector order for every year of an ``FDICube``."""
+
+    def __init__(self, cube):
+        self.cube = cube
+        # NaNs sort to the end of each column; n_valid marks where they start
+        self.order = np.argsort(cube.values, axis=0, kind="stable")
+        self.n_valid = (~np.isnan(cube.values)).sum(axis=0)
+        self._ranks = None
+
+    def _positions(self, j, k, largest):
+        n = int(self.n_valid[j])
+        k = min(k, n)
+        if largest:
+            return self.order[np.arange(n - 1, n - 1 - k, -1), j]
+        return self.order[:k, j]
+
+    def _series(self, year, k, largest):
+        j = self.cube.year_index[year]
+        rows = self._positions(j, k, largest)
+        return pd.Series(self.cube.values[rows, j], index=[self.cube.sectors[i] for i in rows], name=year)
+
+    def bottom(self, year, k=1):
+        """The ``k`` lowest-FDI sectors in ``year`` (Series sector -> FDI, lowest first)."""
+        return self._series(year, k, largest=False)
+
+    def top(self, year, k=1):
+        """The ``k`` highest-FDI sectors in ``year`` (Series sector -> FDI, highest first)."""
+        return self._series(year, k, largest=True)
+
+    def lowest(self, year):
+        """(sector, FDI) of the lowest sector in ``year``."""
+        s = self.bottom(year, 1)
+        return s.index[0], s.iloc[0]
+
+    def highest(self, year):
+        """(sector, FDI) of the highest sector in ``year``."""
+        s = self.top(year, 1)
+        return s.index[0], s.iloc[0]
+
+    def extremes(self, k=1, years=None):
+        """Bottom-k and top-k sectors for every year at once.
+
+        Returns a frame indexed by year with columns ``lowest_<i>``,
+        ``lowest_<i>_fdi``, ``highest_<i>`` and ``highest_<i>_fdi`` for
+        i = 1..k. Years with fewer than k values get NaN past the end.
+        """
+        years = self.cube.years if years is None else list(years)
+        cols = np.array([self.cube.year_index[y] for y in years])
+        sectors = np.array(self.cube.sectors, dtype=object)
+        n_valid = self.n_valid[cols]
+        columns = {}
+        for i in range(k):
+            ok = i < n_valid
+            for label, pos in (("lowest", np.full(len(cols), i)), ("highest", n_valid - 1 - i)):
+                rows = self.order[np.clip(pos, 0, len(sectors) - 1), cols]
+                columns[f"{label}_{i + 1}"] = np.where(ok, sectors[rows], None)
+                columns[f"{label}_{i + 1}_fdi"] = np.where(ok, self.cube.values[rows, cols], np.nan)
+        frame = pd.DataFrame(columns, index=pd.Index(years, name="Year"))
+        ordered = [f"{label}_{i + 1}{suffix}" for label in ("lowest", "highest") for i in range(k) for suffix in ("", "_fdi")]
+        return frame[ordered]
+
+    def rank(self, sector, year):
+        """0-based ascending rank of ``sector`` in ``year``."""
+        if self._ranks is None:
+            ranks = np.empty_like(self.order)
+            cols = np.arange(self.order.shape[1])
+            ranks[self.order, cols] = np.arange(self.order.shape[0])[:, None]
+            self._ranks = ranks
+        return int(self._ranks[self.cube.row(sector), self.cube.year_index[year]])
@@ -0,0 +1,142 @@
+"""Headless rendering of the full chart set.
+
+Every chart in ``fdi_analysis.charts`` is drawn on the Agg backend and saved
+to an output directory. Independent figures are spread across a process
+pool. Each worker memory-maps the cached value matrix (see
+``fdi_analysis.loader``), so the CSV is not parsed again. The timing of every
+figure is returned as a small report.
+
+    python -m fdi_analysis.render "FDI data.csv" --output charts --format png svg
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Chart name -> function name in fdi_analysis.charts
+CHARTS = {
+    "yearly_investment": "yearly_investment_line",
+    "lowest_highest": "lowest_highest_scatter",
+    "top_sectors": "top_sectors_bar",
+    "sector_trends": "sector_trends",
+    "sector_forecasts": "sector_forecasts",
+    "boxplot": "year_boxplot",
+    "pie_2010_11": "year_pie",
+    "histogram": "fdi_histogram",
+    "yearly_total": "yearly_total_bar",
+    "selected_scatter": "selected_scatter",
+    "selected_heatmap": "selected_heatmap",
+    "panel_heatmap": "panel_heatmap",
+    "stacked_area": "selected_stacked_area",
+}
+
+
+def draw_chart(name, cube):
+    """Build one named chart for ``cube`` and return the figure."""
+    from . import charts
+    from .forecast import forecast_cube
+
+    function = getattr(charts, CHARTS[name])
+    if name == "sector_forecasts":
+        return function(cube, forecast_cube(cube, horizon=7, level=0.95))
+    return function(cube)
+
+
+def save_figure(fig, output_dir, name, formats=("png",), dpi=100):
+    """Save ``fig`` as ``output_dir/name.<fmt>`` for each format, close it and return the paths."""
+    import matplotlib.pyplot as plt
+
+    files = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        fig.savefig(path, dpi=dpi, bbox_inches="tight")
+        files.append(path)
+    plt.close(fig)
+    return files
+
+
+def _available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _render_one(data_path, name, output_dir, formats, dpi):
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from .cube import FDICube
+    from .loader import load_fdi_data
+
+    start = time.perf_counter()
+    cube = FDICube.from_frame(load_fdi_data(data_path))
+    loaded = time.perf_counter()
+    fig = draw_chart(name, cube)
+    drawn = time.perf_counter()
+    files = save_figure(fig, output_dir, name, formats, dpi)
+    saved = time.perf_counter()
+    return {
+        "chart": name,
+        "load_s": loaded - start,
+        "draw_s": drawn - loaded,
+        "save_s": saved - drawn,
+        "total_s": saved - start,
+        "pid": os.getpid(),
+        "files": files,
+    }
+
+
+def render_charts(data_path, output_dir, names=None, formats=("png",), workers=None, dpi=100):
+    """Render ``names`` (default: every chart) to ``output_dir``.
+
+    ``workers=1`` renders in this process; otherwise the figures are drawn
+    in a process pool of ``workers`` processes (default: one per CPU, capped
+    by the number of charts). Returns a DataFrame with one timing row per
+    chart, in the order requested.
+    """
+    from .loader import load_fdi_data
+
+    names = list(CHARTS) if names is None else list(names)
+    unknown = [name for name in names if name not in CHARTS]
+    if unknown:
+        raise ValueError(f"unknown chart(s) {unknown}; expected some of {list(CHARTS)}")
+    data_path = os.path.abspath(data_path)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Build the sidecar cache once up front so the workers only memory-map it
+    load_fdi_data(data_path)
+
+    if workers is None:
+        workers = min(len(names), _available_cpus())
+    if workers <= 1:
+        rows = [_render_one(data_path, name, output_dir, formats, dpi) for name in names]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render_one, data_path, name, output_dir, formats, dpi) for name in names]
+            rows = [future.result() for future in futures]
+    return pd.DataFrame(rows).set_index("chart")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every FDI chart to image files.")
+    parser.add_argument("input", help="path to the FDI CSV file")
+    parser.add_argument("--output", default="charts", help="output directory (default: charts)")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg", "pdf"])
+    parser.add_argument("--chart", nargs="+", choices=list(CHARTS), help="render only these charts")
+    parser.add_argument("--workers", type=int, help="number of processes (default: one per CPU)")
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    report = render_charts(args.input, args.output, names=args.chart, formats=args.format,
+                           workers=args.workers, dpi=args.dpi)
+    elapsed = time.perf_counter() - start
+    print(report[["load_s", "draw_s", "save_s", "total_s"]].round(3).to_string())
+    print(f"Rendered {len(report)} charts to {args.output} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
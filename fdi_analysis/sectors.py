@@ -0,0 +1,129 @@
+"""Sector-name lookup with prefix and fuzzy matching.
+
+``SectorIndex`` maps names to row positions. Exact names are a dict lookup.
+Short forms such as "services" or "construction development" are resolved
+through a prefix trie over normalised names (lower case, punctuation folded
+to spaces). Anything that does not resolve to exactly one sector raises
+``SectorLookupError`` with the closest candidates, so a typo fails fast and
+does not silently select nothing.
+"""
+
+import difflib
+import re
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(name):
+    """Lower-case ``name`` and collapse punctuation/whitespace runs to one space."""
+    return _NON_ALNUM.sub(" ", str(name).lower()).strip()
+
+
+class SectorLookupError(KeyError):
+    """A sector query matched no sector, or more than one."""
+
+    def __init__(self, query, candidates, reason):
+        self.query = query
+        self.candidates = list(candidates)
+        self.reason = reason
+        super().__init__(query)
+
+    def __str__(self):
+        message = f"{self.reason} sector {self.query!r}"
+        if self.candidates:
+            message += "; did you mean: " + ", ".join(repr(c) for c in self.candidates)
+        return message
+
+
+class _TrieNode:
+    __slots__ = ("children", "rows")
+
+    def __init__(self):
+        self.children = {}
+        self.rows = []
+
+
+class SectorIndex:
+    """Exact, alias, prefix and fuzzy lookup of sector names."""
+
+    def __init__(self, sectors, aliases=None, max_suggestions=5):
+        self.sectors = list(sectors)
+        self.max_suggestions = max_suggestions
+        self.positions = {name: i for i, name in enumerate(self.sectors)}
+        self.normalized = [normalize(name) for name in self.sectors]
+        self.normalized_positions = {}
+        for i, key in enumerate(self.normalized):
+            self.normalized_positions.setdefault(key, []).append(i)
+        self.aliases = {}
+        for alias, target in (aliases or {}).items():
+            self.aliases[normalize(alias)] = self.positions[target]
+
+        self._root = _TrieNode()
+        for i, key in enumerate(self.normalized):
+            node = self._root
+            for ch in key:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.rows.append(i)
+
+    def __len__(self):
+        return len(self.sectors)
+
+    def __contains__(self, query):
+        try:
+            self.position(query)
+        except SectorLookupError:
+            return False
+        return True
+
+    def prefix_rows(self, prefix):
+        """Rows of every sector whose normalised name starts with ``prefix``."""
+        node = self._root
+        for ch in normalize(prefix):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return list(node.rows) if node is not self._root else list(range(len(self.sectors)))
+
+    def position(self, query):
+        """Row position of the one sector matching ``query``."""
+        row = self.positions.get(query)
+        if row is not None:
+            return row
+        key = normalize(query)
+        if key in self.aliases:
+            return self.aliases[key]
+        exact = self.normalized_positions.get(key, [])
+        if len(exact) == 1:
+            return exact[0]
+        matches = exact or (self.prefix_rows(key) if key else [])
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            names = [self.sectors[i] for i in matches[: self.max_suggestions]]
+            raise SectorLookupError(query, names, "ambiguous")
+        raise SectorLookupError(query, self.suggest(query), "unknown")
+
+    def resolve(self, query):
+        """Full sector name for ``query``."""
+        return self.sectors[self.position(query)]
+
+    def positions_of(self, queries):
+        return [self.position(query) for query in queries]
+
+    def suggest(self, query):
+        """Closest sector names to ``query`` (for error messages)."""
+        key = normalize(query)
+        # Fuzzy-match whole names and the leading words of each name, so a
+        # misspelt short form ("servces") still finds "SERVICES SECTOR (...)"
+        words = len(key.split()) or 1
+        heads = {}
+        for i, name in enumerate(self.normalized):
+            heads.setdefault(" ".join(name.split()[:words]), i)
+            heads.setdefault(name, i)
+        close = difflib.get_close_matches(key, list(heads), n=self.max_suggestions, cutoff=0.6)
+        suggestions = []
+        for match in close:
+            name = self.sectors[heads[match]]
+            if name not in suggestions:
+                suggestions.append(name)
+        return suggestions
@@ -0,0 +1,443 @@
+"""Local HTTP service answering dashboard queries from one loaded panel.
+
+``AnalyticsServer`` loads the sector x year data once and serves JSON and
+PNG endpoints over asyncio (stdlib only, meant for localhost):
+
+    GET /top?n=10[&year=2016-17]             top-N sectors overall or in one year
+    GET /totals[?by=sector]                  yearly (or per-sector) totals
+    GET /shares?year=2010-11[&sector=...]    pie shares of the selected sectors
+    GET /quantiles?level=year[&q=0.9]        panel quantiles (overall, year or sector)
+    GET /forecast?horizon=7&model=linear[&sector=...][&level=0.95][&stats=1]
+    GET /chart/<name>.png[?dpi=100]          any chart from ``fdi_analysis.render``
+    GET /status                              data version and cache counters
+
+Sector names contain commas, so several sectors are passed as repeated
+``sector=`` parameters (full names or unambiguous short forms).
+
+Responses are computed in a thread pool and kept in a size-bounded LRU
+cache keyed by the data version, endpoint and query. Concurrent requests for
+the same key wait on one computation instead of starting their own. Every
+request stats the source file; when its size or mtime changes, the panel is
+reloaded (through the loader's sidecar cache) and the result cache is
+cleared.
+
+    fdi-analysis serve --input "FDI data.csv" --port 8050
+"""
+
+import asyncio
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .cube import FDICube
+from .loader import load_fdi_data
+
+JSON = "application/json"
+PNG = "image/png"
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """A request the server cannot answer; carries the HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResultCache:
+    """LRU cache of encoded responses, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 2 ** 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        size = len(entry[1])
+        # A response larger than the whole budget is served but not kept
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.nbytes -= len(self._entries.pop(key)[1])
+        self._entries[key] = entry
+        self.nbytes += size
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= len(evicted[1])
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# --- endpoints ----------------------------------------------------------------
+# Each takes (cube, params) with params a dict of name -> list of strings and
+# returns (content type, body bytes).
+
+def _one(params, name, default=None, type=str):
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        return type(values[-1])
+    except ValueError:
+        raise RequestError(400, f"invalid {name}: {values[-1]!r}") from None
+
+
+def _bounded(params, name, default, low, high, type=int):
+    value = _one(params, name, default, type)
+    if value is not None and not low <= value <= high:
+        raise RequestError(400, f"{name} must be between {low} and {high}, got {value}")
+    return value
+
+
+def _json(obj):
+    """``obj`` as JSON bytes; pandas objects use the "split" layout, NaN becomes null."""
+    if hasattr(obj, "to_json"):
+        return JSON, obj.to_json(orient="split").encode()
+    return JSON, json.dumps(obj).encode()
+
+
+def _year(cube, params, default=None):
+    year = _one(params, "year", default)
+    if year is not None and year not in cube.year_index:
+        raise RequestError(404, f"unknown year {year!r}")
+    return year
+
+
+def _sectors(cube, params, default=None):
+    names = params.get("sector") or default
+    return None if names is None else cube.resolve(names)
+
+
+def top_endpoint(cube, params, ranks=None):
+    """``ranks`` is a ``RankIndex`` of ``cube`` to reuse (the server keeps one per data version)."""
+    n = _bounded(params, "n", 10, 1, len(cube.sectors))
+    year = _year(cube, params)
+    if year is None:
+        top = cube.sector_totals().sort_values(ascending=False, kind="stable").head(n)
+    else:
+        if ranks is None:
+            from .ranking import RankIndex
+
+            ranks = RankIndex(cube)
+        top = ranks.top(year, k=n)
+    return _json(top)
+
+
+def totals_endpoint(cube, params):
+    by = _one(params, "by", "year")
+    if by not in ("year", "sector"):
+        raise RequestError(400, "by must be 'year' or 'sector'")
+    return _json(cube.year_totals() if by == "year" else cube.sector_totals())
+
+
+def shares_endpoint(cube, params):
+    from .charts import SELECTED_SECTORS
+
+    year = _year(cube, params, "2010-11")
+    values = cube.select(_sectors(cube, params, SELECTED_SECTORS)).year_series(year)
+    total = values.sum()
+    frame = values.to_frame("FDI")
+    frame["share"] = values / total if total else float("nan")
+    return _json(frame)
+
+
+def quantiles_endpoint(cube, params):
+    from .quantiles import DEFAULT_Q, panel_quantiles
+
+    level = _one(params, "level", "overall")
+    try:
+        q = tuple(float(value) for value in params.get("q", DEFAULT_Q))
+    except ValueError:
+        raise RequestError(400, f"invalid q: {params['q']}") from None
+    if not all(0.0 <= value <= 1.0 for value in q):
+        raise RequestError(400, "q must lie in [0, 1]")
+    quantiles = panel_quantiles(cube, q)
+    try:
+        frame = quantiles._level(level)
+    except ValueError as exc:
+        raise RequestError(400, str(exc)) from None
+    return _json(frame)
+
+
+def forecast_endpoint(cube, params):
+    from .forecast import MAX_HORIZON, MAX_N_BOOT, MODELS, forecast_cube
+
+    horizon = _bounded(params, "horizon", 7, 1, MAX_HORIZON)
+    n_boot = _bounded(params, "n_boot", 1000, 1, MAX_N_BOOT)
+    level = _one(params, "level", None, float)
+    if level is not None and not 0.0 < level < 1.0:
+        raise RequestError(400, f"level must lie strictly between 0 and 1, got {level}")
+    model = _one(params, "model", "linear")
+    if model not in MODELS:
+        raise RequestError(400, f"model must be one of {list(MODELS)}")
+    sectors = _sectors(cube, params)
+    if sectors is not None:
+        cube = cube.select(sectors)
+    trend = forecast_cube(cube, horizon=horizon, model=model, level=level, n_boot=n_boot,
+                          seed=_one(params, "seed", 0, int))
+    stats = _one(params, "stats", "0") not in ("0", "false", "no")
+    if level is not None:
+        frame = trend.interval_frame(stats=stats)
+    else:
+        frame = trend.forecast_frame()
+        if stats:
+            frame = frame.join(trend.stats_frame())
+    return _json(frame)
+
+
+# pyplot keeps global state, so figures are drawn one at a time
+_plot_lock = threading.Lock()
+
+
+def chart_endpoint(cube, params, name):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from .render import CHARTS, draw_chart
+
+    if name not in CHARTS:
+        raise RequestError(404, f"unknown chart {name!r}; expected one of {list(CHARTS)}")
+    dpi = _bounded(params, "dpi", 100, 10, 300)
+    buffer = io.BytesIO()
+    with _plot_lock:
+        fig = draw_chart(name, cube)
+        try:
+            fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+        finally:
+            plt.close(fig)
+    return PNG, buffer.getvalue()
+
+
+ENDPOINTS = {
+    "top": top_endpoint,
+    "totals": totals_endpoint,
+    "shares": shares_endpoint,
+    "quantiles": quantiles_endpoint,
+    "forecast": forecast_endpoint,
+}
+
+
+class AnalyticsServer:
+    """Serves the endpoints above for one FDI CSV file."""
+
+    def __init__(self, data_path, max_entries=256, max_bytes=64 * 2 ** 20, workers=None):
+        self.data_path = os.path.abspath(data_path)
+        self.cache = ResultCache(max_entries, max_bytes)
+        self.version = 0
+        self.shared = 0
+        self._cube = None
+        self._stamp = None
+        # RankIndex of the current cube, built on the first /top?year= query
+        self._ranks = None
+        self._ranks_lock = threading.Lock()
+        self._inflight = {}
+        self._reload_lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fdi-server")
+
+    # --- data -----------------------------------------------------------------
+
+    def _file_stamp(self):
+        st = os.stat(self.data_path)
+        return st.st_size, st.st_mtime_ns
+
+    async def cube(self):
+        """The current panel, reloaded (and the cache cleared) when the file has changed."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            async with self._reload_lock:
+                if stamp != self._stamp:
+                    loop = asyncio.get_running_loop()
+                    frame = await loop.run_in_executor(self._executor, load_fdi_data, self.data_path)
+                    self._cube = FDICube.from_frame(frame)
+                    self._ranks = None
+                    self._stamp = stamp
+                    self.version += 1
+                    self.cache.clear()
+        return self._cube
+
+    # --- results --------------------------------------------------------------
+
+    def rank_index(self, cube):
+        """The ``RankIndex`` of ``cube``, argsorted once per data version."""
+        from .ranking import RankIndex
+
+        with self._ranks_lock:
+            if self._ranks is None or self._ranks[0] is not cube:
+                self._ranks = (cube, RankIndex(cube))
+            return self._ranks[1]
+
+    def _compute(self, cube, endpoint, params):
+        if endpoint.startswith("chart/"):
+            return chart_endpoint(cube, params, endpoint.removeprefix("chart/").removesuffix(".png"))
+        if endpoint == "top" and params.get("year"):
+            return top_endpoint(cube, params, ranks=self.rank_index(cube))
+        function = ENDPOINTS.get(endpoint)
+        if function is None:
+            raise RequestError(404, f"no endpoint /{endpoint}")
+        return function(cube, params)
+
+    async def result(self, endpoint, params):
+        """(content type, body) for one query, from the cache, an in-flight computation or a new one."""
+        cube = await self.cube()
+        key = (self.version, endpoint, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            # shield: one client disconnecting must not cancel the others' result
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._compute, cube, endpoint, params)
+        self._inflight[key] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        # A result computed from data replaced meanwhile is served but not cached
+        if key[0] == self.version:
+            self.cache.put(key, result)
+        return result
+
+    def status(self):
+        return {
+            "data_path": self.data_path,
+            "version": self.version,
+            "sectors": None if self._cube is None else len(self._cube.sectors),
+            "years": None if self._cube is None else len(self._cube.years),
+            "in_flight": len(self._inflight),
+            "shared": self.shared,
+            "cache": self.cache.stats(),
+        }
+
+    # --- HTTP -----------------------------------------------------------------
+
+    async def respond(self, method, target):
+        """(status, content type, body) for one request line."""
+        if method not in ("GET", "HEAD"):
+            return 405, JSON, json.dumps({"error": f"method {method} not allowed"}).encode()
+        url = urlsplit(target)
+        endpoint = unquote(url.path).strip("/")
+        params = parse_qs(url.query)
+        try:
+            if endpoint == "status":
+                await self.cube()
+                return (200, *_json(self.status()))
+            return (200, *await self.result(endpoint, params))
+        except RequestError as exc:
+            status, message = exc.status, str(exc)
+        except KeyError as exc:
+            # Unknown or ambiguous sector names
+            status, message = 404, str(exc)
+        except ValueError as exc:
+            status, message = 400, str(exc)
+        except Exception as exc:  # noqa: BLE001 - report, keep serving
+            status, message = 500, f"{type(exc).__name__}: {exc}"
+        return status, JSON, json.dumps({"error": message}).encode()
+
+    async def handle(self, reader, writer):
+        """Serve one connection (HTTP/1.1 keep-alive, GET/HEAD only)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if len(parts) != 3:
+                    status, content_type, body = 400, JSON, b'{"error": "malformed request line"}'
+                    parts = ["GET", "/", "HTTP/1.0"]
+                else:
+                    status, content_type, body = await self.respond(parts[0].upper(), parts[1])
+                keep_alive = parts[2] == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                head = (
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1"))
+                if parts[0].upper() != "HEAD":
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8050):
+        """Load the data and start listening; returns the ``asyncio.Server``."""
+        await self.cube()
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(data_path, host="127.0.0.1", port=8050, max_entries=256, max_bytes=64 * 2 ** 20, workers=None, log=print):
+    """Run the server until interrupted."""
+
+    async def run():
+        server = AnalyticsServer(data_path, max_entries=max_entries, max_bytes=max_bytes, workers=workers)
+        listener = await server.start(host, port)
+        if log:
+            address = listener.sockets[0].getsockname()
+            log(f"Serving {server.data_path} on http://{address[0]}:{address[1]}/")
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
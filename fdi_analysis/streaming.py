@@ -0,0 +1,152 @@
+"""Bounded-memory, single-pass statistics over large sector x year CSVs.
+
+``StreamingStats`` consumes the panel chunk by chunk: either frames from
+``pd.read_csv(..., chunksize=...)`` or batches collected from a generator of
+(sector, values) rows. In one pass it produces what the opening notebook
+cells compute on the in-memory frame: yearly totals, sector totals, the top-N
+sectors, null counts and ``describe()``-style statistics.
+
+Memory grows with the number of year columns and distinct sectors, but not
+with the number of rows. Means and variances are merged per chunk with the
+parallel (Chan et al.) update, so they match the in-memory results to
+floating-point rounding. The describe quartiles come from per-year KLL
+sketches; they are exact while a column has at most ``k`` values and
+approximate (about 1% rank error) beyond that.
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from .quantiles import KLLSketch
+
+DESCRIBE_Q = (0.25, 0.5, 0.75)
+
+
+@dataclass
+class StreamSummary:
+    """Result of one streaming pass; the fields mirror the in-memory cells."""
+
+    rows: int
+    year_totals: pd.Series
+    sector_totals: pd.Series
+    top_sectors: pd.Series
+    null_counts: pd.Series
+    describe: pd.DataFrame
+
+
+class StreamingStats:
+    """Running per-year moments, sector totals and quartile sketches."""
+
+    def __init__(self, years, top_n=10, k=200, seed=0):
+        self.years = list(years)
+        self.top_n = top_n
+        n = len(self.years)
+        self.rows = 0
+        self.sector_nulls = 0
+        self.count = np.zeros(n, dtype=np.int64)
+        self.total = np.zeros(n)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.min = np.full(n, np.inf)
+        self.max = np.full(n, -np.inf)
+        self.sketches = [KLLSketch(k, seed + j) for j in range(n)]
+        self._sector_totals = {}
+
+    def update(self, sectors, rows):
+        """Fold one chunk of rows (``sectors`` labels, ``rows`` an (n, n_years) array)."""
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(self.years))
+        sectors = pd.Series(sectors, dtype=object)
+        if len(sectors) != len(rows):
+            raise ValueError("sectors and rows must have the same length")
+        if len(rows) == 0:
+            return self
+        self.rows += len(rows)
+        self.sector_nulls += int(sectors.isna().sum())
+
+        valid = ~np.isnan(rows)
+        count = valid.sum(axis=0)
+        total = np.where(valid, rows, 0.0).sum(axis=0)
+        has = count > 0
+        mean = np.divide(total, count, out=np.zeros_like(total), where=has)
+        m2 = np.where(valid, (rows - mean) ** 2, 0.0).sum(axis=0)
+
+        merged = self.count + count
+        delta = mean - self.mean
+        safe = np.maximum(merged, 1)
+        self.mean = self.mean + delta * count / safe
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / safe
+        self.count = merged
+        self.total += total
+        self.min = np.minimum(self.min, np.where(valid, rows, np.inf).min(axis=0))
+        self.max = np.maximum(self.max, np.where(valid, rows, -np.inf).max(axis=0))
+        for j, sketch in enumerate(self.sketches):
+            sketch.update(rows[:, j])
+
+        # Sectors may repeat across chunks (e.g. one row per country), so sum by label
+        row_totals = pd.Series(np.where(valid, rows, 0.0).sum(axis=1), index=sectors.fillna("<missing>"))
+        for sector, value in row_totals.groupby(level=0, sort=False).sum().items():
+            self._sector_totals[sector] = self._sector_totals.get(sector, 0.0) + value
+        return self
+
+    def update_rows(self, rows, batch_size=10_000):
+        """Fold an iterable of (sector, values) rows, ``batch_size`` at a time."""
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return self
+            sectors, values = zip(*batch)
+            self.update(list(sectors), np.array(values, dtype=np.float64))
+
+    def result(self):
+        """The ``StreamSummary`` of everything folded so far."""
+        years = pd.Index(self.years)
+        has = self.count > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        std[self.count < 2] = np.nan
+        quartiles = np.array([
+            sketch.quantile(list(DESCRIBE_Q)) if n else np.full(len(DESCRIBE_Q), np.nan)
+            for sketch, n in zip(self.sketches, self.count)
+        ]).reshape(len(self.years), len(DESCRIBE_Q))
+        describe = pd.DataFrame(
+            np.vstack([
+                self.count,
+                np.where(has, self.mean, np.nan),
+                std,
+                np.where(has, self.min, np.nan),
+                quartiles.T,
+                np.where(has, self.max, np.nan),
+            ]),
+            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+            columns=years,
+        )
+        sector_totals = pd.Series(self._sector_totals, dtype=np.float64, name="FDI")
+        null_counts = pd.concat([
+            pd.Series({"Sector": self.sector_nulls}),
+            pd.Series(self.rows - self.count, index=years),
+        ])
+        return StreamSummary(
+            rows=self.rows,
+            year_totals=pd.Series(self.total, index=years, name="FDI"),
+            sector_totals=sector_totals,
+            top_sectors=sector_totals.sort_values(ascending=False, kind="stable").head(self.top_n),
+            null_counts=null_counts,
+            describe=describe,
+        )
+
+
+def stream_summary(path, chunksize=100_000, top_n=10, k=200, sector_column="Sector"):
+    """One-pass ``StreamSummary`` of a sector x year CSV read in chunks."""
+    stats = None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        years = [c for c in chunk.columns if c != sector_column]
+        if stats is None:
+            stats = StreamingStats(years, top_n=top_n, k=k)
+        stats.update(chunk[sector_column].tolist(), chunk[years].to_numpy(dtype=np.float64))
+    if stats is None:
+        raise ValueError(f"{path} has no rows")
+    return stats.result()
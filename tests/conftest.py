@@ -0,0 +1,21 @@
+import os
+import shutil
+
+import pytest
+
+from fdi_analysis import FDICube, load_fdi_data
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "FDI data.csv")
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    """A private copy of the FDI CSV, so sidecar caches land in ``tmp_path``."""
+    path = tmp_path / "FDI data.csv"
+    shutil.copyfile(DATA, path)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def cube():
+    return FDICube.from_frame(load_fdi_data(DATA, use_cache=False))
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis import FDICube, load_fdi_data
+from fdi_analysis.aggregates import AggregateStore, aggregates_path, refresh_aggregates
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    """Counts full rebuilds done by ``refresh_aggregates``."""
+    calls = []
+    from_cube = AggregateStore.from_cube.__func__
+
+    def counting(cls, cube):
+        calls.append(cube.shape)
+        return from_cube(cls, cube)
+
+    monkeypatch.setattr(AggregateStore, "from_cube", classmethod(counting))
+    return calls
+
+
+def refresh(path):
+    cube = FDICube.from_frame(load_fdi_data(path))
+    return cube, refresh_aggregates(path, cube)
+
+
+def assert_matches(store, cube):
+    assert store.sectors == cube.sectors and store.years == cube.years
+    np.testing.assert_allclose(store.yearly_totals().to_numpy(), np.nansum(cube.values, axis=0))
+    np.testing.assert_allclose(store.sector_totals().to_numpy(), np.nansum(cube.values, axis=1))
+    np.testing.assert_allclose(store.year_medians().to_numpy(), np.nanmedian(cube.values, axis=0))
+    assert store.total() == pytest.approx(np.nansum(cube.values))
+    assert store.median() == pytest.approx(np.nanmedian(cube.values))
+
+
+def test_unchanged_file_reuses_saved_store(data_path, rebuilds):
+    refresh(data_path)
+    cube, store = refresh(data_path)
+    assert len(rebuilds) == 1
+    assert_matches(store, cube)
+
+
+def test_appended_year_is_folded_in(data_path, rebuilds):
+    frame = pd.read_csv(data_path)
+    frame.iloc[:, :-1].to_csv(data_path, index=False)
+    refresh(data_path)
+
+    frame.to_csv(data_path, index=False)
+    cube, store = refresh(data_path)
+    assert len(rebuilds) == 1
+    assert_matches(store, cube)
+    assert_matches(AggregateStore.load(aggregates_path(data_path)), cube)
+
+
+def test_appended_sectors_are_folded_in(data_path, rebuilds):
+    frame = pd.read_csv(data_path)
+    frame.iloc[:-3].to_csv(data_path, index=False)
+    refresh(data_path)
+
+    frame.to_csv(data_path, index=False)
+    cube, store = refresh(data_path)
+    assert len(rebuilds) == 1
+    assert_matches(store, cube)
+
+
+def test_edited_cell_rebuilds(data_path, rebuilds):
+    cube, store = refresh(data_path)
+    total = store.total()
+
+    frame = pd.read_csv(data_path)
+    frame.iloc[0, 1] += 1000.0
+    frame.to_csv(data_path, index=False)
+    cube, store = refresh(data_path)
+    assert len(rebuilds) == 2
+    assert store.total() == pytest.approx(total + 1000.0)
+    assert_matches(store, cube)
+
+
+def test_edit_and_append_rebuilds(data_path, rebuilds):
+    frame = pd.read_csv(data_path)
+    frame.iloc[:, :-1].to_csv(data_path, index=False)
+    refresh(data_path)
+
+    frame.iloc[5, 3] = 0.0
+    frame.to_csv(data_path, index=False)
+    cube, store = refresh(data_path)
+    assert len(rebuilds) == 2
+    assert_matches(store, cube)
+
+
+def test_from_cube_matches_year_by_year_appends(cube):
+    built = AggregateStore.from_cube(cube)
+    appended = AggregateStore(sectors=cube.sectors)
+    for year in cube.years:
+        appended.append_year(year, cube.year(year))
+    np.testing.assert_allclose(built.year_totals, appended.year_totals)
+    np.testing.assert_allclose(built.sector_sums, appended.sector_sums)
+    np.testing.assert_array_equal(built.all_sorted, appended.all_sorted)
+    for ours, theirs in zip(built.year_sorted, appended.year_sorted):
+        np.testing.assert_array_equal(ours, theirs)
+    assert built.year_digests == appended.year_digests
+
+
+def test_edit_inside_appended_sectors_rebuilds(data_path, rebuilds):
+    frame = pd.read_csv(data_path)
+    frame.iloc[:-3].to_csv(data_path, index=False)
+    refresh(data_path)
+    frame.to_csv(data_path, index=False)
+    refresh(data_path)
+
+    frame.iloc[-1, 2] += 7.0
+    frame.to_csv(data_path, index=False)
+    cube, store = refresh(data_path)
+    assert len(rebuilds) == 2
+    assert_matches(store, cube)
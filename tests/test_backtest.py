@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from fdi_analysis import backtest_cube
+from fdi_analysis.backtest import backtest
+
+
+@pytest.mark.parametrize("model, degree, window", [("linear", 1, None), ("quadratic", 2, None),
+                                                   ("linear", 1, 6)])
+def test_backtest_matches_loop(cube, model, degree, window):
+    horizon, min_train = 3, 5
+    result = backtest_cube(cube, model=model, horizon=horizon, min_train=min_train, window=window)
+    n_years = len(cube.years)
+    t = np.arange(n_years + horizon, dtype=np.float64)
+    for i, c in enumerate(result.cutoffs):
+        start = 0 if window is None else c - window
+        for s, row in enumerate(cube.values[:10]):
+            coef = np.polyfit(t[start:c], row[start:c], degree)
+            np.testing.assert_allclose(result.predictions[i, s], np.polyval(coef, t[c:c + horizon]),
+                                       rtol=1e-7, atol=1e-5)
+    padded = np.concatenate([cube.values, np.full((len(cube.sectors), horizon), np.nan)], axis=1)
+    errors = np.stack([np.abs(result.predictions[i] - padded[:, c:c + horizon])
+                       for i, c in enumerate(result.cutoffs)])
+    np.testing.assert_allclose(result.mae, np.nanmean(errors, axis=0))
+
+
+def test_backtest_rejects_short_series():
+    with pytest.raises(ValueError):
+        backtest(np.ones((2, 5)), min_train=5)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis import bench
+
+
+def test_synthetic_panel_shape_and_zero_runs():
+    values, sectors, years = bench.synthetic_panel(500, 17, seed=1, zero_run_rate=0.5)
+    assert values.shape == (500, 17)
+    assert len(set(sectors)) == 500 and years[0] == "2000-01" and years[-1] == "2016-17"
+    assert (values >= 0).all()
+    with_zeros = (values == 0).any(axis=1).mean()
+    assert 0.3 < with_zeros < 0.7
+    np.testing.assert_array_equal(values, bench.synthetic_panel(500, 17, seed=1, zero_run_rate=0.5)[0])
+
+
+def test_written_csv_is_readable_in_chunks(tmp_path):
+    path = bench.write_panel_csv(str(tmp_path / "panel.csv"), 250, 5, chunk_rows=100)
+    frame = pd.read_csv(path)
+    assert frame.shape == (250, 6)
+    assert frame["Sector"].is_unique
+    assert list(frame.columns[1:]) == ["2000-01", "2001-02", "2002-03", "2003-04", "2004-05"]
+
+
+def test_run_and_compare(tmp_path):
+    stages = ["year_totals", "quantiles"]
+    run = bench.run_benchmarks(["40x6"], stages=stages, repeat=2, workdir=str(tmp_path))
+    frame = bench.results_frame(run)
+    assert list(frame.index.get_level_values("stage")) == stages
+    assert (frame["repeat"] == 2).all() and (frame["peak_bytes"] > 0).all()
+    table = bench.compare(run, run)
+    np.testing.assert_allclose(table["time_ratio"], 1.0)
+
+
+def test_stage_names_are_unique_and_checked():
+    names = bench.stage_names()
+    assert len(names) == len(set(names))
+    with pytest.raises(ValueError):
+        bench.run_benchmarks(["10x5"], stages=["no_such_stage"])
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from fdi_analysis import forecast_cube
+from fdi_analysis.forecast import MAX_HORIZON, MAX_N_BOOT, bootstrap_bands, design_matrix, fit_trends
+
+
+def test_same_seed_gives_same_bands(cube):
+    first = forecast_cube(cube, horizon=5, level=0.9, n_boot=200, seed=3)
+    second = forecast_cube(cube, horizon=5, level=0.9, n_boot=200, seed=3)
+    np.testing.assert_array_equal(first.lower, second.lower)
+    np.testing.assert_array_equal(first.upper, second.upper)
+
+    other = forecast_cube(cube, horizon=5, level=0.9, n_boot=200, seed=4)
+    assert not np.array_equal(first.lower, other.lower)
+
+
+def test_bands_bracket_the_point_forecast(cube):
+    trend = forecast_cube(cube, horizon=5, model="loglinear", level=0.9, n_boot=200)
+    assert (trend.lower <= trend.forecast + 1e-9).all()
+    assert (trend.forecast <= trend.upper + 1e-9).all()
+    # Bands widen with the horizon on average
+    width = (trend.upper - trend.lower).mean(axis=0)
+    assert width[-1] > width[0]
+
+
+def test_chunked_bands_are_reproducible():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=(7, 12))
+    X = design_matrix(np.arange(12))
+    future = design_matrix(np.arange(12, 15))
+    coef = np.linalg.lstsq(X, y.T, rcond=None)[0].T
+    # Chunks far smaller than one series' paths: both axes are split
+    small = bootstrap_bands(y, X, future, coef, "linear", n_boot=300, seed=1, chunk_bytes=4096)
+    again = bootstrap_bands(y, X, future, coef, "linear", n_boot=300, seed=1, chunk_bytes=4096)
+    whole = bootstrap_bands(y, X, future, coef, "linear", n_boot=300, seed=1)
+    np.testing.assert_array_equal(small[0], again[0])
+    np.testing.assert_array_equal(small[1], again[1])
+    # Different draws, same distribution
+    np.testing.assert_allclose(small[1] - small[0], whole[1] - whole[0], rtol=0.3)
+
+
+def test_coverage_is_close_to_nominal():
+    rng = np.random.default_rng(42)
+    n_series, n_years, horizon, sigma = 2000, 17, 3, 1.5
+    t = np.arange(n_years + horizon, dtype=np.float64)
+    intercept = rng.uniform(-10, 10, size=(n_series, 1))
+    slope = rng.uniform(-2, 2, size=(n_series, 1))
+    truth = intercept + slope * t + rng.normal(scale=sigma, size=(n_series, len(t)))
+
+    trend = fit_trends(truth[:, :n_years], horizon=horizon, level=0.9, n_boot=400, seed=0)
+    actual = truth[:, n_years:]
+    coverage = ((trend.lower <= actual) & (actual <= trend.upper)).mean()
+    assert coverage == pytest.approx(0.9, abs=0.04)
+
+
+@pytest.mark.parametrize("n_boot", [0, -5, MAX_N_BOOT + 1, 10.0])
+def test_rejects_bad_n_boot(n_boot):
+    with pytest.raises(ValueError):
+        fit_trends(np.arange(10.0)[None, :], level=0.9, n_boot=n_boot)
+
+
+@pytest.mark.parametrize("level", [0.0, 1.0, 1.5])
+def test_rejects_bad_level(level):
+    with pytest.raises(ValueError):
+        fit_trends(np.arange(10.0)[None, :], level=level)
+
+
+@pytest.mark.parametrize("horizon", [0, -1, MAX_HORIZON + 1, 2.5])
+def test_fit_trends_rejects_bad_horizon(horizon):
+    with pytest.raises(ValueError):
+        fit_trends(np.ones((2, 5)), horizon=horizon)
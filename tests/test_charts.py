@@ -0,0 +1,51 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from fdi_analysis import FDICube, charts
+from fdi_analysis.render import CHARTS, draw_chart
+
+YEARS = ["2000-01", "2001-02", "2002-03"]
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+@pytest.mark.parametrize("name", sorted(CHARTS))
+def test_every_chart_draws(cube, name):
+    fig = draw_chart(name, cube)
+    assert fig.axes
+
+
+@pytest.mark.parametrize("values", [np.full((3, 3), np.nan), np.zeros((0, 3))])
+@pytest.mark.parametrize("scale", ["linear", "log", "quantile"])
+def test_heatmap_of_empty_or_missing_panel(values, scale):
+    cube = FDICube(values, [f"s{i}" for i in range(len(values))], YEARS)
+    charts.panel_heatmap(cube, order="cluster", scale=scale)
+
+
+def test_cluster_order_puts_similar_rows_together():
+    rng = np.random.default_rng(0)
+    low = rng.uniform(1, 2, size=(5, 4))
+    high = rng.uniform(1000, 2000, size=(5, 4))
+    order = charts._cluster_order(np.vstack([low, high, low + 0.5]))
+    groups = [0 if i < 5 or i >= 10 else 1 for i in order]
+    # One contiguous run per cluster
+    assert sum(a != b for a, b in zip(groups, groups[1:])) == 1
+
+
+def test_cluster_order_falls_back_to_totals_for_large_panels():
+    values = np.random.default_rng(1).uniform(size=(charts.CLUSTER_MAX_ROWS + 1, 3))
+    order = charts._cluster_order(values)
+    totals = values.sum(axis=1)[order]
+    assert (np.diff(totals) <= 0).all()
+
+
+def test_heatmap_rows_follow_total_order(cube):
+    fig = charts.panel_heatmap(cube, order="total", annotate=False)
+    image = fig.axes[0].images[0].get_array()
+    totals = np.nansum(np.asarray(image.filled(np.nan)), axis=1)
+    assert (np.diff(totals) <= 1e-9).all()
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis.cli import main
+from fdi_analysis.forecast import MAX_HORIZON, MAX_N_BOOT
+
+
+@pytest.mark.parametrize("args", [
+    ["stats", "--top", "0"],
+    ["stats", "--top", "-3"],
+    ["stats", "--chunksize", "0"],
+    ["forecast", "--horizon", "0"],
+    ["forecast", "--horizon", str(MAX_HORIZON + 1)],
+    ["forecast", "--n-boot", str(MAX_N_BOOT + 1)],
+    ["forecast", "--model", "cubic"],
+])
+def test_bad_arguments_exit_with_usage_error(data_path, args, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(args[:1] + ["--input", data_path] + args[1:])
+    assert exc.value.code == 2
+    assert "error" in capsys.readouterr().err
+
+
+def test_missing_input_and_unknown_sector_exit_with_message(data_path, tmp_path):
+    with pytest.raises(SystemExit) as exc:
+        main(["stats", "--input", str(tmp_path / "missing.csv")])
+    assert "no such file" in str(exc.value.code)
+    with pytest.raises(SystemExit) as exc:
+        main(["forecast", "--input", data_path, "--sectors", "no such sector"])
+    assert "forecast" in str(exc.value.code)
+
+
+def test_stats_top_sectors_match_pandas(data_path, tmp_path):
+    output = tmp_path / "stats.csv"
+    main(["stats", "--input", data_path, "--top", "3", "--section", "top_sectors", "--format", "csv",
+          "--output", str(output)])
+    frame = pd.read_csv(output)
+    expected = pd.read_csv(data_path).set_index("Sector").sum(axis=1).sort_values(ascending=False).head(3)
+    assert frame["row"].tolist() == expected.index.tolist()
+    np.testing.assert_allclose(frame["value"], expected.to_numpy())
+
+
+def test_forecast_json(data_path, tmp_path):
+    output = tmp_path / "forecast.json"
+    main(["forecast", "--input", data_path, "--horizon", "3", "--sectors", "mining", "--format", "json",
+          "--output", str(output)])
+    body = json.loads(output.read_text())
+    assert body["index"] == ["MINING"]
+    assert body["columns"] == ["2017-18", "2018-19", "2019-20"]
+
+
+def test_stats_never_imports_plotting(data_path):
+    code = ("import sys; from fdi_analysis.cli import main; "
+            f"main(['stats', '--input', {data_path!r}, '--section', 'describe']); "
+            "print(sorted(m for m in ('matplotlib', 'seaborn') if m in sys.modules))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
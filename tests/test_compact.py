@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis import FDICube
+from fdi_analysis.compact import memory_report, to_compact
+
+YEARS = ["2000-01", "2001-02"]
+
+
+@pytest.mark.parametrize("mode", ["float32", "scaled"])
+def test_round_trip_stays_within_half_a_cent(cube, mode):
+    compact = to_compact(cube, mode=mode)
+    assert compact.max_error <= 0.005
+    np.testing.assert_allclose(compact.values, cube.values, rtol=0, atol=0.005)
+    assert compact.nbytes < cube.values.nbytes
+    assert compact.to_cube().sectors == list(cube.sectors)
+
+
+def test_long_frame_matches_the_melted_frame(cube):
+    compact = to_compact(cube, mode="float32")
+    frame = pd.DataFrame(cube.values, index=pd.Index(cube.sectors, name="Sector"), columns=cube.years)
+    melted = frame.T.reset_index(names="Year").melt(id_vars="Year", var_name="Sector", value_name="FDI")
+    long = compact.long_frame().astype({"Year": str, "Sector": str})
+    merged = long.merge(melted, on=["Year", "Sector"], suffixes=("", "_old"))
+    assert len(merged) == len(melted) == len(long)
+    np.testing.assert_allclose(merged["FDI"], merged["FDI_old"], atol=0.005)
+
+
+def test_precision_loss_is_refused():
+    cube = FDICube(np.array([[123456789.01, 1.0]]), ["a"], YEARS)
+    with pytest.raises(ValueError, match="loses precision"):
+        to_compact(cube, mode="float32")
+    assert to_compact(cube, mode="scaled").store.dtype == np.int64
+
+
+def test_missing_values_need_float32():
+    cube = FDICube(np.array([[np.nan, 1.25]]), ["a"], YEARS)
+    with pytest.raises(ValueError, match="missing"):
+        to_compact(cube, mode="scaled")
+    assert np.isnan(to_compact(cube).values[0, 0])
+
+
+def test_memory_report_measures_the_frames(cube):
+    frame = pd.DataFrame(cube.values, columns=cube.years)
+    frame.insert(0, "Sector", pd.Series(cube.sectors, dtype=object))
+    report = memory_report(cube, frame)
+    assert report.loc["csv frame", "bytes"] == frame.memory_usage(deep=True).sum()
+    assert report.loc["compact values (float32, float32)", "bytes"] == cube.values.size * 4
+    assert report["bytes"].is_monotonic_decreasing
+    assert report.loc["compact long frame (float32)", "vs melted"] < 0.2
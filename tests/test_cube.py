@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis import FDICube
+
+
+def test_views_match_the_notebook_reshapes(cube):
+    frame = pd.DataFrame(cube.values, columns=cube.years)
+    frame.insert(0, "Sector", cube.sectors)
+    # The old transpose-then-melt chain
+    melted = frame.set_index("Sector").T.reset_index().melt(id_vars="index", var_name="Sector", value_name="FDI")
+    melted = melted.rename(columns={"index": "Year"})
+    wide = melted.pivot(index="Year", columns="Sector", values="FDI")
+    pd.testing.assert_frame_equal(cube.wide.loc[wide.index, wide.columns], wide, check_names=False)
+
+    long = cube.long
+    assert len(long) == cube.values.size
+    merged = long.astype({"Year": str, "Sector": str}).merge(melted, on=["Year", "Sector"])
+    np.testing.assert_array_equal(merged["FDI_x"], merged["FDI_y"])
+
+
+def test_totals_and_slices(cube):
+    np.testing.assert_allclose(cube.year_totals().to_numpy(), cube.values.sum(axis=0))
+    np.testing.assert_allclose(cube.sector_totals().to_numpy(), cube.values.sum(axis=1))
+    assert cube.cell("MINING", "2003-04") == cube.sector("MINING")[cube.year_index["2003-04"]]
+    sub = cube.select(["MINING", "METALLURGICAL INDUSTRIES"])
+    assert sub.sectors == ["MINING", "METALLURGICAL INDUSTRIES"]
+    np.testing.assert_array_equal(sub.values[0], cube.sector("MINING"))
+
+
+def test_rejects_mismatched_shapes():
+    with pytest.raises(ValueError):
+        FDICube(np.zeros((2, 3)), ["a", "b"], ["2000-01", "2001-02"])
+    with pytest.raises(ValueError):
+        FDICube(np.zeros((2, 2)), ["a", "a"], ["2000-01", "2001-02"])
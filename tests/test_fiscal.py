@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis.fiscal import FiscalYearIndex, fiscal_year_label, parse_fiscal_year
+
+
+@pytest.mark.parametrize("label, start", [("2000-01", 2000), ("1999-00", 1999), (" 2009 / 2010 ", 2009)])
+def test_parse_fiscal_year(label, start):
+    assert parse_fiscal_year(label) == start
+
+
+@pytest.mark.parametrize("label", ["2000-02", "2000", "Jan-2000", "2000-2002"])
+def test_bad_labels_are_rejected(label):
+    with pytest.raises(ValueError):
+        parse_fiscal_year(label)
+
+
+def test_labels_round_trip_through_the_data(cube):
+    index = FiscalYearIndex.parse(cube.years)
+    assert index.labels() == list(cube.years)
+    assert index.is_contiguous()
+    assert [fiscal_year_label(y) for y in index.start_years] == list(cube.years)
+
+
+def test_steps_and_extend_match_timestamps(cube):
+    index = FiscalYearIndex.parse(cube.years)
+    stamps = index.to_timestamps()
+    # 1 April of each start year, as pandas parses it from the label's first part
+    expected = pd.to_datetime([f"{label[:4]}-04-01" for label in cube.years])
+    pd.testing.assert_index_equal(stamps, pd.DatetimeIndex(expected))
+    np.testing.assert_array_equal(index.steps(), (stamps.year - stamps.year[0]).to_numpy(dtype=float))
+
+    future = index.extend(3)
+    assert future.labels() == ["2017-18", "2018-19", "2019-20"]
+    whole = index.append(future)
+    assert whole.is_contiguous() and len(whole) == len(index) + 3
+    assert whole.position("2018-19") == len(index) + 1
+    with pytest.raises(KeyError):
+        index.position("2030-31")
+
+
+def test_periods_end_in_march():
+    periods = FiscalYearIndex.range(2009, 2).to_period_index()
+    assert [str(p) for p in periods] == ["2010", "2011"]
+    assert periods[0].end_time.strftime("%Y-%m-%d") == "2010-03-31"
+    assert periods[0].start_time.strftime("%Y-%m-%d") == "2009-04-01"
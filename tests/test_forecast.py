@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from fdi_analysis import forecast_cube
+from fdi_analysis.forecast import fit_trends
+
+
+def polyfit_reference(values, steps, horizon, degree, log=False):
+    """Sector-by-sector ``np.polyfit``, as the notebook did before batching."""
+    future = steps[-1] + np.arange(1, horizon + 1)
+    fitted, forecast = [], []
+    for row in values:
+        y = np.log1p(row) if log else row
+        coef = np.polyfit(steps, y, degree)
+        fitted.append(np.polyval(coef, steps))
+        forecast.append(np.polyval(coef, future))
+    fitted, forecast = np.array(fitted), np.array(forecast)
+    if log:
+        return np.expm1(fitted), np.expm1(forecast)
+    return fitted, forecast
+
+
+@pytest.mark.parametrize("model, degree, log", [("linear", 1, False), ("quadratic", 2, False),
+                                                ("loglinear", 1, True)])
+def test_forecast_cube_matches_polyfit_loop(cube, model, degree, log):
+    trend = forecast_cube(cube, horizon=7, model=model)
+    steps = cube.fiscal_years.steps()
+    fitted, forecast = polyfit_reference(cube.values, steps, 7, degree, log)
+    np.testing.assert_allclose(trend.fitted, fitted, rtol=1e-8, atol=1e-6)
+    np.testing.assert_allclose(trend.forecast, forecast, rtol=1e-8, atol=1e-6)
+    assert trend.forecast_years[0] == "2017-18" and len(trend.forecast_years) == 7
+
+
+def test_fit_trends_respects_gaps_between_years():
+    steps = np.array([0.0, 1.0, 2.0, 5.0, 6.0])
+    values = np.array([[1.0, 3.0, 5.0, 11.0, 13.0]])
+    trend = fit_trends(values, horizon=2, steps=steps)
+    np.testing.assert_allclose(trend.forecast, [[15.0, 17.0]])
+    np.testing.assert_allclose(trend.r2, [1.0])
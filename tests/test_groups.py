@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from fdi_analysis import SectorHierarchy
+
+LEVELS = {
+    "theme": {"Tech": ["computer software", "telecommunications"], "Metals": ["metallurgical industries", "mining"]},
+    "economy": {"Mixed": ["Tech", "Metals"]},
+}
+
+
+def test_group_totals_match_pandas_groupby(cube):
+    hierarchy = SectorHierarchy(cube, other="Other")
+    frame = cube.wide.T
+    for level in hierarchy.levels:
+        labels = hierarchy.assignments()[level]
+        # The default groups do not overlap, so each sector has one label
+        expected = frame.fillna(0).groupby(labels.to_numpy()).sum()
+        totals = hierarchy.frame(level)
+        np.testing.assert_allclose(totals.loc[expected.index].to_numpy(), expected.to_numpy())
+        np.testing.assert_allclose(totals.sum().to_numpy(), np.nansum(cube.values, axis=0))
+
+
+def test_parents_roll_up_their_children(cube):
+    hierarchy = SectorHierarchy(cube, LEVELS)
+    assert hierarchy.parents == {"theme": "economy"}
+    assert hierarchy.children("economy", "Mixed") == ["Tech", "Metals"]
+    np.testing.assert_allclose(hierarchy.totals("economy")[0], hierarchy.totals("theme").sum(axis=0))
+    assert set(hierarchy.members("economy", "Mixed")) == {name for group in ("Tech", "Metals")
+                                                          for name in hierarchy.members("theme", group)}
+    with pytest.raises(ValueError):
+        hierarchy.children("theme", "Tech")
+
+
+def test_wildcards_and_duplicates_resolve_once(cube):
+    hierarchy = SectorHierarchy(cube, {"theme": {"Construction": ["construction*", "construction development"]}})
+    members = hierarchy.members("theme", "Construction")
+    assert len(members) == len(set(members)) >= 2
+    assert all(name.startswith("CONSTRUCTION") for name in members)
+
+
+def test_bad_roll_ups_are_rejected(cube):
+    with pytest.raises(KeyError):
+        SectorHierarchy(cube, {"theme": LEVELS["theme"], "economy": {"All": ["Tech", "Nope"]}})
+    with pytest.raises(ValueError):
+        SectorHierarchy(cube, {"theme": LEVELS["theme"], "economy": {"A": ["Tech"], "B": ["Tech", "Metals"]}})
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis.growth import GrowthMetrics, cagr, rolling_std, rolling_sum, yoy_growth
+
+
+@pytest.fixture(scope="module")
+def frame(cube):
+    return pd.DataFrame(cube.values, index=pd.Index(cube.sectors, name="Sector"), columns=cube.years)
+
+
+def test_yoy_matches_pct_change_on_positive_baselines(cube, frame):
+    growth = GrowthMetrics(cube).yoy()
+    previous = frame.shift(1, axis=1)
+    expected = (frame - previous) / previous
+    expected = expected.where(previous > 0)
+    pd.testing.assert_frame_equal(growth, expected)
+    assert not np.isinf(growth.to_numpy()).any()
+    pd.testing.assert_frame_equal(GrowthMetrics(cube).yoy(pct=False), frame - previous)
+
+
+def test_cagr_against_a_direct_formula(cube, frame):
+    rates = GrowthMetrics(cube).cagr("2005-06", "2016-17")
+    start, end = frame["2005-06"], frame["2016-17"]
+    expected = ((end / start) ** (1 / 11) - 1).where(start > 0)
+    pd.testing.assert_series_equal(rates, expected, check_names=False)
+    assert rates.name == "CAGR 2005-06 to 2016-17"
+
+
+def test_cagr_edge_cases():
+    np.testing.assert_allclose(cagr([0.0, 100.0, 100.0], [50.0, 0.0, 121.0], 2), [np.nan, -1.0, 0.1])
+    with pytest.raises(ValueError):
+        cagr([1.0], [2.0], 0)
+
+
+@pytest.mark.parametrize("stat", ["sum", "mean", "std"])
+@pytest.mark.parametrize("of", ["values", "growth"])
+def test_rolling_matches_pandas(cube, frame, stat, of):
+    metrics = GrowthMetrics(cube)
+    base = frame if of == "values" else metrics.yoy()
+    expected = getattr(base.T.rolling(3), stat)().T
+    # pandas' online rolling variance leaves ~1e-7 residue on constant windows
+    pd.testing.assert_frame_equal(metrics.rolling(3, stat=stat, of=of), expected, rtol=1e-7, atol=1e-6)
+
+
+def test_nan_blanks_only_the_windows_containing_it():
+    values = np.array([[1.0, 2.0, np.nan, 4.0, 5.0, 6.0]])
+    np.testing.assert_array_equal(rolling_sum(values, 2), [[np.nan, 3.0, np.nan, np.nan, 9.0, 11.0]])
+    assert np.isnan(rolling_std(values, 7)).all()
+    np.testing.assert_array_equal(yoy_growth([[0.0, 5.0, 10.0]]), [[np.nan, np.nan, 1.0]])
+
+
+def test_summary_columns(cube):
+    summary = GrowthMetrics(cube).summary(window=4)
+    assert list(summary.columns) == ["cagr", "median_yoy", "latest_yoy", "rolling_mean_4", "volatility_4"]
+    assert summary.index.tolist() == list(cube.sectors)
@@ -0,0 +1,79 @@
+import json
+import sys
+import tracemalloc
+
+import numpy as np
+
+from fdi_analysis.instrument import Instrument
+
+
+def test_nested_stages_and_report():
+    instrument = Instrument()
+    with instrument.stage("outer"):
+        with instrument.stage("inner", rows=3):
+            sum(range(10_000))
+    report = instrument.report()
+    assert list(report["name"]) == ["outer", "inner"]
+    assert list(report["depth"]) == [0, 1]
+    assert report["wall_s"].iloc[0] >= report["wall_s"].iloc[1] > 0
+    assert report["alloc_peak"].isna().all()
+
+
+def test_cells_close_the_previous_cell():
+    instrument = Instrument()
+    instrument.cell("In[1]")
+    instrument.cell("In[2]")
+    report = instrument.finish()
+    assert list(report["name"]) == ["In[1]", "In[2]"]
+    assert (report["depth"] == 0).all()
+
+
+def test_tracemalloc_runs_only_inside_selected_stages():
+    assert not tracemalloc.is_tracing()
+    instrument = Instrument(trace_memory=["load"])
+    with instrument.stage("load"):
+        assert tracemalloc.is_tracing()
+        with instrument.stage("load parse"):
+            block = np.ones(2 ** 20)
+        del block
+    assert not tracemalloc.is_tracing()
+    with instrument.stage("plot"):
+        assert not tracemalloc.is_tracing()
+    report = instrument.finish().set_index("name")
+    # 8 MB allocated in the nested stage is carried up to its parent
+    assert report.loc["load parse", "alloc_peak"] >= 8 * 2 ** 20
+    assert report.loc["load", "alloc_peak"] >= 8 * 2 ** 20
+    assert np.isnan(report.loc["plot", "alloc_peak"])
+
+
+def test_trace_and_profile_files(tmp_path):
+    output = tmp_path / "trace.json"
+    instrument = Instrument(profile=["In[2]"], output=str(output))
+    instrument.cell("In[1] load")
+    instrument.cell("In[2] forecast")
+    sorted(range(1000))
+    instrument.finish()
+    events = json.loads(output.read_text())["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] == ["In[1] load", "In[2] forecast"]
+    assert "profile" in [e for e in events if e["name"] == "In[2] forecast"][0]["args"]
+    assert len(list(tmp_path.glob("trace.*.prof"))) == 1
+
+
+def test_from_env_and_disabled_instrument():
+    instrument = Instrument.from_env({"FDI_TRACE": "t.json", "FDI_TRACE_MEMORY": "In[3], In[4]",
+                                      "FDI_TRACE_PROFILE": "all"})
+    assert instrument.enabled and instrument.trace_memory == ["In[3]", "In[4]"] and instrument.profile is True
+    disabled = Instrument.from_env({})
+    disabled.cell("In[1]")
+    with disabled.stage("x") as record:
+        assert record is None
+    assert disabled.finish() is None
+
+
+def test_importing_does_not_load_pandas():
+    import subprocess
+
+    code = "import sys, fdi_analysis.instrument; print('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            env={"PYTHONPATH": str(__import__("pathlib").Path(__file__).resolve().parents[1])})
+    assert result.stdout.strip() == "False"
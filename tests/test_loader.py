@@ -0,0 +1,32 @@
+import os
+
+import pandas as pd
+
+from fdi_analysis.loader import cache_paths, clear_cache, load_fdi_data
+
+
+def test_cached_frame_matches_read_csv(data_path):
+    frame = load_fdi_data(data_path)
+    pd.testing.assert_frame_equal(frame, pd.read_csv(data_path))
+    assert all(os.path.exists(path) for path in cache_paths(data_path))
+
+
+def test_repeated_loads_share_one_frame(data_path):
+    first = load_fdi_data(data_path)
+    assert load_fdi_data(data_path) is first
+    # Values come straight from the read-only memory map
+    assert not first["2000-01"].to_numpy().flags.writeable
+
+
+def test_edited_file_is_reparsed(data_path):
+    load_fdi_data(data_path)
+    edited = pd.read_csv(data_path)
+    edited.iloc[0, 1] = 12345.0
+    edited.to_csv(data_path, index=False)
+    assert load_fdi_data(data_path).iloc[0, 1] == 12345.0
+
+
+def test_clear_cache_removes_sidecars(data_path):
+    load_fdi_data(data_path)
+    clear_cache(data_path)
+    assert not any(os.path.exists(path) for path in cache_paths(data_path))
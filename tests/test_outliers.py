@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from matplotlib import cbook
+
+from fdi_analysis import FDICube
+from fdi_analysis.outliers import detect_outliers
+from fdi_analysis.profile import profile_values
+
+
+def test_iqr_flags_match_the_pandas_rule(cube):
+    report = detect_outliers(cube)
+    frame = pd.DataFrame(cube.values, columns=cube.years)
+    q1, q3 = frame.quantile(0.25), frame.quantile(0.75)
+    expected = (frame < q1 - 1.5 * (q3 - q1)) | (frame > q3 + 1.5 * (q3 - q1))
+    np.testing.assert_array_equal(report.iqr_flag, expected.to_numpy())
+    assert report.counts()["iqr"].sum() == expected.to_numpy().sum()
+
+
+def test_fliers_match_matplotlib_boxplot_stats(cube):
+    report = detect_outliers(cube)
+    stats = cbook.boxplot_stats(cube.values)
+    for year, expected in zip(cube.years, stats):
+        np.testing.assert_array_equal(np.sort(report.fliers()[year]), np.sort(expected["fliers"]))
+
+
+def test_robust_z_against_median_and_mad(cube):
+    report = detect_outliers(cube)
+    frame = pd.DataFrame(cube.values, columns=cube.years)
+    deviation = frame - frame.median()
+    mad = deviation.abs().median()
+    expected = 0.6745 * deviation / mad
+    assert (mad > 0).all()
+    np.testing.assert_allclose(report.robust_z, expected.to_numpy())
+
+
+def test_profile_quartiles_give_the_same_report(cube):
+    profile = profile_values(cube.values, cube.years)
+    with_profile = detect_outliers(cube, profile=profile)
+    np.testing.assert_array_equal(with_profile.any_flag, detect_outliers(cube).any_flag)
+
+
+def test_planted_jump_ranks_first():
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 5, size=(20, 8))
+    values[4, 5] = 400.0
+    report = detect_outliers(FDICube(values, [f"s{i}" for i in range(20)], [str(2000 + i) for i in range(8)]))
+    top = report.table().iloc[0]
+    assert (top["Sector"], top["Year"]) == ("s4", "2005")
+    assert top["iqr"] and top["z"] and top["jump"]
+    assert list(report.table("jump")["Sector"]) == ["s4"] * len(report.table("jump"))
+
+
+def test_constant_year_flags_nothing():
+    values = np.column_stack([np.full(10, 3.0), np.arange(10.0)])
+    report = detect_outliers(FDICube(values, [f"s{i}" for i in range(10)], ["2000-01", "2001-02"]))
+    assert not report.iqr_flag.any() and not report.z_flag.any()
+    assert np.all(report.robust_z[:, 0] == 0)
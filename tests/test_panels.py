@@ -0,0 +1,19 @@
+import numpy as np
+
+from fdi_analysis import FDICube, forecast_cube
+from fdi_analysis.panels import PanelStore
+
+
+def test_panel_store_forecast_matches_per_country_cubes(cube, monkeypatch):
+    other = FDICube(cube.values[:40, 3:] * 2.0, cube.sectors[:40], cube.years[3:])
+    store = PanelStore.from_cubes({"India": cube, "Other": other})
+    expected = store.forecast(horizon=5)
+    # One country per block: the blocked fit must agree with the single-block one
+    monkeypatch.setattr("fdi_analysis.panels.BLOCK_BYTES", 1)
+    trend = store.forecast(horizon=5)
+    np.testing.assert_allclose(trend.forecast, expected.forecast)
+    assert list(trend.sectors) == list(expected.sectors)
+
+    frame = trend.forecast_frame()
+    np.testing.assert_allclose(frame.loc["India"].to_numpy(), forecast_cube(cube, horizon=5).forecast)
+    np.testing.assert_allclose(frame.loc["Other"].to_numpy(), forecast_cube(other, horizon=5).forecast)
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from fdi_analysis import FDICube
+from fdi_analysis.pipeline import ReportGraph
+
+SECTORS = ["A", "B", "C"]
+YEARS = ["2000-01", "2001-02", "2002-03"]
+
+
+def make_cube(values):
+    return FDICube(np.asarray(values, dtype=np.float64), SECTORS, YEARS)
+
+
+@pytest.fixture
+def graph(tmp_path):
+    """A small graph that records which nodes were computed.
+
+    ``a`` and ``b`` read one row each; ``b_positive`` only depends on the
+    sign of ``b``, so edits that keep it positive stop there.
+    """
+    calls = []
+
+    def node(name, compute):
+        def run(cube, *inputs):
+            calls.append(name)
+            return compute(cube, *inputs)
+        return run
+
+    g = ReportGraph(str(tmp_path / "cache"), {"option": 1})
+    g.add("a", node("a", lambda cube: cube.sector("A").copy()), reads=lambda cube: cube.values[0])
+    g.add("b", node("b", lambda cube: cube.sector("B").copy()), reads=lambda cube: cube.values[1])
+    g.add("a_total", node("a_total", lambda cube, a: float(a.sum())), deps=["a"])
+    g.add("b_positive", node("b_positive", lambda cube, b: bool((b > 0).all())), deps=["b"])
+    g.add("summary", node("summary", lambda cube, total, positive: [total, positive]),
+          deps=["a_total", "b_positive"])
+    g.calls = calls
+    return g
+
+
+def build(graph, cube):
+    graph.calls.clear()
+    report = graph.build(cube)
+    return report, list(graph.calls)
+
+
+def test_first_build_computes_everything_then_caches(graph):
+    cube = make_cube([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    report, calls = build(graph, cube)
+    assert sorted(calls) == sorted(graph.nodes)
+    assert (report["status"] == "rebuilt").all()
+
+    report, calls = build(graph, cube)
+    assert calls == []
+    assert (report["status"] == "cached").all()
+
+
+def test_edit_rebuilds_only_invalidated_nodes(graph):
+    build(graph, make_cube([[1, 2, 3], [4, 5, 6], [7, 8, 9]]))
+
+    report, calls = build(graph, make_cube([[1, 2, 3], [4, 50, 6], [7, 8, 9]]))
+    # b changed but is still positive, so nothing past b_positive reruns
+    assert calls == ["b", "b_positive"]
+    assert report.loc["b", "output_changed"]
+    assert not report.loc["b_positive", "output_changed"]
+    assert report.loc["summary", "status"] == "cached"
+
+    report, calls = build(graph, make_cube([[1, 2, 30], [4, 50, 6], [7, 8, 9]]))
+    assert calls == ["a", "a_total", "summary"]
+
+
+def test_unread_cells_do_not_invalidate(graph):
+    build(graph, make_cube([[1, 2, 3], [4, 5, 6], [7, 8, 9]]))
+    _, calls = build(graph, make_cube([[1, 2, 3], [4, 5, 6], [70, 80, 90]]))
+    assert calls == []
+
+
+def test_cached_results_round_trip(graph):
+    cube = make_cube([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    build(graph, cube)
+    graph.calls.clear()
+    graph.build(make_cube([[1, 2, 3], [-4, 5, 6], [7, 8, 9]]))
+    # summary reran from a_total loaded off disk
+    assert graph.calls == ["b", "b_positive", "summary"]
+    assert graph._load_result("summary") == [6.0, False]
+
+
+def test_config_change_rebuilds_everything(graph):
+    cube = make_cube([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    build(graph, cube)
+    graph.config = {"option": 2}
+    _, calls = build(graph, cube)
+    assert sorted(calls) == sorted(graph.nodes)
+
+
+def test_report_graph_keeps_selected_sectors_when_another_sector_changes(tmp_path, cube):
+    from fdi_analysis.pipeline import report_graph
+
+    output = str(tmp_path / "report")
+    report_graph(output, formats=("png",), dpi=20).build(cube)
+
+    values = cube.values.copy()
+    values[cube.row("MINING"), cube.year_index["2003-04"]] += 1.0
+    report = report_graph(output, formats=("png",), dpi=20).build(FDICube(values, cube.sectors, cube.years))
+    rebuilt = set(report.index[report["status"] == "rebuilt"])
+    assert {"yearly_totals", "sector_totals", "forecasts", "chart_boxplot", "chart_histogram"} <= rebuilt
+    assert not rebuilt & {"selected", "selected_forecasts", "low_high_years", "chart_sector_trends",
+                          "chart_sector_forecasts", "chart_pie", "chart_lowest_highest"}
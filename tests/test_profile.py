@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis import FDICube, load_fdi_data
+from fdi_analysis import profile as profile_module
+from fdi_analysis.profile import DataProfile, profile_cube, profile_path, profile_values
+
+
+def test_describe_and_nulls_match_pandas(cube):
+    frame = pd.DataFrame(cube.values, columns=cube.years)
+    profile = profile_values(cube.values, cube.years)
+    pd.testing.assert_frame_equal(profile.describe(), frame.describe(), check_exact=False, rtol=1e-9)
+    pd.testing.assert_series_equal(profile.null_counts(), frame.isnull().sum(), check_dtype=False)
+
+
+def test_histogram_matches_np_histogram(cube):
+    profile = profile_values(cube.values, cube.years, bins=12)
+    for j in range(len(cube.years)):
+        column = cube.values[:, j]
+        expected, _ = np.histogram(column[~np.isnan(column)], bins=profile.bin_edges)
+        np.testing.assert_array_equal(profile.histogram[j], expected)
+
+
+def test_threaded_blocks_give_the_same_profile(cube):
+    values = cube.values.copy()
+    values[::7, 3] = np.nan
+    one = profile_values(values, cube.years)
+    threaded = profile_values(values, cube.years, workers=4)
+    pd.testing.assert_frame_equal(one.frame(), threaded.frame())
+    np.testing.assert_array_equal(one.histogram, threaded.histogram)
+
+
+def test_saved_profile_round_trips(cube, tmp_path):
+    profile = profile_values(cube.values, cube.years, key="k")
+    path = str(tmp_path / "p.npz")
+    profile.save(path)
+    loaded = DataProfile.load(path)
+    assert loaded.key == "k" and loaded.years == profile.years
+    pd.testing.assert_frame_equal(loaded.frame(), profile.frame())
+
+
+def test_cache_follows_the_file_stamp(data_path, monkeypatch):
+    cube = FDICube.from_frame(load_fdi_data(data_path, use_cache=False))
+    first = profile_cube(cube, data_path)
+    assert os.path.exists(profile_path(data_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("profile recomputed")
+
+    # Unchanged file: the saved profile is used without touching the values
+    with monkeypatch.context() as patch:
+        patch.setattr(profile_module, "profile_values", fail)
+        pd.testing.assert_frame_equal(profile_cube(cube, data_path).frame(), first.frame())
+        with pytest.raises(AssertionError):
+            profile_cube(cube, data_path, bins=10)
+
+    st = os.stat(data_path)
+    os.utime(data_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    calls = []
+    monkeypatch.setattr(profile_module, "profile_values",
+                        lambda *args, **kwargs: calls.append(1) or profile_values(*args, **kwargs))
+    profile_cube(cube, data_path)
+    assert calls == [1]
+
+
+def test_no_data_path_writes_nothing(cube, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    profile = profile_cube(cube)
+    assert profile.key == ""
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis.quantiles import KLLSketch, exact_quantiles, panel_quantiles, stream_quantiles
+
+Q = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def _rank_errors(values, sketch):
+    """|rank of each estimate / n - q| over ``Q``."""
+    ordered = np.sort(values)
+    ranks = np.searchsorted(ordered, sketch.quantile(Q)) / len(ordered)
+    return np.abs(ranks - np.asarray(Q))
+
+
+@pytest.mark.parametrize("axis", [None, 0, 1])
+def test_exact_quantiles_match_np_quantile(axis):
+    values = np.random.default_rng(0).lognormal(size=(40, 9))
+    np.testing.assert_allclose(exact_quantiles(values, Q, axis=axis), np.quantile(values, Q, axis=axis))
+
+
+def test_exact_quantiles_skip_missing_values():
+    values = np.random.default_rng(1).normal(size=(30, 4))
+    values[::3, 1] = np.nan
+    np.testing.assert_allclose(exact_quantiles(values, Q, axis=0), np.nanquantile(values, Q, axis=0))
+
+
+def test_panel_quantiles_match_pandas(cube):
+    quantiles = panel_quantiles(cube, q=(0.1, 0.9))
+    frame = pd.DataFrame(cube.values, index=cube.sectors, columns=cube.years)
+    q = list(quantiles.q)
+    np.testing.assert_allclose(quantiles.by_year.to_numpy(), frame.quantile(q).T.to_numpy())
+    np.testing.assert_allclose(quantiles.by_sector.to_numpy(), frame.T.quantile(q).T.to_numpy())
+    np.testing.assert_allclose(quantiles.overall.to_numpy(), frame.stack().quantile(q).to_numpy())
+    pd.testing.assert_series_equal(quantiles.iqr("year"), frame.quantile(0.75) - frame.quantile(0.25),
+                                   check_names=False)
+
+
+def test_kll_rank_error_is_within_bound():
+    values = np.random.default_rng(2).lognormal(3, 2, size=200_000)
+    sketch = KLLSketch(k=200, seed=0)
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+    assert len(sketch) == len(values)
+    assert _rank_errors(values, sketch).max() < 1.7 / 200 * 2
+    # The sketch stays small however long the stream
+    assert sum(len(level) for level in sketch.levels) < 3 * 200
+
+
+def test_merged_sketches_match_one_sketch_of_everything():
+    rng = np.random.default_rng(3)
+    parts = [rng.normal(size=50_000), rng.exponential(size=50_000)]
+    merged = KLLSketch(k=200, seed=0).update(parts[0]).merge(KLLSketch(k=200, seed=1).update(parts[1]))
+    assert len(merged) == 100_000
+    assert _rank_errors(np.concatenate(parts), merged).max() < 1.7 / 200 * 2
+
+
+def test_small_sketch_is_exact():
+    values = np.arange(50.0)
+    assert KLLSketch(k=200).update(values).quantile(0.3) == np.quantile(values, 0.3)
+    with pytest.raises(ValueError):
+        KLLSketch(k=200).quantile(0.5)
+
+
+def test_stream_quantiles_keeps_sector_quantiles_exact(cube, data_path):
+    exact = panel_quantiles(cube)
+    streamed = stream_quantiles(data_path, chunksize=10, k=64)
+    pd.testing.assert_frame_equal(streamed.by_sector, exact.by_sector)
+    values = cube.values[~np.isnan(cube.values)]
+    ranks = np.searchsorted(np.sort(values), streamed.overall.to_numpy()) / len(values)
+    assert np.abs(ranks - np.asarray(exact.q)).max() < 1.7 / 64 * 2
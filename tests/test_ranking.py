@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from fdi_analysis import FDICube
+from fdi_analysis.ranking import RankIndex
+
+YEARS = ["2000-01", "2001-02"]
+
+
+def test_bottom_and_top_match_pandas(cube):
+    index = RankIndex(cube)
+    frame = pd.DataFrame(cube.values, index=cube.sectors, columns=cube.years)
+    for year in cube.years:
+        pd.testing.assert_series_equal(index.bottom(year, 5), frame[year].nsmallest(5), check_names=False)
+        np.testing.assert_array_equal(index.top(year, 5).to_numpy(), frame[year].nlargest(5).to_numpy())
+        assert index.highest(year) == (frame[year].idxmax(), frame[year].max())
+
+
+def test_extremes_agree_with_per_year_lookups(cube):
+    index = RankIndex(cube)
+    extremes = index.extremes(k=2)
+    for year in cube.years:
+        row = extremes.loc[year]
+        assert [row["lowest_1"], row["lowest_2"]] == list(index.bottom(year, 2).index)
+        assert [row["highest_1_fdi"], row["highest_2_fdi"]] == list(index.top(year, 2))
+
+
+def test_rank_matches_argsort(cube):
+    index = RankIndex(cube)
+    year = cube.years[-1]
+    order = np.argsort(cube.values[:, -1], kind="stable")
+    for position, row in enumerate(order[:10]):
+        assert index.rank(cube.sectors[row], year) == position
+
+
+def test_ties_and_missing_values():
+    values = np.array([[1.0, np.nan], [1.0, 2.0], [0.5, np.nan]])
+    index = RankIndex(FDICube(values, ["a", "b", "c"], YEARS))
+    # Equal values: the sector listed first ranks lower
+    assert list(index.bottom("2000-01", 3).index) == ["c", "a", "b"]
+    assert list(index.top("2000-01", 3).index) == ["b", "a", "c"]
+    # Missing values are never ranked
+    assert list(index.top("2001-02", 3).index) == ["b"]
+    extremes = index.extremes(k=2)
+    assert pd.isna(extremes.loc["2001-02", "lowest_2"])
+    assert np.isnan(extremes.loc["2001-02", "highest_2_fdi"])
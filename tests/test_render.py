@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from fdi_analysis.render import render_charts
+
+
+def _signature(path):
+    with open(path, "rb") as f:
+        return f.read(8)
+
+
+def test_render_in_process_writes_every_format(data_path, tmp_path):
+    output = tmp_path / "charts"
+    report = render_charts(data_path, str(output), names=["histogram", "yearly_total"],
+                           formats=("png", "svg"), workers=1)
+    assert list(report.index) == ["histogram", "yearly_total"]
+    assert sorted(os.listdir(output)) == ["histogram.png", "histogram.svg", "yearly_total.png", "yearly_total.svg"]
+    assert _signature(output / "histogram.png") == b"\x89PNG\r\n\x1a\n"
+    assert (report["total_s"] >= report["draw_s"]).all()
+    assert (report["pid"] == os.getpid()).all()
+
+
+def test_render_in_a_process_pool(data_path, tmp_path):
+    output = tmp_path / "charts"
+    report = render_charts(data_path, str(output), names=["boxplot", "pie_2010_11"], workers=2)
+    assert list(report.index) == ["boxplot", "pie_2010_11"]
+    assert not (report["pid"] == os.getpid()).any()
+    assert all(os.path.getsize(files[0]) > 0 for files in report["files"])
+
+
+def test_unknown_chart_is_rejected(data_path, tmp_path):
+    with pytest.raises(ValueError, match="unknown chart"):
+        render_charts(data_path, str(tmp_path / "charts"), names=["histogram", "nope"])
+    assert not os.path.exists(tmp_path / "charts")
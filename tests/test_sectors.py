@@ -0,0 +1,55 @@
+import pytest
+
+from fdi_analysis import SectorIndex, SectorLookupError
+from fdi_analysis.sectors import normalize
+
+
+@pytest.fixture(scope="module")
+def index(cube):
+    return SectorIndex(cube.sectors, aliases={"it": "COMPUTER SOFTWARE & HARDWARE"})
+
+
+def test_exact_and_normalised_names(index, cube):
+    for row, name in enumerate(cube.sectors):
+        assert index.position(name) == row
+        assert index.position(normalize(name).upper()) == row
+
+
+def test_unique_prefix_and_alias(index):
+    assert index.resolve("services").startswith("SERVICES SECTOR")
+    assert index.resolve("construction development").startswith("CONSTRUCTION DEVELOPMENT")
+    assert index.resolve("Computer-Software") == "COMPUTER SOFTWARE & HARDWARE"
+    assert index.resolve("IT") == "COMPUTER SOFTWARE & HARDWARE"
+
+
+def test_ambiguous_prefix_lists_the_candidates(index):
+    with pytest.raises(SectorLookupError) as error:
+        index.position("electr")
+    assert error.value.reason == "ambiguous"
+    assert sorted(error.value.candidates) == ["ELECTRICAL EQUIPMENTS", "ELECTRONICS"]
+    assert "did you mean" in str(error.value)
+    assert "electr" not in index
+
+
+def test_typo_suggests_the_closest_names(index):
+    with pytest.raises(KeyError) as error:
+        index.position("servces")
+    assert error.value.reason == "unknown"
+    assert error.value.candidates[0].startswith("SERVICES SECTOR")
+    with pytest.raises(SectorLookupError) as error:
+        index.position("zzzz qqqq")
+    assert error.value.candidates == []
+
+
+def test_prefix_rows_match_a_linear_scan(index, cube):
+    for prefix in ["c", "con", "construction", "te", "x"]:
+        expected = [i for i, name in enumerate(cube.sectors) if normalize(name).startswith(prefix)]
+        assert index.prefix_rows(prefix) == expected
+    assert index.prefix_rows("") == list(range(len(cube.sectors)))
+
+
+def test_duplicate_normalised_names_are_ambiguous():
+    index = SectorIndex(["Power", "POWER."])
+    assert index.position("Power") == 0
+    with pytest.raises(SectorLookupError, match="ambiguous"):
+        index.position("power")
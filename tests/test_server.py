@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+
+from fdi_analysis.forecast import MAX_HORIZON, MAX_N_BOOT
+from fdi_analysis.server import AnalyticsServer
+
+
+@pytest.fixture
+def server(data_path):
+    server = AnalyticsServer(data_path, workers=2)
+    yield server
+    server.close()
+
+
+def get(server, target, method="GET"):
+    status, content_type, body = asyncio.run(server.respond(method, target))
+    return status, json.loads(body) if content_type == "application/json" else body
+
+
+def test_top_sectors(server):
+    status, body = get(server, "/top?n=3")
+    assert status == 200
+    assert len(body["data"]) == 3
+
+
+def test_forecast_with_bands(server):
+    status, body = get(server, "/forecast?horizon=3&level=0.9&n_boot=50&sector=mining")
+    assert status == 200
+    assert len(body["index"]) == 1
+
+
+@pytest.mark.parametrize("target", [
+    "/forecast?horizon=0",
+    f"/forecast?horizon={MAX_HORIZON + 1}",
+    "/forecast?horizon=seven",
+    f"/forecast?n_boot={MAX_N_BOOT + 1}",
+    "/forecast?n_boot=0",
+    "/forecast?level=1.5",
+    "/forecast?model=cubic",
+    "/top?n=0",
+    "/top?n=1000",
+    "/totals?by=country",
+    "/quantiles?q=2",
+    "/chart/boxplot?dpi=5000",
+])
+def test_bad_parameters_are_400(server, target):
+    status, body = get(server, target)
+    assert status == 400
+    assert "error" in body
+
+
+@pytest.mark.parametrize("target", ["/nowhere", "/top?year=1999-00", "/shares?sector=no such sector",
+                                    "/chart/nowhere"])
+def test_unknown_resources_are_404(server, target):
+    status, body = get(server, target)
+    assert status == 404
+    assert "error" in body
+
+
+def test_only_get_and_head_are_allowed(server):
+    status, _ = get(server, "/top", method="POST")
+    assert status == 405
+
+
+def test_status_reports_the_loaded_panel(server):
+    status, body = get(server, "/status")
+    assert status == 200
+    assert (body["sectors"], body["years"]) == (63, 17)
+
+
+def test_rank_index_is_built_once_per_data_version(server, data_path, monkeypatch):
+    import fdi_analysis.ranking as ranking
+
+    built = []
+    original = ranking.RankIndex.__init__
+
+    def counting(self, cube):
+        built.append(cube)
+        original(self, cube)
+
+    monkeypatch.setattr(ranking.RankIndex, "__init__", counting)
+    first = get(server, "/top?year=2010-11&n=3")[1]
+    get(server, "/top?year=2011-12&n=3")
+    get(server, "/top?year=2010-11&n=5")
+    assert len(built) == 1
+
+    # Editing the file reloads the cube, which drops the index
+    with open(data_path, "a", encoding="utf-8") as f:
+        f.write("NEW SECTOR" + ",1" * 17 + "\n")
+    assert get(server, "/top?year=2010-11&n=3")[1] == first
+    assert len(built) == 2
+
+
+def test_chart_png(server):
+    status, body = get(server, "/chart/yearly_total.png?dpi=20")
+    assert status == 200
+    assert body.startswith(b"\x89PNG")
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fdi_analysis.streaming import StreamingStats, stream_summary
+
+
+def test_stream_summary_matches_pandas(data_path):
+    frame = pd.read_csv(data_path)
+    summary = stream_summary(data_path, chunksize=7, top_n=5)
+    values = frame.set_index("Sector")
+    assert summary.rows == len(frame)
+    pd.testing.assert_series_equal(summary.year_totals, values.sum(), check_names=False)
+    # At most k values per year, so even the quartiles are exact
+    pd.testing.assert_frame_equal(summary.describe, values.describe(), check_exact=False, rtol=1e-9)
+    pd.testing.assert_series_equal(summary.null_counts, frame.isnull().sum(), check_dtype=False)
+    pd.testing.assert_series_equal(summary.top_sectors, values.sum(axis=1).nlargest(5),
+                                   check_names=False, check_index_type=False)
+
+
+def test_missing_values_and_repeated_sectors():
+    rng = np.random.default_rng(0)
+    years = ["2000-01", "2001-02", "2002-03"]
+    values = rng.normal(100, 30, size=(500, 3))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    sectors = [f"s{i % 7}" if i % 50 else None for i in range(500)]
+    frame = pd.DataFrame(values, columns=years)
+    frame.insert(0, "Sector", sectors)
+
+    stats = StreamingStats(years, k=64).update_rows(zip(sectors, values), batch_size=33)
+    summary = stats.result()
+    numeric = frame[years]
+    pd.testing.assert_series_equal(summary.year_totals, numeric.sum(), check_names=False)
+    for name in ["count", "mean", "std", "min", "max"]:
+        np.testing.assert_allclose(summary.describe.loc[name], numeric.describe().loc[name], rtol=1e-9)
+    pd.testing.assert_series_equal(summary.null_counts, frame.isnull().sum(), check_dtype=False)
+    expected = frame.fillna({"Sector": "<missing>"}).groupby("Sector")[years].sum().sum(axis=1)
+    pd.testing.assert_series_equal(summary.sector_totals.sort_index(), expected, check_names=False,
+                                   check_index_type=False)
+    # Past k values per year the quartiles come from the sketch
+    for year in years:
+        column = numeric[year].dropna().sort_values().to_numpy()
+        ranks = np.searchsorted(column, summary.describe.loc[["25%", "50%", "75%"], year]) / len(column)
+        assert np.abs(ranks - [0.25, 0.5, 0.75]).max() < 0.06
+
+
+def test_mismatched_chunk_is_rejected():
+    with pytest.raises(ValueError):
+        StreamingStats(["2000-01"]).update(["a", "b"], [[1.0]])